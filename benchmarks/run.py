@@ -0,0 +1,432 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+Benchmarks the `User` and `Story` fetch methods against a local mock of the Wattpad API, and the hot paths of the package's utilities. Results are written as JSON, to compare across versions.
+
+$ python benchmarks/run.py --latency 5 --output results.json
+$ python benchmarks/run.py --baseline results.json --filter "user\\."
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parent.parent / "src")
+)  # ! Benchmark the working tree, rather than an installed release.
+
+from server import MockServer  # noqa: E402
+
+from wattpad import MemoryCache, Story, User, WattpadClient, fetch_many  # noqa: E402
+from wattpad.cache import split_url  # noqa: E402
+from wattpad.export import html_to_text  # noqa: E402
+from wattpad.fields import FieldSpec, merge_model  # noqa: E402
+from wattpad.models import StoryModel, UserModel  # noqa: E402
+from wattpad.utils import build_url, fields_cover, parse_fields  # noqa: E402
+
+RESULTS_VERSION = 1
+
+
+class Case(NamedTuple):
+    """A benchmark.
+
+    Attributes:
+        name (str): The name of the benchmark, e.g. `user.fetch`.
+        group (str): `network` for benchmarks against the mock server, `utils` for the rest.
+        run (Callable[[], Awaitable[Any]]): Performs `ops` operations once.
+        ops (int): Number of operations per run.
+    """
+
+    name: str
+    group: str
+    run: Callable[[], Awaitable[Any]]
+    ops: int = 1
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """The `q`th percentile of samples, interpolated linearly.
+
+    Args:
+        samples (list[float]): The samples.
+        q (float): The percentile, from 0 to 100.
+
+    Returns:
+        float: The percentile.
+    """
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+async def measure(case: Case, repeat: int, warmup: int) -> dict:
+    """Run a benchmark, timing each run, then run it again under `tracemalloc` for its peak memory.
+
+    Args:
+        case (Case): The benchmark.
+        repeat (int): Number of timed runs.
+        warmup (int): Number of untimed runs beforehand.
+
+    Returns:
+        dict: The results of the benchmark.
+    """
+    for _ in range(warmup):
+        await case.run()
+
+    samples: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await case.run()
+        samples.append((time.perf_counter() - start) / case.ops)
+
+    tracemalloc.start()
+    try:
+        for _ in range(min(repeat, 3)):
+            tracemalloc.reset_peak()
+            await case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    total = sum(samples) * case.ops
+    return {
+        "name": case.name,
+        "group": case.group,
+        "runs": repeat,
+        "ops": repeat * case.ops,
+        "ops_per_sec": repeat * case.ops / total if total else None,
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def network_cases(client: WattpadClient, cached: WattpadClient, page_size: int):
+    """The benchmarks of fetch methods. `client` doesn't cache responses, every operation is a request."""
+    user = User("benchmark")
+    story = Story("1")
+    usernames = [f"batch{i}" for i in range(20)]
+
+    async def fetch_cached():
+        await user.fetch(include=True, client=cached)
+
+    async def iter_followers():
+        async for _ in user.iter_followers(
+            include=True, page_size=page_size, client=client
+        ):
+            pass
+
+    async def iter_part_texts():
+        async for _, texts in story.iter_part_texts(client=client):
+            async for _ in texts:
+                pass
+
+    async def batch():
+        async for _ in fetch_many(
+            [User(username) for username in usernames], include=True, client=client
+        ):
+            pass
+
+    return [
+        Case("user.fetch", "network", lambda: user.fetch(include=True, client=client)),
+        Case("user.fetch[cached]", "network", fetch_cached),
+        Case(
+            "user.fetch_stories",
+            "network",
+            lambda: user.fetch_stories(include=True, client=client),
+        ),
+        Case(
+            "user.fetch_followers",
+            "network",
+            lambda: user.fetch_followers(include=True, limit=page_size, client=client),
+        ),
+        Case(
+            "user.fetch_following",
+            "network",
+            lambda: user.fetch_following(include=True, limit=page_size, client=client),
+        ),
+        Case(
+            "user.fetch_lists",
+            "network",
+            lambda: user.fetch_lists(include=True, limit=page_size, client=client),
+        ),
+        Case("user.iter_followers", "network", iter_followers),
+        Case(
+            "story.fetch", "network", lambda: story.fetch(include=True, client=client)
+        ),
+        Case(
+            "story.fetch_recommended",
+            "network",
+            lambda: story.fetch_recommended(
+                include=True, limit=page_size, client=client
+            ),
+        ),
+        Case("story.iter_part_texts", "network", iter_part_texts),
+        Case("fetch_many", "network", batch, ops=len(usernames)),
+    ]
+
+
+def utils_cases(server: MockServer):
+    """The benchmarks of utilities. Each run repeats an operation `ops` times."""
+    ops = 1000
+    fields = FieldSpec.compile(StoryModel, True)
+    parsed = parse_fields(fields.query)
+    cache = MemoryCache()
+    url = build_url("stories/1", fields=fields.query)
+    cache.set(url, json.dumps(server._story_data(1)).encode())
+    story = Story(
+        "merge",
+        **{key: value for key, value in server._story_data(2).items() if key != "id"},
+    )
+    update = server._story_data(3)
+    text = server._render_text().decode()
+    users = [User(f"lookup{i}") for i in range(ops)]  # ! Kept, so lookups hit.
+
+    def repeat(func: Callable[[], Any], times: int = ops):
+        async def run():
+            for _ in range(times):
+                func()
+
+        return run
+
+    async def lookups():
+        for user in users:
+            User(user.username)
+
+    return [
+        Case(
+            "utils.build_url",
+            "utils",
+            repeat(lambda: build_url("users/x/followers", fields.wrap("users"), 100)),
+            ops,
+        ),
+        Case(
+            "fields.compile",
+            "utils",
+            repeat(
+                lambda: FieldSpec.compile(UserModel, {"username": True, "name": True})
+            ),
+            ops,
+        ),
+        Case(
+            "utils.parse_fields",
+            "utils",
+            repeat(lambda: parse_fields(fields.query)),
+            ops,
+        ),
+        Case(
+            "utils.fields_cover",
+            "utils",
+            repeat(lambda: fields_cover(parsed, parsed)),
+            ops,
+        ),
+        Case("cache.split_url", "utils", repeat(lambda: split_url(url)), ops),
+        Case("cache.get", "utils", repeat(lambda: cache.get(url)), ops),
+        Case("registry.lookup", "utils", lookups, ops),
+        Case(
+            "fields.merge_model",
+            "utils",
+            repeat(lambda: merge_model(story.data, update), 100),
+            100,
+        ),
+        Case(
+            "models.validate_story",
+            "utils",
+            repeat(lambda: StoryModel.model_validate(update), 100),
+            100,
+        ),
+        Case(
+            "export.html_to_text", "utils", repeat(lambda: html_to_text(text), 10), 10
+        ),
+    ]
+
+
+def git_revision() -> Optional[str]:
+    """The commit of the working tree, if it's a git repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def package_version() -> Optional[str]:
+    """The version of the package, as per `setup.cfg`."""
+    setup = Path(__file__).resolve().parent.parent / "setup.cfg"
+    match = re.search(r"^version\s*=\s*(\S+)", setup.read_text(), re.MULTILINE)
+    return match.group(1) if match else None
+
+
+def compare(results: list[dict], baseline: dict):
+    """Print the change of each benchmark's throughput and p99 latency from a baseline.
+
+    Args:
+        results (list[dict]): The results of this run.
+        baseline (dict): A previous results file.
+
+    Returns:
+        None: Nothing is returned.
+    """
+    previous = {result["name"]: result for result in baseline["results"]}
+    print(
+        f"{'benchmark':<28} {'ops/s':>12} {'change':>8} {'p99 ms':>10} {'change':>8}",
+        file=sys.stderr,
+    )
+    for result in results:
+        before = previous.get(result["name"])
+        if before is None:
+            continue
+        ops = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        p99 = result["p99_ms"] / before["p99_ms"] - 1 if before["p99_ms"] else 0.0
+        print(
+            f"{result['name']:<28} {result['ops_per_sec']:>12.1f} {ops:>+8.1%} {result['p99_ms']:>10.3f} {p99:>+8.1%}",
+            file=sys.stderr,
+        )
+
+
+async def main(args: argparse.Namespace) -> dict:
+    server = MockServer(
+        latency=args.latency / 1000,
+        payload=args.payload,
+        total=args.total,
+        parts=args.parts,
+    )
+    await server.start()
+
+    client = WattpadClient(
+        cache=None, base_url=server.url, limit_per_host=args.connections
+    )
+    cached = WattpadClient(base_url=server.url)
+
+    pattern = re.compile(args.filter) if args.filter else None
+    cases = network_cases(client, cached, args.page_size) + utils_cases(server)
+
+    results = []
+    try:
+        for case in cases:
+            if pattern is not None and not pattern.search(case.name):
+                continue
+            result = await measure(case, args.repeat, args.warmup)
+            results.append(result)
+            print(
+                f"{result['name']:<28} {result['ops_per_sec']:>12.1f} ops/s  p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms  peak {result['peak_memory_kb']:>9.1f} KiB",
+                file=sys.stderr,
+            )
+    finally:
+        await client.close()
+        await cached.close()
+        await server.stop()
+
+    return {
+        "version": RESULTS_VERSION,
+        "package_version": package_version(),
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "latency_ms": args.latency,
+            "payload": args.payload,
+            "total": args.total,
+            "parts": args.parts,
+            "page_size": args.page_size,
+            "connections": args.connections,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("---")[-1].strip())
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Latency of each mock response, in milliseconds.",
+    )
+    parser.add_argument(
+        "--payload",
+        type=int,
+        default=256,
+        help="Length of free-text fields of mock records, in characters.",
+    )
+    parser.add_argument(
+        "--total",
+        type=int,
+        default=1000,
+        help="Number of records of each paginated endpoint.",
+    )
+    parser.add_argument(
+        "--parts", type=int, default=20, help="Number of parts of each story."
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=100,
+        help="Number of records requested per page.",
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=20,
+        help="Maximum number of connections to the mock server.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Number of timed runs of each benchmark."
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=2,
+        help="Number of untimed runs of each benchmark beforehand.",
+    )
+    parser.add_argument(
+        "--filter",
+        help="Only run benchmarks whose name matches this regular expression.",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="File to write results to. Defaults to stdout."
+    )
+    parser.add_argument(
+        "--baseline", type=Path, help="Results file to compare against."
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        compare(report["results"], json.loads(args.baseline.read_text()))
@@ -0,0 +1,284 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+A local aiohttp server emulating the Wattpad API, for benchmarks. Responses are synthetic and deterministic, their size and latency are configurable.
+
+>>> server = MockServer(latency=0.02, payload=1024)
+>>> await server.start()
+>>> client = WattpadClient(base_url=server.url)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from functools import lru_cache
+from typing import Optional
+
+from aiohttp import web
+
+
+class MockServer:
+    """Serves `/api/v3/users`, `/stories` and their `followers`, `following`, `lists`, `stories` and `recommended` endpoints, and `/apiv2/storytext`.
+    **Note**: The `fields` query parameter is ignored, every field is returned. Benchmarks request every field to match.
+
+    Attributes:
+        latency (float): Seconds each response is delayed by.
+        payload (int): Length of free-text fields (descriptions), in characters.
+        total (int): Number of records of each paginated endpoint.
+        parts (int): Number of parts of each story.
+        text_size (int): Size of each part's text, in bytes.
+        requests (int): Number of requests served.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        payload: int = 256,
+        total: int = 1000,
+        parts: int = 20,
+        text_size: int = 16 * 1024,
+    ):
+        """Create a MockServer object. Nothing is served until `start` is called.
+
+        Args:
+            host (str, optional): The host to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on. Defaults to 0 (any free port).
+            latency (float, optional): Seconds each response is delayed by. Defaults to 0.0.
+            payload (int, optional): Length of free-text fields, in characters. Defaults to 256.
+            total (int, optional): Number of records of each paginated endpoint. Defaults to 1000.
+            parts (int, optional): Number of parts of each story. Defaults to 20.
+            text_size (int, optional): Size of each part's text, in bytes. Defaults to 16 KiB.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.payload = payload
+        self.total = total
+        self.parts = parts
+        self.text_size = text_size
+        self.requests = 0
+
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        """The origin of the server, to pass as a client's `base_url`."""
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        """Start serving.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        app = web.Application()
+        app.router.add_get("/api/v3/users/{username}", self._user)
+        app.router.add_get("/api/v3/users/{username}/stories", self._user_stories)
+        app.router.add_get("/api/v3/users/{username}/followers", self._users)
+        app.router.add_get("/api/v3/users/{username}/following", self._users)
+        app.router.add_get("/api/v3/users/{username}/lists", self._lists)
+        app.router.add_get("/api/v3/stories/{id}", self._story)
+        app.router.add_get("/api/v3/stories/{id}/recommended", self._recommended)
+        app.router.add_get("/apiv2/storytext", self._text)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+
+        if self.port == 0:
+            self.port = site._server.sockets[0].getsockname()[1]  # type: ignore
+
+    async def stop(self):
+        """Stop serving.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> MockServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_):
+        await self.stop()
+
+    # --- #
+
+    def _user_data(self, username: str, index: int = 0) -> dict:
+        return {
+            "username": username,
+            "avatar": f"https://img.wattpad.com/useravatar/{username}.128.jpg",
+            "isPrivate": False,
+            "backgroundUrl": f"https://img.wattpad.com/userbg/{username}.jpg",
+            "name": username.title(),
+            "description": "d" * self.payload,
+            "status": "",
+            "gender": "",
+            "genderCode": "",
+            "language": 1,
+            "locale": "en_US",
+            "createDate": "2020-01-01T00:00:00Z",
+            "modifyDate": "2024-01-01T00:00:00Z",
+            "location": "",
+            "verified": index % 7 == 0,
+            "ambassador": False,
+            "votesReceived": index * 3,
+            "numStoriesPublished": index % 5,
+            "numFollowing": index % 100,
+            "numFollowers": index,
+            "numLists": 2,
+            "allowCrawler": True,
+            "deeplink": f"https://www.wattpad.com/user/{username}",
+        }
+
+    def _story_data(self, id_: int) -> dict:
+        return {
+            "id": str(id_),
+            "title": f"Story {id_}",
+            "createDate": "2020-01-01T00:00:00Z",
+            "modifyDate": "2024-01-01T00:00:00Z",
+            "voteCount": id_ * 2,
+            "readCount": id_ * 10,
+            "commentCount": id_,
+            "description": "s" * self.payload,
+            "completed": id_ % 2 == 0,
+            "tags": ["fantasy", "romance", "adventure"],
+            "rating": 1,
+            "mature": False,
+            "url": f"https://www.wattpad.com/story/{id_}",
+            "isPaywalled": False,
+            "cover": f"https://img.wattpad.com/cover/{id_}.jpg",
+            "categories": [1, 2],
+            "copyright": 1,
+            "firstPartId": id_ * 100,
+            "numParts": self.parts,
+            "deleted": False,
+            "firstPublishedPart": {
+                "id": id_ * 100,
+                "createDate": "2020-01-01T00:00:00Z",
+            },
+            "lastPublishedPart": {
+                "id": id_ * 100 + self.parts - 1,
+                "createDate": "2024-01-01T00:00:00Z",
+            },
+            "language": {"id": 1, "name": "English"},
+            "user": {"username": f"author{id_ % 50}", "name": "Author"},
+            "parts": [
+                {
+                    "id": id_ * 100 + i,
+                    "title": f"Part {i}",
+                    "url": f"https://www.wattpad.com/{id_ * 100 + i}",
+                    "createDate": "2020-01-01T00:00:00Z",
+                    "modifyDate": "2024-01-01T00:00:00Z",
+                    "commentCount": i,
+                    "voteCount": i * 2,
+                    "readCount": i * 10,
+                }
+                for i in range(self.parts)
+            ],
+            "tagRankings": [
+                {"name": "fantasy", "rank": 10, "total": 1000},
+                {"name": "romance", "rank": 20, "total": 2000},
+            ],
+        }
+
+    @lru_cache(maxsize=4096)
+    def _render(self, kind: str, key: str, limit: int, offset: int) -> bytes:
+        """Build a response body. Bodies are memoized, so the server's own work doesn't skew results."""
+        page = range(offset, min(offset + limit, self.total))
+
+        if kind == "user":
+            data = self._user_data(key)
+        elif kind == "users":
+            data = {
+                "users": [self._user_data(f"{key}{i}", i) for i in page],
+                "total": self.total,
+            }
+        elif kind == "user_stories":
+            data = {
+                "stories": [self._story_data(i) for i in range(10)],
+                "total": 10,
+            }
+        elif kind == "lists":
+            data = {
+                "lists": [
+                    {
+                        "id": i,
+                        "name": f"List {i}",
+                        "stories": [self._story_data(i * 10 + j) for j in range(5)],
+                    }
+                    for i in page
+                ],
+                "total": self.total,
+            }
+        elif kind == "story":
+            data = self._story_data(int(key) if key.isdigit() else 0)
+        else:
+            data = [self._story_data(i) for i in page]
+
+        return json.dumps(data).encode()
+
+    async def _respond(
+        self,
+        request: web.Request,
+        kind: str,
+        key: str,
+        default_limit: int = 20,
+    ) -> web.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        limit = int(request.query.get("limit", default_limit))
+        offset = int(request.query.get("offset", 0))
+        return web.Response(
+            body=self._render(kind, key, limit, offset),
+            content_type="application/json",
+        )
+
+    async def _user(self, request: web.Request) -> web.Response:
+        return await self._respond(request, "user", request.match_info["username"])
+
+    async def _user_stories(self, request: web.Request) -> web.Response:
+        return await self._respond(
+            request, "user_stories", request.match_info["username"]
+        )
+
+    async def _users(self, request: web.Request) -> web.Response:
+        prefix = "follower" if request.path.endswith("followers") else "followed"
+        return await self._respond(request, "users", prefix)
+
+    async def _lists(self, request: web.Request) -> web.Response:
+        return await self._respond(request, "lists", request.match_info["username"])
+
+    async def _story(self, request: web.Request) -> web.Response:
+        return await self._respond(request, "story", request.match_info["id"])
+
+    async def _recommended(self, request: web.Request) -> web.Response:
+        return await self._respond(request, "recommended", request.match_info["id"])
+
+    async def _text(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        return web.Response(body=self._render_text(), content_type="text/html")
+
+    @lru_cache(maxsize=1)
+    def _render_text(self) -> bytes:
+        paragraph = b"<p>" + b"Lorem ipsum dolor sit amet. " * 8 + b"</p>\n"
+        return (paragraph * (self.text_size // len(paragraph) + 1))[: self.text_size]
@@ -10,4 +10,17 @@ You should have received a copy of the GNU General Public License along with thi
 
 Entrypoint."""
 
-from wattpad.wattpad import User, Story, List
+from wattpad.wattpad import User, Story, Part, List, fetch_many
+from wattpad.client import WattpadClient, RateLimiter
+from wattpad.cache import MemoryCache, SQLiteCache
+from wattpad.fields import FieldSpec
+from wattpad.export import export_epub, export_text, export_many
+from wattpad.crawler import Crawler
+from wattpad.graph import GraphStore
+from wattpad.registry import LRURetention, TTLRetention, WeakRetention
+from wattpad.metrics import Metrics
+from wattpad.snapshot import dump_snapshot, load_snapshot
+from wattpad.timeseries import TimeSeriesStore
+from wattpad.watcher import Watcher
+from wattpad.sync import BackgroundLoop, blocking
+from wattpad.sharding import fetch_sharded
@@ -0,0 +1,636 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+Response caches for the Wattpad API. Responses are cached using the built URL as a key, and expire as per the TTL of their endpoint.
+
+Caches understand the `fields=` query parameter. A request for a subset of the fields of a cached response is answered from that response, e.g. `stories/1?fields=title` is answered by a cached `stories/1?fields=title,tags`.
+
+>>> cache = SQLiteCache("wattpad.sqlite", ttls={"users/*/followers": 600})
+>>> async with WattpadClient(cache=cache):
+...     await User("<username>").fetch()  # Survives restarts.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from threading import Lock
+from typing import NamedTuple, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from .utils import fields_cover, get_endpoint, parse_fields, project_fields
+
+DEFAULT_TTLS: dict[str, float] = {
+    "users/*/followers": 60 * 60,
+    "users/*/following": 60 * 60,
+    "users/*/lists": 60 * 60,
+    "stories/*/recommended": 6 * 60 * 60,
+    "users/*": 60 * 60,
+    "stories/*": 60 * 60,
+}  # ! Patterns are matched against the endpoint (the path after `/api/v3/`) in order, the first match wins. More specific patterns must come first, `*` matches `/` too.
+
+
+class CacheEntry(NamedTuple):
+    """A cached response.
+
+    Attributes:
+        body (bytes): The raw response body.
+        expires_at (float): Timestamp at which the response expires.
+        etag (Optional[str]): The `ETag` header of the response, if any.
+        last_modified (Optional[str]): The `Last-Modified` header of the response, if any.
+    """
+
+    body: bytes
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the response hasn't expired."""
+        return self.expires_at >= time.time()
+
+
+def split_url(url: str) -> tuple[str, Optional[str]]:
+    """Split a URL into its `fields=` query parameter, and the rest of the URL. Remaining query parameters are sorted.
+
+    Example:
+    ```py
+    >>> split_url("https://www.wattpad.com/api/v3/users/x/followers?limit=5&fields=users(username)")
+    ('https://www.wattpad.com/api/v3/users/x/followers?limit=5', 'users(username)')
+    ```
+
+    Args:
+        url (str): The URL to split.
+
+    Returns:
+        tuple[str, Optional[str]]: The URL without its fields, and the field query string. None if the URL has no fields.
+    """
+    parts = urlsplit(url)
+    fields = None
+    params = []
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        if key == "fields":
+            fields = value
+        else:
+            params.append((key, value))
+
+    base = f"{parts.scheme}://{parts.netloc}{parts.path}"
+    if params:
+        base += "?" + urlencode(sorted(params))
+    return base, fields
+
+
+def matches_pattern(pattern: str, url: str) -> bool:
+    """Match the URL of a cached response against an invalidation pattern, see `ResponseCache.invalidate`. Every backend matches with this, so a pattern removes the same responses from each.
+
+    Example:
+    ```py
+    >>> matches_pattern("users/wattpad*", "https://www.wattpad.com/api/v3/users/wattpad/followers?limit=5")
+    True
+    ```
+
+    Args:
+        pattern (str): A glob pattern, matched against the full URL if it starts with `http`, the endpoint otherwise.
+        url (str): The URL of the response.
+
+    Returns:
+        bool: Whether the pattern matches.
+    """
+    return fnmatchcase(
+        url if pattern.startswith("http") else get_endpoint(url), pattern
+    )
+
+
+@lru_cache(maxsize=1024)
+def _parse_fields(fields_str: str) -> dict:
+    """`parse_fields`, memoized. The returned dictionary is shared and must not be modified."""
+    return parse_fields(fields_str)
+
+
+class ResponseCache(ABC):
+    """Base class of response caches. Subclasses store raw response bodies, and implement the abstract methods. This class decides how long responses are kept for.
+
+    Attributes:
+        ttls (dict[str, float]): Seconds a response is fresh for, per endpoint pattern.
+        default_ttl (float): Seconds a response is fresh for, if no pattern in `ttls` matches.
+        max_entries (Optional[int]): Maximum number of cached responses. Least recently used responses are evicted first.
+        max_bytes (Optional[int]): Maximum total size of cached responses. Least recently used responses are evicted first.
+        field_aware (bool): Whether requests for a subset of a cached response's fields are answered from that response.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[dict[str, float]] = None,
+        default_ttl: float = 60 * 60,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        field_aware: bool = True,
+    ):
+        """Create a ResponseCache object.
+
+        Args:
+            ttls (Optional[dict[str, float]], optional): Seconds a response is fresh for, per endpoint pattern. These take precedence over `DEFAULT_TTLS`. Defaults to None.
+            default_ttl (float, optional): Seconds a response is fresh for, if no pattern matches. Defaults to an hour.
+            max_entries (Optional[int], optional): Maximum number of cached responses. Defaults to None (unbounded).
+            max_bytes (Optional[int], optional): Maximum total size of cached responses, in bytes. Defaults to None (unbounded).
+            field_aware (bool, optional): Whether requests for a subset of a cached response's fields are answered from that response. Defaults to True.
+        """
+        self.ttls: dict[str, float] = dict(ttls or {})
+        for pattern, ttl in DEFAULT_TTLS.items():
+            self.ttls.setdefault(pattern, ttl)
+
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.field_aware = field_aware
+
+        self.lock = Lock()
+
+    def ttl_for(self, url: str) -> float:
+        """Retrieve the number of seconds a response is fresh for.
+
+        Args:
+            url (str): The URL of the response.
+
+        Returns:
+            float: The TTL of the response, in seconds.
+        """
+        endpoint = get_endpoint(url)
+        for pattern, ttl in self.ttls.items():
+            if fnmatchcase(endpoint, pattern):
+                return ttl
+        return self.default_ttl
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Retrieve a fresh cached response. If the URL isn't cached, a fresh response to the same endpoint with a superset of its fields is used instead.
+
+        Args:
+            url (str): The URL of the response.
+
+        Returns:
+            Optional[bytes]: The raw response body. None if the response isn't cached, or has expired.
+        """
+        entry = self._load(url)
+        if entry is not None and entry.fresh:
+            return entry.body
+        if not self.field_aware:
+            return None
+
+        base, fields_str = split_url(url)
+        if not fields_str:
+            return None
+        requested = _parse_fields(fields_str)
+
+        for other in self._siblings(base):
+            if other == url:
+                continue
+
+            _, other_fields_str = split_url(other)
+            if not other_fields_str:
+                continue
+            available = _parse_fields(other_fields_str)
+            if not fields_cover(available, requested):
+                continue
+
+            entry = self._load(other)
+            if entry is None or not entry.fresh:
+                continue
+            return json.dumps(
+                project_fields(json.loads(entry.body), requested, available),
+                separators=(",", ":"),
+            ).encode()
+
+        return None
+
+    def get_entry(self, url: str) -> Optional[CacheEntry]:
+        """Retrieve a cached response, even if it has expired. Expired responses with an `ETag` or `Last-Modified` header can be revalidated with a conditional request.
+
+        Args:
+            url (str): The URL of the response.
+
+        Returns:
+            Optional[CacheEntry]: The cached response. None if the response isn't cached.
+        """
+        return self._load(url)
+
+    def set(
+        self,
+        url: str,
+        body: bytes,
+        ttl: Optional[float] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """Cache a response, evicting the least recently used responses if a limit is exceeded.
+
+        Args:
+            url (str): The URL of the response.
+            body (bytes): The raw response body.
+            ttl (Optional[float], optional): Seconds the response is fresh for. Defaults to the TTL of the URL's endpoint.
+            etag (Optional[str], optional): The `ETag` header of the response. Defaults to None.
+            last_modified (Optional[str], optional): The `Last-Modified` header of the response. Defaults to None.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        if ttl is None:
+            ttl = self.ttl_for(url)
+
+        base, _ = split_url(url)
+        self._store(url, base, CacheEntry(body, time.time() + ttl, etag, last_modified))
+
+    @abstractmethod
+    def _load(self, url: str) -> Optional[CacheEntry]:
+        """Retrieve a cached response, fresh or not, marking it as recently used.
+
+        Args:
+            url (str): The URL of the response.
+
+        Returns:
+            Optional[CacheEntry]: The cached response. None if the response isn't cached.
+        """
+
+    @abstractmethod
+    def _store(self, url: str, base: str, entry: CacheEntry):
+        """Store a response, evicting the least recently used responses if a limit is exceeded.
+
+        Args:
+            url (str): The URL of the response.
+            base (str): The URL without its fields, see `split_url`.
+            entry (CacheEntry): The response.
+
+        Returns:
+            None: Nothing is returned.
+        """
+
+    @abstractmethod
+    def _siblings(self, base: str) -> list[str]:
+        """Retrieve the URLs of cached responses that only differ from `base` by their fields.
+
+        Args:
+            base (str): The URL without its fields, see `split_url`.
+
+        Returns:
+            list[str]: The URLs of the cached responses.
+        """
+
+    @abstractmethod
+    def invalidate(self, pattern: str) -> int:
+        """Remove cached responses. The pattern is matched against full URLs if it starts with `http`, endpoints otherwise.
+
+        Example:
+        ```py
+        >>> cache.invalidate("users/wattpad*")  # The user and all of their sub-resources.
+        >>> cache.invalidate("*/recommended")
+        ```
+
+        Args:
+            pattern (str): A glob pattern, or a URL.
+
+        Returns:
+            int: The number of removed responses.
+        """
+
+    @abstractmethod
+    def clear(self):
+        """Remove all cached responses.
+
+        Returns:
+            None: Nothing is returned.
+        """
+
+
+class MemoryCache(ResponseCache):
+    """An in-memory response cache. Responses die with the process.
+
+    Attributes:
+        ttls (dict[str, float]): Seconds a response is fresh for, per endpoint pattern.
+        default_ttl (float): Seconds a response is fresh for, if no pattern in `ttls` matches.
+        max_entries (Optional[int]): Maximum number of cached responses.
+        max_bytes (Optional[int]): Maximum total size of cached responses.
+        field_aware (bool): Whether requests for a subset of a cached response's fields are answered from that response.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[dict[str, float]] = None,
+        default_ttl: float = 60 * 60,
+        max_entries: Optional[int] = 10_000,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        field_aware: bool = True,
+    ):
+        """Create a MemoryCache object.
+
+        Args:
+            ttls (Optional[dict[str, float]], optional): Seconds a response is fresh for, per endpoint pattern. These take precedence over `DEFAULT_TTLS`. Defaults to None.
+            default_ttl (float, optional): Seconds a response is fresh for, if no pattern matches. Defaults to an hour.
+            max_entries (Optional[int], optional): Maximum number of cached responses. Defaults to 10,000.
+            max_bytes (Optional[int], optional): Maximum total size of cached responses, in bytes. Defaults to 64 MiB.
+            field_aware (bool, optional): Whether requests for a subset of a cached response's fields are answered from that response. Defaults to True.
+        """
+        super().__init__(ttls, default_ttl, max_entries, max_bytes, field_aware)
+
+        self._entries: OrderedDict[str, tuple[CacheEntry, str]] = OrderedDict()
+        self._by_base: dict[str, set[str]] = {}
+        self._size = 0
+
+    def _remove(self, url: str):
+        """Remove a response. The caller must hold `self.lock`.
+
+        Args:
+            url (str): The URL of the response.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        entry, base = self._entries.pop(url)
+        self._size -= len(entry.body)
+
+        siblings = self._by_base[base]
+        siblings.discard(url)
+        if not siblings:
+            del self._by_base[base]
+
+    def _load(self, url: str) -> Optional[CacheEntry]:
+        with self.lock:
+            stored = self._entries.get(url)
+            if stored is None:
+                return None
+
+            self._entries.move_to_end(url)
+            return stored[0]
+
+    def _store(self, url: str, base: str, entry: CacheEntry):
+        with self.lock:
+            if url in self._entries:
+                self._remove(url)
+
+            self._entries[url] = (entry, base)
+            self._by_base.setdefault(base, set()).add(url)
+            self._size += len(entry.body)
+
+            while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None and self._size > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def _siblings(self, base: str) -> list[str]:
+        with self.lock:
+            return list(self._by_base.get(base, ()))
+
+    def invalidate(self, pattern: str) -> int:
+        with self.lock:
+            matches = [url for url in self._entries if matches_pattern(pattern, url)]
+            for url in matches:
+                self._remove(url)
+
+            return len(matches)
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+            self._by_base.clear()
+            self._size = 0
+
+
+class SQLiteCache(ResponseCache):
+    """A persistent response cache, backed by an SQLite database. Responses survive restarts, and the database can be shared between processes.
+
+    Attributes:
+        path (str): Path to the SQLite database.
+        ttls (dict[str, float]): Seconds a response is fresh for, per endpoint pattern.
+        default_ttl (float): Seconds a response is fresh for, if no pattern in `ttls` matches.
+        max_entries (Optional[int]): Maximum number of cached responses.
+        max_bytes (Optional[int]): Maximum total size of cached responses.
+        field_aware (bool): Whether requests for a subset of a cached response's fields are answered from that response.
+        touch_interval (float): Seconds before a read records the use of a response again, for eviction.
+    """
+
+    SCHEMA_VERSION = 2
+    _TOUCH_BATCH = 256
+
+    def __init__(
+        self,
+        path: str = "wattpad_cache.sqlite",
+        ttls: Optional[dict[str, float]] = None,
+        default_ttl: float = 60 * 60,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = 512 * 1024 * 1024,
+        field_aware: bool = True,
+        touch_interval: float = 60.0,
+    ):
+        """Create an SQLiteCache object, creating the database if it doesn't exist.
+
+        Args:
+            path (str, optional): Path to the SQLite database. Defaults to "wattpad_cache.sqlite".
+            ttls (Optional[dict[str, float]], optional): Seconds a response is fresh for, per endpoint pattern. These take precedence over `DEFAULT_TTLS`. Defaults to None.
+            default_ttl (float, optional): Seconds a response is fresh for, if no pattern matches. Defaults to an hour.
+            max_entries (Optional[int], optional): Maximum number of cached responses. Defaults to None (unbounded).
+            max_bytes (Optional[int], optional): Maximum total size of cached responses, in bytes. Defaults to 512 MiB.
+            field_aware (bool, optional): Whether requests for a subset of a cached response's fields are answered from that response. Defaults to True.
+            touch_interval (float, optional): Seconds before a read records the use of a response again. Uses are written in batches, so reads don't take the database's write lock. Defaults to a minute.
+        """
+        super().__init__(ttls, default_ttl, max_entries, max_bytes, field_aware)
+
+        self.path = path
+        self.touch_interval = touch_interval
+        self._touched: dict[
+            str, float
+        ] = {}  # ! URL to the time of its last use, not yet written.
+
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )  # ! Access is serialized by `self.lock`. Autocommit mode, every statement is its own transaction.
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+
+        (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+        if version != self.SCHEMA_VERSION:
+            # ! It's a cache, databases from other versions are discarded rather than migrated.
+            self._connection.execute("DROP TABLE IF EXISTS responses")
+            self._connection.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                base TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )"""
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_base ON responses (base)"
+        )
+
+        self._count, self._size = self._totals()
+
+    def __repr__(self) -> str:
+        return f"<SQLiteCache path={self.path}>"
+
+    def _totals(self) -> tuple[int, int]:
+        """Count the cached responses and their total size.
+
+        Returns:
+            tuple[int, int]: The number of cached responses, and their total size in bytes.
+        """
+        count, size = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        return count, size
+
+    def _write_touched(self):
+        """Write the pending uses of responses in a single transaction, with `lock` held.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        if not self._touched:
+            return
+
+        touched, self._touched = self._touched, {}
+        self._connection.execute("BEGIN")
+        try:
+            self._connection.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?",
+                [(accessed_at, url) for url, accessed_at in touched.items()],
+            )
+            self._connection.execute("COMMIT")
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self):
+        """Evict the least recently used responses until the limits are respected.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        self._write_touched()
+        # ! Other processes may share the database, the running totals are only an estimate.
+        self._count, self._size = self._totals()
+
+        if self.max_entries is not None and self._count > self.max_entries:
+            self._connection.execute(
+                "DELETE FROM responses WHERE url IN (SELECT url FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (self._count - self.max_entries,),
+            )
+
+        if self.max_bytes is not None and self._size > self.max_bytes:
+            self._connection.execute(
+                """DELETE FROM responses WHERE url IN (
+                    SELECT url FROM (
+                        SELECT url, SUM(size) OVER (ORDER BY accessed_at DESC) AS running FROM responses
+                    ) WHERE running > ?
+                )""",
+                (self.max_bytes,),
+            )
+
+        self._count, self._size = self._totals()
+
+    def _load(self, url: str) -> Optional[CacheEntry]:
+        with self.lock:
+            row = self._connection.execute(
+                "SELECT body, expires_at, etag, last_modified, accessed_at FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            # ! Eviction only needs a coarse order. Recent uses aren't recorded again, the rest are written in batches.
+            now = time.time()
+            if now - row[4] >= self.touch_interval:
+                self._touched[url] = now
+                if len(self._touched) >= self._TOUCH_BATCH:
+                    self._write_touched()
+            return CacheEntry(*row[:4])
+
+    def _store(self, url: str, base: str, entry: CacheEntry):
+        with self.lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    base,
+                    get_endpoint(url),
+                    entry.body,
+                    len(entry.body),
+                    entry.expires_at,
+                    time.time(),
+                    entry.etag,
+                    entry.last_modified,
+                ),
+            )
+            self._count += 1
+            self._size += len(entry.body)
+
+            if (self.max_entries is not None and self._count > self.max_entries) or (
+                self.max_bytes is not None and self._size > self.max_bytes
+            ):
+                self._evict()
+
+    def _siblings(self, base: str) -> list[str]:
+        with self.lock:
+            rows = self._connection.execute(
+                "SELECT url FROM responses WHERE base = ?", (base,)
+            ).fetchall()
+        return [url for (url,) in rows]
+
+    def invalidate(self, pattern: str) -> int:
+        with self.lock:
+            # ! Matched in Python rather than with SQL's GLOB, whose syntax differs from `fnmatch`'s (`[^...]`, case of ranges).
+            matches = [
+                url
+                for (url,) in self._connection.execute("SELECT url FROM responses")
+                if matches_pattern(pattern, url)
+            ]
+            if matches:
+                self._connection.execute("BEGIN")
+                try:
+                    self._connection.executemany(
+                        "DELETE FROM responses WHERE url = ?",
+                        [(url,) for url in matches],
+                    )
+                    self._connection.execute("COMMIT")
+                except BaseException:
+                    self._connection.execute("ROLLBACK")
+                    raise
+            self._count, self._size = self._totals()
+            return len(matches)
+
+    def clear(self):
+        with self.lock:
+            self._connection.execute("DELETE FROM responses")
+            self._touched.clear()
+            self._count, self._size = 0, 0
+
+    def close(self):
+        """Write pending uses of responses, and close the database connection.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        with self.lock:
+            self._write_touched()
+            self._connection.close()
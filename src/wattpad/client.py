@@ -0,0 +1,793 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+The HTTP Client used to talk to the Wattpad API. A client owns a pooled connection per event loop, which is reused across requests.
+
+>>> async with WattpadClient() as client:
+...     await User("<username>").fetch()  # Uses `client`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+import weakref
+from contextvars import ContextVar, Token
+from email.utils import parsedate_to_datetime
+from os import environ
+from threading import Lock
+from typing import Any, AsyncIterator, Callable, Mapping, NamedTuple, Optional
+
+import aiohttp
+
+from .cache import MemoryCache, ResponseCache
+from .utils import base_headers
+
+_no_cache = object()
+
+WATTPAD_ORIGIN = "https://www.wattpad.com"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+VALIDATION_MODES = ("eager", "lazy", "trusted")
+HOOK_EVENTS = (
+    "request_start",
+    "response",
+    "cache_hit",
+    "cache_miss",
+    "retry",
+    "parse_complete",
+)
+RETRY_EXCEPTIONS = (
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    asyncio.TimeoutError,
+)
+
+
+class HookEvent(NamedTuple):
+    """An event passed to the hooks of a client, see `WattpadClient.add_hook`. Fields that don't apply to an event are None.
+
+    Attributes:
+        event (str): The name of the event, one of `HOOK_EVENTS`.
+        url (str): The requested URL.
+        attempt (int): The number of attempts made so far, minus one. For `request_start`, `response` and `retry`.
+        status (Optional[int]): The status of the response. For `response`, and `retry` of a throttled or failed response.
+        elapsed (Optional[float]): Seconds from the start of the attempt to the end of the response, for `response`. Seconds spent turning the response into objects, for `parse_complete`.
+        size (Optional[int]): The size of the response body, in bytes. For `response`, unless the response failed or was streamed.
+        delay (Optional[float]): Seconds waited for before the next attempt, for `retry`.
+        error (Optional[BaseException]): The exception of a disconnected attempt, for `retry`.
+        objects (tuple): The Users, Stories and Lists parsed from the response, for `parse_complete`.
+    """
+
+    event: str
+    url: str
+    attempt: int = 0
+    status: Optional[int] = None
+    elapsed: Optional[float] = None
+    size: Optional[int] = None
+    delay: Optional[float] = None
+    error: Optional[BaseException] = None
+    objects: tuple = ()
+
+
+class RateLimiter:
+    """A token bucket limiting the rate of requests. Share one limiter between clients to give them a common budget.
+    **Note**: In adaptive mode, the rate is halved whenever the API throttles a request, and recovers gradually as requests succeed. (Additive increase, multiplicative decrease.)
+
+    Attributes:
+        max_rate (float): Maximum number of requests per second.
+        rate (float): Current number of requests per second. Lower than `max_rate` after throttling, in adaptive mode.
+        burst (int): Number of requests that can be made at once, after a period of inactivity.
+        adaptive (bool): Whether the rate adapts to throttling.
+        min_rate (float): Lowest rate adaptive mode can fall to.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        adaptive: bool = True,
+        min_rate: float = 0.5,
+    ):
+        """Create a RateLimiter object.
+
+        Args:
+            rate (float): Maximum number of requests per second.
+            burst (Optional[int], optional): Number of requests that can be made at once. Defaults to `rate`, rounded up.
+            adaptive (bool, optional): Whether the rate adapts to throttling. Defaults to True.
+            min_rate (float, optional): Lowest rate adaptive mode can fall to. Defaults to 0.5.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate + 0.999))
+        self.adaptive = adaptive
+        self.min_rate = min(min_rate, rate)
+
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = (
+            Lock()
+        )  # ! A threading Lock, limiters may be shared by clients in several threads. It is never held across an await.
+
+    def __repr__(self) -> str:
+        return f"<RateLimiter rate={self.rate:.2f} max_rate={self.max_rate}>"
+
+    def _reserve(self) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the number of seconds to wait before trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    async def acquire(self):
+        """Wait until a request may be made.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        while (delay := self._reserve()) > 0:
+            await asyncio.sleep(delay)
+
+    def throttled(self, retry_after: Optional[float] = None):
+        """Report that the API throttled a request. All requests are paused for `retry_after` seconds, and the rate is halved in adaptive mode.
+
+        Args:
+            retry_after (Optional[float], optional): Seconds the API asked to wait for. Defaults to None.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        with self._lock:
+            if retry_after:
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + retry_after
+                )
+            if self.adaptive:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._tokens = min(self._tokens, 0)
+
+    def succeeded(self):
+        """Report that a request succeeded. The rate recovers towards `max_rate` in adaptive mode.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        if not self.adaptive or self.rate >= self.max_rate:
+            return
+
+        with self._lock:
+            self.rate = min(
+                self.max_rate, self.rate + self.max_rate / 100
+            )  # ! About a hundred successes to recover from each halving.
+
+
+class WattpadClient:
+    """A pooled HTTP Client for the Wattpad API.
+    **Note**: Connections are kept alive and reused between requests. Create one client and share it, rather than creating a client per request.
+    **Note**: API Responses are cached using the URL as a key. Set the `WPPY_SKIP_CACHE` Environment Variable to True to bypass the cache.
+
+    Attributes:
+        headers (dict): Headers sent with every request.
+        cache (Optional[ResponseCache]): The response cache. None if responses aren't cached.
+        limit (int): Maximum number of simultaneous connections.
+        limit_per_host (int): Maximum number of simultaneous connections to a single host.
+        keepalive_timeout (float): Seconds an idle connection is kept open for reuse.
+        ttl_dns_cache (int): Seconds a DNS lookup is cached for.
+        timeout (float): Total timeout of a single request, in seconds.
+        rate_limiter (Optional[RateLimiter]): Limits the rate of requests. None if requests aren't limited.
+        max_retries (int): Number of times a throttled, failed (5xx) or disconnected request is retried.
+        backoff_base (float): Seconds the first retry waits for, at most. Doubles with each retry.
+        backoff_max (float): Maximum number of seconds a retry waits for.
+        retry_after_max (float): Maximum number of seconds a `Retry-After` header is honoured for.
+        validation (str): How API Data is turned into models. `eager` validates it as it's fetched. `lazy` keeps it raw and validates it on first access of an object's `data`. `trusted` also waits for first access, then builds models without validation.
+        base_url (Optional[str]): The origin requests to Wattpad are sent to instead, e.g. a mirror or a mock server. None if requests are sent to Wattpad.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[dict] = None,
+        cache: Optional[ResponseCache] = _no_cache,  # type: ignore
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30.0,
+        ttl_dns_cache: int = 300,
+        timeout: float = 30.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_after_max: float = 300.0,
+        validation: str = "eager",
+        base_url: Optional[str] = None,
+    ):
+        """Create a WattpadClient object. No connections are opened until the first request.
+
+        Args:
+            headers (Optional[dict], optional): Headers to merge atop of `base_headers`. Defaults to None.
+            cache (Optional[ResponseCache], optional): The response cache, see `wattpad.cache`. Pass None to disable caching. Defaults to a `MemoryCache`.
+            limit (int, optional): Maximum number of simultaneous connections. Defaults to 100.
+            limit_per_host (int, optional): Maximum number of simultaneous connections to a single host. Defaults to 20.
+            keepalive_timeout (float, optional): Seconds an idle connection is kept open for reuse. Defaults to 30.0.
+            ttl_dns_cache (int, optional): Seconds a DNS lookup is cached for. Defaults to 300.
+            timeout (float, optional): Total timeout of a single request, in seconds. Defaults to 30.0.
+            rate_limiter (Optional[RateLimiter], optional): Limits the rate of requests. Defaults to None (unlimited).
+            max_retries (int, optional): Number of times a throttled, failed (5xx) or disconnected request is retried. Defaults to 3.
+            backoff_base (float, optional): Seconds the first retry waits for, at most. Doubles with each retry. Defaults to 0.5.
+            backoff_max (float, optional): Maximum number of seconds a retry waits for. Defaults to 30.0.
+            retry_after_max (float, optional): Maximum number of seconds a `Retry-After` header is honoured for. Longer waits are cut short, a bad header would otherwise pause every request through the rate limiter. Defaults to 300.0.
+            validation (str, optional): How API Data is turned into models: `eager`, `lazy` or `trusted`. `lazy` and `trusted` skip the work for objects whose `data` is never read, `trusted` skips validation altogether. Defaults to "eager".
+            base_url (Optional[str], optional): The origin to send requests to Wattpad to instead, e.g. `http://127.0.0.1:8080`. URLs are rewritten as they're requested, cache keys keep the Wattpad URL. Defaults to None.
+
+        Raises:
+            ValueError: The validation mode isn't supported.
+        """
+        if validation not in VALIDATION_MODES:
+            raise ValueError(
+                f"Unsupported validation mode {validation!r}, expected one of {VALIDATION_MODES}."
+            )
+
+        self.headers = base_headers.copy()
+        if headers:
+            self.headers.update(headers)
+
+        if cache is _no_cache:
+            cache = MemoryCache()
+        self.cache: Optional[ResponseCache] = cache
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.timeout = timeout
+
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.validation = validation
+        self.base_url = base_url.rstrip("/") if base_url else None
+
+        self._sessions: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, aiohttp.ClientSession
+        ] = (
+            weakref.WeakKeyDictionary()
+        )  # ! aiohttp sessions are bound to the event loop they were created in. Keeping one session per loop lets a client be shared between threads (each with their own loop), and sessions are dropped alongside their loop.
+        self._closers: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Task
+        ] = weakref.WeakKeyDictionary()
+        self._inflight: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Future[bytes]]
+        ] = weakref.WeakKeyDictionary()
+        # ! Per task, tasks entering the client concurrently each reset their own context.
+        self._tokens: weakref.WeakKeyDictionary[
+            asyncio.Task, list[Token]
+        ] = weakref.WeakKeyDictionary()
+        # ! Per loop, the number of `async with` blocks open. The session is closed when the last of them exits.
+        self._entered: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, int
+        ] = weakref.WeakKeyDictionary()
+        self._hooks: dict[str, list[Callable[[HookEvent], Any]]] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<WattpadClient limit={self.limit} limit_per_host={self.limit_per_host}>"
+        )
+
+    def add_hook(self, event: str, callback: Callable[[HookEvent], Any]):
+        """Call a function whenever an event occurs. Hooks are called synchronously, in the thread of the request, and should return quickly. Exceptions raised by a hook propagate to the request.
+
+        Example:
+        ```py
+        >>> client.add_hook("retry", lambda event: print(event.url, event.status))
+        ```
+
+        Args:
+            event (str): The event, one of `HOOK_EVENTS`.
+            callback (Callable[[HookEvent], Any]): Called with a `HookEvent`.
+
+        Raises:
+            ValueError: The event isn't supported.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        if event not in HOOK_EVENTS:
+            raise ValueError(
+                f"Unsupported hook event {event!r}, expected one of {HOOK_EVENTS}."
+            )
+        # ! Replaced rather than appended to, so events being emitted aren't affected.
+        self._hooks[event] = [*self._hooks.get(event, []), callback]
+
+    def remove_hook(self, event: str, callback: Callable[[HookEvent], Any]):
+        """Stop calling a function added with `add_hook`.
+
+        Args:
+            event (str): The event.
+            callback (Callable[[HookEvent], Any]): The function.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        callbacks = [hook for hook in self._hooks.get(event, []) if hook != callback]
+        if callbacks:
+            self._hooks[event] = callbacks
+        else:
+            self._hooks.pop(event, None)
+
+    def emit(self, event: str, url: str, **fields):
+        """Call the hooks of an event. Nothing is done if the event has no hooks.
+
+        Args:
+            event (str): The event.
+            url (str): The requested URL.
+            **fields (any): The remaining fields of the `HookEvent`.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        callbacks = self._hooks.get(event)
+        if callbacks:
+            info = HookEvent(event, url, **fields)
+            for callback in callbacks:
+                callback(info)
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a session with a pooled, keep-alive connector.
+
+        Returns:
+            aiohttp.ClientSession: The new session.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        return aiohttp.ClientSession(
+            headers=self.headers, connector=connector, timeout=timeout
+        )
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Retrieve the session for the running event loop, creating it if required.
+
+        Returns:
+            aiohttp.ClientSession: The session bound to the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = self._create_session()
+            self._sessions[loop] = session
+            self._closers[loop] = loop.create_task(
+                self._close_on_shutdown(session)
+            )  # ! `asyncio.run` cancels pending tasks before closing its loop. This closes the session when that happens, so `asyncio.run(user.fetch())` doesn't leave an unclosed session behind.
+        return session
+
+    @staticmethod
+    async def _close_on_shutdown(session: aiohttp.ClientSession):
+        """Wait until cancelled, then close the session.
+
+        Args:
+            session (aiohttp.ClientSession): The session to close.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        try:
+            await asyncio.Event().wait()
+        finally:
+            if not session.closed:
+                await session.close()
+
+    async def fetch(
+        self, url: str, headers: dict = {}, revalidate: bool = False
+    ) -> dict | list:
+        """Perform a GET Request to the provided URL, merging the provided headers with the client's headers.
+        **Note**: Concurrent requests for the same URL are coalesced into a single request.
+
+        Args:
+            url (str): The URL to request.
+            headers (dict, optional): Additional headers for this request. Defaults to {}.
+            revalidate (bool, optional): Whether to check a fresh cached response with the API, see `fetch_bytes`. Defaults to False.
+
+        Returns:
+            dict | list: The JSON-Decoded Response.
+        """
+        return json.loads(
+            await self.fetch_bytes(url, headers, revalidate)
+        )  # ! Decoded per caller. Callers modify the decoded response while parsing it, and decoding is cheaper than a deep copy.
+
+    async def fetch_bytes(
+        self, url: str, headers: dict = {}, revalidate: bool = False
+    ) -> bytes:
+        """Retrieve the raw body of a GET Request, from the cache if possible. Concurrent requests for the same URL share a single request.
+        **Note**: Expired responses with an `ETag` or `Last-Modified` header are revalidated with a conditional request. If the API responds with `304 Not Modified`, the cached body is reused and its TTL renewed.
+
+        Args:
+            url (str): The URL to request.
+            headers (dict, optional): Additional headers for this request. Defaults to {}.
+            revalidate (bool, optional): Whether to check a fresh cached response with the API, rather than returning it as is. Defaults to False.
+
+        Returns:
+            bytes: The raw response body.
+        """
+        cache = None if environ.get("WPPY_SKIP_CACHE", False) else self.cache
+
+        if cache is not None and not revalidate:
+            body = cache.get(url)
+            if body is not None:
+                self.emit("cache_hit", url)
+                return body
+            self.emit("cache_miss", url)
+
+        key = url if not headers else f"{url} {sorted(headers.items())}"
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.setdefault(loop, {})
+
+        while (future := inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(
+                    future
+                )  # ! Shielded, so a cancelled follower doesn't cancel the request for everyone else.
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # ! The leading request was cancelled. One of the followers takes over.
+
+        future = loop.create_future()
+        future.add_done_callback(
+            lambda f: f.cancelled() or f.exception()
+        )  # ! Marks the exception as retrieved, even if nobody else was waiting.
+        inflight[key] = future
+
+        try:
+            stale = cache.get_entry(url) if cache is not None else None
+            conditional = headers
+            if stale is not None and (stale.etag or stale.last_modified):
+                conditional = dict(headers)
+                if stale.etag:
+                    conditional["If-None-Match"] = stale.etag
+                if stale.last_modified:
+                    conditional["If-Modified-Since"] = stale.last_modified
+
+            status, body, response_headers = await self._request(url, conditional)
+            if status == 304 and stale is not None:
+                body = stale.body
+
+            if cache is not None:
+                cache.set(
+                    url,
+                    body,
+                    etag=response_headers.get("ETag") or (stale and stale.etag),
+                    last_modified=response_headers.get("Last-Modified")
+                    or (stale and stale.last_modified),
+                )
+
+            future.set_result(body)
+            return body
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            inflight.pop(key, None)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Compute how long to wait before retrying a request. The `Retry-After` header is honoured if present, up to `retry_after_max` seconds, otherwise the delay is a random duration up to an exponentially growing cap. (Full jitter.)
+
+        Args:
+            attempt (int): The number of attempts made so far, minus one.
+            retry_after (Optional[str], optional): The `Retry-After` header of the response, in seconds or as an HTTP date. Defaults to None.
+
+        Returns:
+            float: Seconds to wait for.
+        """
+        if retry_after:
+            delay: Optional[float] = None
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    pass
+            # ! NaN fails both comparisons, and is treated as a missing header.
+            if delay is not None and delay == delay:
+                return min(max(0.0, delay), self.retry_after_max)
+
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * 2**attempt)
+        )
+
+    def _retry_delay(
+        self, response: aiohttp.ClientResponse, attempt: int
+    ) -> Optional[float]:
+        """Decide whether a response is retried. Throttled responses slow down the rate limiter.
+
+        Args:
+            response (aiohttp.ClientResponse): The response of the attempt.
+            attempt (int): The number of attempts made so far, minus one.
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying. None if the response is final.
+        """
+        if response.status not in RETRY_STATUSES or attempt >= self.max_retries:
+            return None
+
+        retry_after = response.headers.get("Retry-After")
+        delay = self._backoff(attempt, retry_after)
+        if response.status == 429 and self.rate_limiter is not None:
+            self.rate_limiter.throttled(delay if retry_after else None)
+        return delay
+
+    def _emit_response(
+        self,
+        url: str,
+        attempt: int,
+        response: aiohttp.ClientResponse,
+        started: float,
+        body: Optional[bytes] = None,
+    ):
+        """Emit the `response` event of an attempt.
+
+        Args:
+            url (str): The requested URL.
+            attempt (int): The number of attempts made so far, minus one.
+            response (aiohttp.ClientResponse): The response.
+            started (float): `time.perf_counter()` at the start of the attempt.
+            body (Optional[bytes], optional): The body of the response, if it was read. Defaults to None.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        if "response" in self._hooks:
+            self.emit(
+                "response",
+                url,
+                attempt=attempt,
+                status=response.status,
+                elapsed=time.perf_counter() - started,
+                size=len(body) if body is not None else None,
+            )
+
+    def _resolve(self, url: str) -> str:
+        """Rewrite a URL to Wattpad to the client's `base_url`, if one is set.
+
+        Args:
+            url (str): The URL to rewrite.
+
+        Returns:
+            str: The URL to request.
+        """
+        if self.base_url is not None and url.startswith(WATTPAD_ORIGIN):
+            return self.base_url + url[len(WATTPAD_ORIGIN) :]
+        return url
+
+    async def _request(
+        self, url: str, headers: dict = {}
+    ) -> tuple[int, bytes, Mapping[str, str]]:
+        """Perform a GET Request, respecting the rate limiter and retrying throttled, failed (5xx) and disconnected requests.
+
+        Args:
+            url (str): The URL to request.
+            headers (dict, optional): Additional headers for this request. Defaults to {}.
+
+        Raises:
+            aiohttp.ClientResponseError: The final attempt responded with an error status.
+
+        Returns:
+            tuple[int, bytes, Mapping[str, str]]: The status, raw body and headers of the response. The body of a `304 Not Modified` response is empty.
+        """
+        session = self.get_session()
+        limiter = self.rate_limiter
+        target = self._resolve(url)  # ! Hooks see the Wattpad URL.
+        attempt = 0
+
+        while True:
+            if limiter is not None:
+                await limiter.acquire()
+
+            self.emit("request_start", url, attempt=attempt)
+            started = time.perf_counter()
+            try:
+                async with session.get(target, headers=headers or None) as response:
+                    delay = self._retry_delay(response, attempt)
+                    if delay is None:
+                        if not response.ok:
+                            self._emit_response(url, attempt, response, started)
+                            response.raise_for_status()
+                        body = await response.read()
+                        self._emit_response(url, attempt, response, started, body)
+
+                        if limiter is not None:
+                            limiter.succeeded()
+                        return response.status, body, response.headers
+                    self.emit(
+                        "retry",
+                        url,
+                        attempt=attempt,
+                        status=response.status,
+                        delay=delay,
+                    )
+            except RETRY_EXCEPTIONS as error:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                self.emit("retry", url, attempt=attempt, delay=delay, error=error)
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def stream(
+        self, url: str, headers: dict = {}, chunk_size: int = 64 * 1024
+    ) -> AsyncIterator[bytes]:
+        """Perform a GET Request, yielding the body in chunks as it downloads rather than reading it whole.
+        **Note**: Streamed responses aren't cached or coalesced. Requests are retried like `fetch`'s until the first chunk is yielded, a connection lost after that is raised.
+
+        Example:
+        ```py
+        >>> async for chunk in client.stream(url):
+        ...     file.write(chunk)
+        ```
+
+        Args:
+            url (str): The URL to request.
+            headers (dict, optional): Additional headers for this request. Defaults to {}.
+            chunk_size (int, optional): Maximum size of each chunk, in bytes. Defaults to 64 KiB.
+
+        Raises:
+            aiohttp.ClientResponseError: The final attempt responded with an error status.
+
+        Yields:
+            bytes: Chunks of the raw response body, in order.
+        """
+        session = self.get_session()
+        limiter = self.rate_limiter
+        target = self._resolve(url)  # ! Hooks see the Wattpad URL.
+        attempt = 0
+        started = False
+
+        while True:
+            if limiter is not None:
+                await limiter.acquire()
+
+            self.emit("request_start", url, attempt=attempt)
+            sent = time.perf_counter()
+            try:
+                async with session.get(target, headers=headers or None) as response:
+                    delay = self._retry_delay(response, attempt)
+                    if delay is None:
+                        self._emit_response(url, attempt, response, sent)
+                        response.raise_for_status()
+                        if limiter is not None:
+                            limiter.succeeded()
+
+                        async for chunk in response.content.iter_chunked(chunk_size):
+                            started = True
+                            yield chunk
+                        return
+                    self.emit(
+                        "retry",
+                        url,
+                        attempt=attempt,
+                        status=response.status,
+                        delay=delay,
+                    )
+            except RETRY_EXCEPTIONS as error:
+                if started or attempt >= self.max_retries:
+                    raise  # ! Retrying after a chunk was yielded would repeat it.
+                delay = self._backoff(attempt)
+                self.emit("retry", url, attempt=attempt, delay=delay, error=error)
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def close(self):
+        """Close the session bound to the running event loop. Sessions of closed event loops are discarded.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        loop = asyncio.get_running_loop()
+        closer = self._closers.pop(loop, None)
+        if closer is not None:
+            closer.cancel()
+
+        session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+        for other_loop in list(self._sessions):
+            if other_loop.is_closed():
+                self._sessions.pop(other_loop, None)
+                self._closers.pop(other_loop, None)
+
+    async def __aenter__(self) -> WattpadClient:
+        task = asyncio.current_task()
+        assert task is not None  # ! `async with` always runs within a task.
+        self._tokens.setdefault(task, []).append(_current_client.set(self))
+        loop = asyncio.get_running_loop()
+        self._entered[loop] = self._entered.get(loop, 0) + 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        task = asyncio.current_task()
+        assert task is not None
+        tokens = self._tokens[task]
+        _current_client.reset(tokens.pop())
+        if not tokens:
+            del self._tokens[task]
+
+        loop = asyncio.get_running_loop()
+        entered = self._entered.pop(loop, 1) - 1
+        if entered:
+            self._entered[
+                loop
+            ] = entered  # ! Other tasks still have requests on the session.
+        else:
+            await self.close()
+
+
+_current_client: ContextVar[Optional[WattpadClient]] = ContextVar(
+    "wattpad_client", default=None
+)
+_default_client: Optional[WattpadClient] = None
+
+
+def get_client() -> WattpadClient:
+    """Retrieve the client in use. This is the innermost `async with WattpadClient()` block's client, or a shared default client.
+
+    Returns:
+        WattpadClient: The client in use.
+    """
+    global _default_client
+
+    client = _current_client.get()
+    if client is not None:
+        return client
+
+    if _default_client is None:
+        _default_client = WattpadClient()
+    return _default_client
+
+
+def set_default_client(client: WattpadClient):
+    """Replace the shared default client, used when no client is explicitly provided.
+
+    Args:
+        client (WattpadClient): The new default client.
+
+    Returns:
+        None: Nothing is returned.
+    """
+    global _default_client
+    _default_client = client
@@ -0,0 +1,407 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+Crawl the social graph of Wattpad outward from seed users, over followers and following. Crawled Users are linked together through their `followers` and `following` attributes, as `fetch_followers` and `fetch_following` do.
+
+>>> crawler = Crawler(["<username>"], max_depth=2, max_nodes=10_000, checkpoint="crawl.json")
+>>> async for user in crawler.crawl():  # Resumes from crawl.json if it exists.
+...     print(user, len(user.followers))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import time
+from typing import AsyncIterator, Callable, Iterable, Optional
+
+from .client import WattpadClient
+from .fields import FieldSpec
+from .model_types import UserModelFieldsType
+from .utils import atomic_path
+from .wattpad import User
+
+DIRECTIONS = {
+    "followers": ("followers",),
+    "following": ("following",),
+    "both": ("followers", "following"),
+}
+CHECKPOINT_VERSION = 1
+
+
+class Crawler:
+    """A breadth-first (or priority-ordered) crawl of the follower graph, from seed users.
+    **Note**: Each user is crawled at most once, at the depth it was first discovered at. Users beyond `max_depth` are linked to the users that discovered them, but aren't crawled.
+
+    Attributes:
+        direction (str): The relations crawled: `followers`, `following` or `both`.
+        max_depth (int): Maximum number of hops from a seed. Seeds are at depth 0, `max_depth=0` only crawls the seeds.
+        max_nodes (Optional[int]): Maximum number of users crawled, across resumes. None if unlimited.
+        max_per_user (Optional[int]): Maximum number of users retrieved per relation of a crawled user. None if unlimited.
+        concurrency (int): Maximum number of users crawled at once.
+        include (bool | UserModelFieldsType | FieldSpec): Fields of discovered users to fetch.
+        page_size (int): Number of users requested per page.
+        priority (Optional[Callable[[User, int], float]]): Called with each discovered user and its depth. Users with the lowest priority are crawled first. None for breadth-first order.
+        checkpoint (Optional[str]): Path of the checkpoint file. None if the crawl isn't checkpointed.
+        checkpoint_every (float): Seconds between checkpoints.
+        visited (dict[str, int]): Usernames of crawled users, mapped to their depth.
+        failed (dict[str, str]): Usernames of users that couldn't be crawled, mapped to the error.
+        users (dict[str, User]): Every user seen by the crawl, by username. Holds the users, so they aren't garbage collected while the crawl runs.
+    """
+
+    def __init__(
+        self,
+        seeds: Iterable[str],
+        direction: str = "both",
+        max_depth: int = 2,
+        max_nodes: Optional[int] = None,
+        max_per_user: Optional[int] = None,
+        concurrency: int = 8,
+        include: bool | UserModelFieldsType | FieldSpec = False,
+        page_size: int = 100,
+        priority: Optional[Callable[[User, int], float]] = None,
+        checkpoint: Optional[str] = None,
+        checkpoint_every: float = 60.0,
+        client: Optional[WattpadClient] = None,
+    ):
+        """Create a Crawler object. If the checkpoint file exists, the crawl resumes from it.
+
+        Example:
+        ```py
+        >>> Crawler(seeds, include={"numFollowers": True}, priority=lambda user, depth: -(user.data.num_followers or 0))  # Popular users first.
+        ```
+
+        Args:
+            seeds (Iterable[str]): Usernames to start crawling from.
+            direction (str, optional): The relations to crawl: `followers`, `following` or `both`. Defaults to "both".
+            max_depth (int, optional): Maximum number of hops from a seed. Defaults to 2.
+            max_nodes (Optional[int], optional): Maximum number of users crawled. Defaults to None (unlimited).
+            max_per_user (Optional[int], optional): Maximum number of users retrieved per relation of a crawled user. Defaults to None (unlimited).
+            concurrency (int, optional): Maximum number of users crawled at once. Defaults to 8.
+            include (bool | UserModelFieldsType | FieldSpec, optional): Fields of discovered users to fetch, available to `priority`. Defaults to False.
+            page_size (int, optional): Number of users requested per page. Defaults to 100.
+            priority (Optional[Callable[[User, int], float]], optional): Called with each discovered user and its depth, users with the lowest priority are crawled first. Defaults to None (breadth-first).
+            checkpoint (Optional[str], optional): Path of the checkpoint file. Defaults to None.
+            checkpoint_every (float, optional): Seconds between checkpoints. Defaults to 60.0.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Raises:
+            ValueError: The direction isn't supported, or the checkpoint file is of an unsupported version.
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(
+                f"Unsupported direction {direction!r}, expected one of {sorted(DIRECTIONS)}."
+            )
+
+        self.direction = direction
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_per_user = max_per_user
+        self.concurrency = concurrency
+        self.include = include
+        self.page_size = page_size
+        self.priority = priority
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.client = client
+
+        self.visited: dict[str, int] = {}
+        self.failed: dict[str, str] = {}
+        self.users: dict[str, User] = {}
+
+        # ! A heap of (priority, sequence, depth, username). The sequence keeps equal priorities in discovery order.
+        self._frontier: list[tuple[float, int, int, str]] = []
+        self._active: dict[str, tuple[float, int]] = {}
+        self._depths: dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._checkpointed_at = time.monotonic()
+
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self._load(checkpoint)
+
+        for username in seeds:
+            self._push(User(username), 0)
+
+    def __repr__(self) -> str:
+        return f"<Crawler visited={len(self.visited)} frontier={len(self._frontier)}>"
+
+    def _push(self, user: User, depth: int):
+        """Add a discovered user to the frontier, unless it was discovered before at the same depth or closer.
+
+        Args:
+            user (User): The discovered user.
+            depth (int): The number of hops from a seed.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        username = user.username
+        self.users[username] = user
+        if username in self.failed:
+            return
+
+        best = self._depths.get(username)
+        if best is not None and best <= depth:
+            return
+        self._depths[username] = depth
+
+        if username in self.visited:
+            self.visited[username] = depth
+            self._propagate(user, depth)
+            return
+        if username in self._active:
+            return  # ! Propagated once the user is crawled.
+
+        priority = self.priority(user, depth) if self.priority is not None else depth
+        heapq.heappush(
+            self._frontier, (priority, next(self._sequence), depth, username)
+        )  # ! A previous entry for the user is left in place, and skipped by `_pop`.
+
+    def _propagate(self, user: User, depth: int):
+        """Push the known neighbours of a crawled user, after a shorter path to it was found. Concurrent crawling can discover a user through a longer path first. No requests are made, the neighbours were retrieved when the user was crawled.
+
+        Args:
+            user (User): The crawled user.
+            depth (int): The user's new depth.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        if depth >= self.max_depth:
+            return
+        for relation in DIRECTIONS[self.direction]:
+            for other in list(getattr(user, relation)):
+                self._push(other, depth + 1)
+
+    def _pop(self) -> Optional[tuple[float, int, str]]:
+        """Take the user to crawl next from the frontier, skipping outdated entries.
+
+        Returns:
+            Optional[tuple[float, int, str]]: The priority, depth and username of the user. None if the frontier is empty.
+        """
+        while self._frontier:
+            priority, _, depth, username = heapq.heappop(self._frontier)
+            if (
+                depth == self._depths.get(username)
+                and username not in self.visited
+                and username not in self._active
+                and username not in self.failed
+            ):
+                return priority, depth, username
+        return None
+
+    def _exhausted(self) -> bool:
+        """Check whether the node budget is spent, counting users being crawled.
+
+        Returns:
+            bool: Whether no more users may be crawled.
+        """
+        return (
+            self.max_nodes is not None
+            and len(self.visited) + len(self._active) >= self.max_nodes
+        )
+
+    async def _expand(self, user: User, depth: int):
+        """Retrieve the followers and/or following of a user, adding them to the frontier.
+
+        Args:
+            user (User): The user to crawl.
+            depth (int): The depth of the user.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        for relation in DIRECTIONS[self.direction]:
+            pages = getattr(user, f"iter_{relation}")(
+                self.include, page_size=self.page_size, client=self.client
+            )
+            try:
+                count = 0
+                async for other in pages:
+                    self.users[other.username] = other
+                    if depth < self.max_depth:
+                        self._push(other, depth + 1)
+
+                    count += 1
+                    if self.max_per_user is not None and count >= self.max_per_user:
+                        break
+            finally:
+                await pages.aclose()  # ! Cancels pages requested ahead, when stopping early.
+
+    async def crawl(self) -> AsyncIterator[User]:
+        """Crawl until the frontier is empty, or the node budget is spent. Users that can't be crawled are recorded in `failed`, and don't stop the crawl.
+        **Note**: A checkpoint is written every `checkpoint_every` seconds, and when the crawl ends, fails or is cancelled.
+
+        Yields:
+            User: Each crawled user, once their followers and/or following are retrieved. In order of completion.
+        """
+        changed = asyncio.Condition()
+        results: asyncio.Queue[User | Exception | None] = asyncio.Queue(
+            maxsize=self.concurrency
+        )  # ! Bounded, so workers stop crawling while the caller is busy.
+
+        async def crawl_users():
+            while True:
+                async with changed:
+                    while True:
+                        entry = None if self._exhausted() else self._pop()
+                        if entry is not None:
+                            break
+                        if not self._active:
+                            return
+                        await changed.wait()  # ! Crawling users may discover more, or fail and free up budget.
+
+                    priority, depth, username = entry
+                    self._active[username] = (priority, depth)
+
+                user = self.users[username]
+                try:
+                    await self._expand(user, depth)
+
+                    best = self._depths[username]
+                    self.visited[username] = best
+                    if best < depth:
+                        self._propagate(user, best)
+                except Exception as error:
+                    self.failed[username] = repr(error)
+                    user = None
+                finally:
+                    async with changed:
+                        del self._active[username]
+                        changed.notify_all()
+
+                if user is not None:
+                    await results.put(user)
+                if (
+                    self.checkpoint is not None
+                    and time.monotonic() - self._checkpointed_at
+                    >= self.checkpoint_every
+                ):
+                    self.save()
+
+        async def worker():
+            # ! Only a worker that stops on its own reports it. One cancelled as the crawl stops mustn't wait on a queue nothing reads.
+            try:
+                await crawl_users()
+            except Exception as error:
+                await results.put(error)
+            else:
+                await results.put(None)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        try:
+            remaining = len(workers)
+            while remaining:
+                result = await results.get()
+                if isinstance(result, Exception):
+                    raise result
+                if result is None:
+                    remaining -= 1
+                    continue
+                yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+            if self.checkpoint is not None:
+                self.save()
+
+    def save(self, path: Optional[str] = None):
+        """Write a checkpoint of the crawl. Users being crawled are saved as part of the frontier. The file is replaced atomically, a crash while saving leaves the previous checkpoint intact.
+
+        Args:
+            path (Optional[str], optional): The path to write to. Defaults to `checkpoint`.
+
+        Raises:
+            ValueError: No path was provided, and the crawler has no checkpoint path.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        path = path or self.checkpoint
+        if path is None:
+            raise ValueError("No checkpoint path to save to.")
+
+        frontier = [
+            [priority, depth, username]
+            for priority, _, depth, username in sorted(self._frontier)
+            if depth == self._depths.get(username)
+            and username not in self.visited
+            and username not in self._active
+            and username not in self.failed
+        ]
+        frontier.extend(
+            [priority, depth, username]
+            for username, (priority, depth) in self._active.items()
+        )
+
+        edges: set[tuple[str, str]] = set()
+        for username in self.visited:
+            user = self.users[username]
+            edges.update((other.username, username) for other in user.followers)
+            edges.update((username, other.username) for other in user.following)
+
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "frontier": frontier,
+            "visited": self.visited,
+            "failed": self.failed,
+            "edges": sorted(edges),
+        }
+
+        with atomic_path(path) as temporary, open(
+            temporary, "w", encoding="utf-8"
+        ) as file:
+            json.dump(state, file)
+
+        self._checkpointed_at = time.monotonic()
+
+    def _load(self, path: str):
+        """Restore the crawl from a checkpoint, re-linking the crawled users.
+
+        Args:
+            path (str): The path of the checkpoint file.
+
+        Raises:
+            ValueError: The checkpoint file is of an unsupported version.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        with open(path, encoding="utf-8") as file:
+            state = json.load(file)
+
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"Unsupported checkpoint version {state.get('version')!r} in {path!r}."
+            )
+
+        for follower, followed in state["edges"]:
+            source = self.users.setdefault(follower, User(follower))
+            target = self.users.setdefault(followed, User(followed))
+            source.following.add(target)
+            target.followers.add(source)
+
+        for username, depth in state["visited"].items():
+            self.users.setdefault(username, User(username))
+            self.visited[username] = depth
+        self._depths.update(self.visited)
+        self.failed.update(state["failed"])
+
+        for priority, depth, username in state["frontier"]:
+            self.users.setdefault(username, User(username))
+            self._depths[username] = depth
+            heapq.heappush(
+                self._frontier, (priority, next(self._sequence), depth, username)
+            )
@@ -0,0 +1,522 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+Export Stories to EPUB and plain text files. Parts are downloaded concurrently and written to the file as soon as they arrive, in reading order, so memory use doesn't grow with the length of a Story.
+
+>>> await export_epub(Story("<id>"), "story.epub")
+>>> async for result in export_many(stories, "exports/", format="txt"):
+...     print(result.story, result.path or result.error)
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+import zipfile
+from html import escape
+from html.parser import HTMLParser
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    cast,
+)
+
+import aiohttp
+
+from .client import WattpadClient, get_client
+from .fields import FieldSpec
+from .models import StoryModel
+from .utils import atomic_path, map_unordered
+from .wattpad import Story
+
+_EXPORT_FIELDS = FieldSpec.compile(
+    StoryModel,
+    {
+        "title": True,
+        "description": True,
+        "tags": True,
+        "url": True,
+        "cover": True,
+        "completed": True,
+        "user": {"username": True, "name": True},
+        "parts": {"id": True, "title": True},
+    },
+)
+
+_VOID_TAGS = {"area", "br", "col", "hr", "img", "wbr"}
+_DROPPED_TAGS = {"script", "style"}
+_BLOCK_TAGS = {
+    "blockquote",
+    "div",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "li",
+    "p",
+    "pre",
+    "section",
+}
+_XML_NAME = re.compile(r"[A-Za-z_][\w.\-]*")
+
+_IMAGE_TYPES = {
+    b"\xff\xd8\xff": ("jpg", "image/jpeg"),
+    b"\x89PNG": ("png", "image/png"),
+    b"GIF8": ("gif", "image/gif"),
+}
+
+_CONTAINER = """<?xml version="1.0" encoding="UTF-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+"""
+
+
+class _XHTMLConverter(HTMLParser):
+    """Convert HTML to well-formed XHTML. Unclosed elements are closed, stray end tags are dropped, and scripts are removed."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output: list[str] = []
+        self.open: list[str] = []
+        self.dropping = 0
+        # ! Whether remote images are referenced. EPUBs must declare them.
+        self.remote = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]):
+        if tag in _DROPPED_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping:
+            return
+
+        attributes = {
+            name: value if value is not None else name
+            for name, value in attrs
+            if _XML_NAME.fullmatch(name)
+        }  # ! A dictionary, duplicate attributes aren't well-formed XML.
+        if tag in _BLOCK_TAGS and "p" in self.open:
+            self.handle_endtag("p")  # ! Implied by HTML, paragraphs can't nest.
+        if tag == "img" and attributes.get("src", "").startswith("http"):
+            self.remote = True
+
+        rendered = "".join(
+            f' {name}="{escape(value)}"' for name, value in attributes.items()
+        )
+        if tag in _VOID_TAGS:
+            self.output.append(f"<{tag}{rendered}/>")
+        else:
+            self.output.append(f"<{tag}{rendered}>")
+            self.open.append(tag)
+
+    def handle_endtag(self, tag: str):
+        if tag in _DROPPED_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.open:
+            return
+
+        while self.open:
+            closed = self.open.pop()
+            self.output.append(f"</{closed}>")
+            if closed == tag:
+                break
+
+    def handle_data(self, data: str):
+        if not self.dropping:
+            self.output.append(escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        while self.open:
+            self.output.append(f"</{self.open.pop()}>")
+
+
+class _TextConverter(HTMLParser):
+    """Convert HTML to plain text. Block elements are separated by blank lines."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output: list[str] = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]):
+        if tag in _DROPPED_TAGS:
+            self.dropping += 1
+        elif tag == "br":
+            self.output.append("\n")
+        elif tag in _BLOCK_TAGS:
+            self.output.append("\n\n")
+
+    def handle_endtag(self, tag: str):
+        if tag in _DROPPED_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+        elif tag in _BLOCK_TAGS:
+            self.output.append("\n\n")
+
+    def handle_data(self, data: str):
+        if not self.dropping:
+            self.output.append(re.sub(r"\s+", " ", data))
+
+
+def html_to_xhtml(html: str) -> tuple[str, bool]:
+    """Convert the HTML text of a Part to well-formed XHTML.
+
+    Args:
+        html (str): The HTML text.
+
+    Returns:
+        tuple[str, bool]: The XHTML, and whether it references remote images.
+    """
+    converter = _XHTMLConverter()
+    converter.feed(html)
+    converter.close()
+    return "".join(converter.output), converter.remote
+
+
+def html_to_text(html: str) -> str:
+    """Convert the HTML text of a Part to plain text.
+
+    Args:
+        html (str): The HTML text.
+
+    Returns:
+        str: The plain text, with paragraphs separated by blank lines.
+    """
+    converter = _TextConverter()
+    converter.feed(html)
+    converter.close()
+
+    text = re.sub(r" *\n *", "\n", "".join(converter.output))
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+async def _prepare(story: Story, client: WattpadClient) -> str:
+    """Fetch the metadata and parts of a Story.
+
+    Args:
+        story (Story): The Story to export.
+        client (WattpadClient): The client to perform requests with.
+
+    Returns:
+        str: The name of the Story's author.
+    """
+    await story.fetch(_EXPORT_FIELDS, client=client)
+
+    if story.user is None:
+        return ""
+    return story.user.data.name or story.user.username
+
+
+async def _fetch_cover(
+    story: Story, client: WattpadClient
+) -> Optional[tuple[bytes, str, str]]:
+    """Download the cover of a Story. A missing or unavailable cover isn't an error.
+
+    Args:
+        story (Story): The Story.
+        client (WattpadClient): The client to perform requests with.
+
+    Returns:
+        Optional[tuple[bytes, str, str]]: The image, its file extension and its media type. None if the Story has no usable cover.
+    """
+    if not story.data.cover:
+        return None
+
+    try:
+        image = b"".join([chunk async for chunk in client.stream(story.data.cover)])
+    except aiohttp.ClientError:
+        return None
+
+    for magic, (extension, media_type) in _IMAGE_TYPES.items():
+        if image.startswith(magic):
+            return image, extension, media_type
+    return None
+
+
+def _page(title: str, body: str) -> str:
+    """Wrap a body in an XHTML document.
+
+    Args:
+        title (str): The title of the document.
+        body (str): The XHTML body.
+
+    Returns:
+        str: The XHTML document.
+    """
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        "<!DOCTYPE html>\n"
+        '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">\n'
+        f"<head><title>{escape(title)}</title></head>\n"
+        f"<body>\n{body}\n</body>\n"
+        "</html>\n"
+    )
+
+
+async def export_epub(
+    story: Story,
+    path: str,
+    concurrency: int = 8,
+    client: Optional[WattpadClient] = None,
+) -> str:
+    """Export a Story to an EPUB 3 file, with a title page, a table of contents and a chapter per Part. Chapters are written as they download, in reading order.
+    **Note**: The Story's metadata and parts are fetched before exporting. Wattpad doesn't provide language codes, so the language is set to `und` (undetermined).
+
+    Args:
+        story (Story): The Story to export.
+        path (str): The path of the EPUB file. Written atomically, a failed export leaves no file behind.
+        concurrency (int, optional): Maximum number of Parts downloading at once. Defaults to 8.
+        client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+    Returns:
+        str: The path of the EPUB file.
+    """
+    if client is None:
+        client = get_client()
+
+    author = await _prepare(story, client)
+    title = story.data.title or story.id
+    cover = await _fetch_cover(story, client)
+
+    manifest: list[str] = []
+    spine: list[str] = []
+    contents: list[str] = []
+
+    with atomic_path(path) as temporary, zipfile.ZipFile(
+        temporary, "w", zipfile.ZIP_DEFLATED
+    ) as archive:
+        archive.writestr(
+            zipfile.ZipInfo("mimetype"), "application/epub+zip", zipfile.ZIP_STORED
+        )  # ! Must be the first entry, and uncompressed.
+        archive.writestr("META-INF/container.xml", _CONTAINER)
+
+        title_page = [f"<h1>{escape(title)}</h1>"]
+        if cover is not None:
+            image, extension, media_type = cover
+            archive.writestr(
+                f"OEBPS/cover.{extension}", image, zipfile.ZIP_STORED
+            )  # ! Images are already compressed.
+            manifest.append(
+                f'<item id="cover-image" href="cover.{extension}" media-type="{media_type}" properties="cover-image"/>'
+            )
+            title_page.insert(0, f'<img src="cover.{extension}" alt="Cover"/>')
+        if author:
+            title_page.append(f"<p>by {escape(author)}</p>")
+        for paragraph in (story.data.description or "").splitlines():
+            if paragraph.strip():
+                title_page.append(f"<p>{escape(paragraph)}</p>")
+
+        archive.writestr("OEBPS/title.xhtml", _page(title, "\n".join(title_page)))
+        manifest.append(
+            '<item id="title" href="title.xhtml" media-type="application/xhtml+xml"/>'
+        )
+        spine.append('<itemref idref="title"/>')
+
+        number = 0
+        async for part, texts in story.iter_part_texts(
+            concurrency=concurrency, client=client
+        ):
+            number += 1
+            name = f"part-{number:04d}"
+            text = "".join(
+                [piece async for piece in texts]
+            )  # ! Converted whole, a tag may span pieces.
+            part_title = part.data.title or f"Part {number}"
+
+            body, remote = html_to_xhtml(text)
+            archive.writestr(
+                f"OEBPS/{name}.xhtml",
+                _page(part_title, f"<h2>{escape(part_title)}</h2>\n{body}"),
+            )
+
+            properties = ' properties="remote-resources"' if remote else ""
+            manifest.append(
+                f'<item id="{name}" href="{name}.xhtml" media-type="application/xhtml+xml"{properties}/>'
+            )
+            spine.append(f'<itemref idref="{name}"/>')
+            contents.append(f'<li><a href="{name}.xhtml">{escape(part_title)}</a></li>')
+
+        toc = "\n".join(contents)
+        archive.writestr(
+            "OEBPS/nav.xhtml",
+            _page(
+                "Contents",
+                f'<nav epub:type="toc" id="toc">\n<h1>Contents</h1>\n<ol>\n{toc}\n</ol>\n</nav>',
+            ),
+        )
+        manifest.append(
+            '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>'
+        )
+
+        metadata = [
+            f'<dc:identifier id="story-id">urn:wattpad:story:{escape(story.id)}</dc:identifier>',
+            f"<dc:title>{escape(title)}</dc:title>",
+            "<dc:language>und</dc:language>",
+            f'<meta property="dcterms:modified">{time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}</meta>',
+        ]
+        if author:
+            metadata.append(f"<dc:creator>{escape(author)}</dc:creator>")
+        if story.data.description:
+            metadata.append(
+                f"<dc:description>{escape(story.data.description)}</dc:description>"
+            )
+        if story.data.url:
+            metadata.append(f"<dc:source>{escape(story.data.url)}</dc:source>")
+        for tag in story.data.tags or []:
+            metadata.append(f"<dc:subject>{escape(tag)}</dc:subject>")
+
+        newline = "\n"
+        archive.writestr(
+            "OEBPS/content.opf",
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="story-id">\n'
+            f'<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n{newline.join(metadata)}\n</metadata>\n'
+            f"<manifest>\n{newline.join(manifest)}\n</manifest>\n"
+            f"<spine>\n{newline.join(spine)}\n</spine>\n"
+            "</package>\n",
+        )
+
+    return path
+
+
+async def export_text(
+    story: Story,
+    path: str,
+    concurrency: int = 8,
+    client: Optional[WattpadClient] = None,
+) -> str:
+    """Export a Story to a UTF-8 plain text file, with a header and a section per Part. Sections are written as they download, in reading order.
+    **Note**: The Story's metadata and parts are fetched before exporting.
+
+    Args:
+        story (Story): The Story to export.
+        path (str): The path of the text file. Written atomically, a failed export leaves no file behind.
+        concurrency (int, optional): Maximum number of Parts downloading at once. Defaults to 8.
+        client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+    Returns:
+        str: The path of the text file.
+    """
+    if client is None:
+        client = get_client()
+
+    author = await _prepare(story, client)
+    title = story.data.title or story.id
+
+    with atomic_path(path) as temporary, open(temporary, "w", encoding="utf-8") as file:
+        file.write(f"{title}\n")
+        if author:
+            file.write(f"by {author}\n")
+        if story.data.description:
+            file.write(f"\n{story.data.description.strip()}\n")
+
+        number = 0
+        async for part, texts in story.iter_part_texts(
+            concurrency=concurrency, client=client
+        ):
+            number += 1
+            part_title = part.data.title or f"Part {number}"
+            text = "".join(
+                [piece async for piece in texts]
+            )  # ! Converted whole, a tag may span pieces.
+            file.write(f"\n\n{part_title}\n{'=' * len(part_title)}\n\n")
+            file.write(html_to_text(text))
+            file.write("\n")
+
+    return path
+
+
+_EXPORTERS = {"epub": export_epub, "txt": export_text}
+
+
+class ExportResult(NamedTuple):
+    """The outcome of exporting a single Story with `export_many`.
+
+    Attributes:
+        story (Story): The exported Story.
+        path (Optional[str]): The path of the exported file. None if the export failed.
+        error (Optional[Exception]): The exception raised while exporting. None if the export succeeded.
+    """
+
+    story: Story
+    path: Optional[str]
+    error: Optional[Exception]
+
+
+async def export_many(
+    stories: Iterable[Story],
+    directory: str,
+    format: str = "epub",
+    concurrency: int = 4,
+    part_concurrency: int = 8,
+    client: Optional[WattpadClient] = None,
+) -> AsyncIterator[ExportResult]:
+    """Export many Stories to a directory, `<id>.<format>` each, with at most `concurrency` exports in progress. Results are yielded as they complete, a failed export doesn't abort the batch.
+
+    Example:
+    ```py
+    >>> async for result in export_many(user.stories, "exports/", concurrency=8):
+    ...     if result.error:
+    ...         print(result.story, "failed:", result.error)
+    ```
+
+    Args:
+        stories (Iterable[Story]): The Stories to export. Consumed lazily, as exports complete.
+        directory (str): The directory to write to. Created if it doesn't exist.
+        format (str, optional): `epub` or `txt`. Defaults to "epub".
+        concurrency (int, optional): Maximum number of Stories exported at once. Defaults to 4.
+        part_concurrency (int, optional): Maximum number of Parts downloading at once, per Story. Defaults to 8.
+        client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+    Raises:
+        ValueError: The format isn't supported.
+
+    Yields:
+        ExportResult: The outcome of each export, in order of completion.
+    """
+    if format not in _EXPORTERS:
+        raise ValueError(
+            f"Unsupported format {format!r}, expected one of {sorted(_EXPORTERS)}."
+        )
+    exporter = _EXPORTERS[format]
+    os.makedirs(directory, exist_ok=True)
+
+    async def export(story: Story) -> ExportResult:
+        try:
+            path = await exporter(
+                story,
+                os.path.join(directory, f"{story.id}.{format}"),
+                concurrency=part_concurrency,
+                client=client,
+            )
+            return ExportResult(story, path, None)
+        except Exception as error:
+            return ExportResult(story, None, error)
+
+    results = cast(
+        AsyncGenerator[ExportResult, None],
+        map_unordered(export, stories, concurrency),
+    )
+    try:
+        async for result in results:
+            yield result
+    finally:
+        await results.aclose()  # ! Cancels the calls in flight if the caller stops early.
@@ -0,0 +1,400 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+Compiled field specifications. A `FieldSpec` is validated and converted to a field query string once, and can be passed as the `include` argument of any API-Interfacing method in place of a `*FieldsType` dictionary.
+
+>>> spec = FieldSpec.compile(StoryModel, {"title": True, "parts": {"id": True}})
+>>> spec.query
+'title,parts(id)'
+>>> await story.fetch(include=spec)
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Optional, Type, Union, get_args
+
+from pydantic import BaseModel
+
+from .utils import construct_fields, get_fields
+
+Frozen = tuple  # ! A hashable field dictionary: ((key, True | Frozen), ...), in insertion order.
+
+
+def _freeze(fields: dict) -> Frozen:
+    """Convert Field Data to a hashable form, dropping fields set to False.
+
+    Args:
+        fields (dict): Field Data.
+
+    Returns:
+        Frozen: The hashable Field Data.
+    """
+    return tuple(
+        (key, _freeze(value) if type(value) is dict else True)
+        for key, value in fields.items()
+        if value is not False
+    )
+
+
+def _thaw(frozen: Frozen) -> dict:
+    """Convert hashable Field Data back to a dictionary.
+
+    Args:
+        frozen (Frozen): The hashable Field Data.
+
+    Returns:
+        dict: Field Data.
+    """
+    return {
+        key: _thaw(value) if type(value) is tuple else True for key, value in frozen
+    }
+
+
+@lru_cache(maxsize=None)
+def get_submodels(model: Type[BaseModel]) -> dict[str, Type[BaseModel]]:
+    """Retrieve the fields of a model that hold other models (directly, optionally, or in a list), by alias.
+
+    Args:
+        model (Type[BaseModel]): The model to inspect.
+
+    Returns:
+        dict[str, Type[BaseModel]]: The nested model of each aliased field.
+    """
+
+    def find(annotation: Any) -> Optional[Type[BaseModel]]:
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return annotation
+        for arg in get_args(annotation):
+            found = find(arg)
+            if found is not None:
+                return found
+        return None
+
+    submodels = {}
+    for name, field in model.model_fields.items():
+        submodel = find(field.annotation)
+        if submodel is not None:
+            submodels[field.alias or name] = submodel
+    return submodels
+
+
+@lru_cache(maxsize=None)
+def _construct_plan(
+    model: Type[BaseModel],
+) -> dict[str, tuple[str, Optional[Type[BaseModel]]]]:
+    """Map each field's alias and name to its name and nested model, for `construct_model`.
+
+    Args:
+        model (Type[BaseModel]): The model to inspect.
+
+    Returns:
+        dict[str, tuple[str, Optional[Type[BaseModel]]]]: The name and nested model (None if the field doesn't hold a model) of each aliased and named field.
+    """
+    submodels = get_submodels(model)
+    plan = {}
+    for name, field in model.model_fields.items():
+        alias = field.alias or name
+        plan[alias] = plan[name] = (name, submodels.get(alias))
+    return plan
+
+
+def construct_model(model: Type[BaseModel], data: dict) -> BaseModel:
+    """Build a model from trusted data without validating it, as `model_construct` does, but recursively. Nested dictionaries become nested models, and keys that aren't fields are dropped.
+    **Note**: Values aren't coerced. Only use this for data in the shape the model expects, such as API Responses.
+
+    Args:
+        model (Type[BaseModel]): The model to build.
+        data (dict): The data, keyed by alias or field name.
+
+    Returns:
+        BaseModel: The model.
+    """
+    plan = _construct_plan(model)
+    values = {}
+    for key, value in data.items():
+        entry = plan.get(key)
+        if entry is None:
+            continue
+
+        name, submodel = entry
+        if submodel is not None:
+            if type(value) is dict:
+                value = construct_model(submodel, value)
+            elif type(value) is list:
+                value = [
+                    construct_model(submodel, item) if type(item) is dict else item
+                    for item in value
+                ]
+        values[name] = value
+
+    return model.model_construct(_fields_set=set(values), **values)
+
+
+def merge_model(model: BaseModel, data: dict) -> set[str]:
+    """Merge partial data into a model in place. Only values that differ from the model's are validated, and nested dictionaries are merged into the nested models they update.
+
+    Example:
+    ```py
+    >>> merge_model(story, {"numParts": 4, "lastPublishedPart": {"id": 4}})
+    {'num_parts', 'last_published_part.id'}
+    ```
+
+    Args:
+        model (BaseModel): The model to update.
+        data (dict): The data, keyed by alias or field name. Keys that aren't fields are dropped.
+
+    Raises:
+        pydantic.ValidationError: A value is invalid. The model, and its nested models, are left unchanged.
+
+    Returns:
+        set[str]: The names of the fields that changed, dotted for fields of nested models.
+    """
+    undo: list[tuple[BaseModel, str, Any, bool]] = []
+    try:
+        return _merge(model, data, undo)
+    except BaseException:
+        for target, name, previous, was_set in reversed(undo):
+            target.__dict__[name] = previous
+            if not was_set:
+                target.__pydantic_fields_set__.discard(name)
+        raise
+
+
+def _merge(
+    model: BaseModel, data: dict, undo: list[tuple[BaseModel, str, Any, bool]]
+) -> set[str]:
+    """`merge_model`, recording the previous value of each assigned field so the merge can be undone.
+
+    Args:
+        model (BaseModel): The model to update.
+        data (dict): The data, keyed by alias or field name.
+        undo (list[tuple[BaseModel, str, Any, bool]]): Receives the model, name, previous value and whether the field was set, of each assigned field.
+
+    Returns:
+        set[str]: The names of the fields that changed, dotted for fields of nested models.
+    """
+    plan = _construct_plan(type(model))
+    validator = type(model).__pydantic_validator__
+    fields_set = model.model_fields_set
+
+    changed: set[str] = set()
+    for key, value in data.items():
+        entry = plan.get(key)
+        if entry is None:
+            continue
+
+        name, submodel = entry
+        current = getattr(model, name)
+
+        if submodel is not None and type(value) is dict and current is not None:
+            # ! Merged in place, rather than replaced, as nested data may be partial.
+            changed.update(f"{name}.{field}" for field in _merge(current, value, undo))
+            continue
+
+        if name in fields_set and current == value:
+            continue
+
+        undo.append((model, name, current, name in fields_set))
+        validator.validate_assignment(model, name, value)
+        if getattr(model, name) != current:
+            changed.add(name)
+
+    return changed
+
+
+@lru_cache(maxsize=None)
+def _all_fields(model: Type[BaseModel]) -> Frozen:
+    """The hashable Field Data requesting every field of a model, as `include=True` does.
+
+    Args:
+        model (Type[BaseModel]): The model.
+
+    Returns:
+        Frozen: The hashable Field Data.
+    """
+    return tuple((key, True) for key in get_fields(model))
+
+
+def _validate(model: Type[BaseModel], fields: dict, path: str = ""):
+    """Check that every field exists on the model, and that only nested models have sub-fields.
+
+    Args:
+        model (Type[BaseModel]): The model the fields belong to.
+        fields (dict): Field Data.
+        path (str, optional): The path of `fields`, for error messages. Defaults to "".
+
+    Raises:
+        ValueError: A field doesn't exist, or has sub-fields without being a nested model.
+
+    Returns:
+        None: Nothing is returned.
+    """
+    known = set(get_fields(model))
+    submodels = get_submodels(model)
+
+    for key, value in fields.items():
+        if key not in known:
+            raise ValueError(f"Unknown field {path + key!r} for {model.__name__}.")
+        if type(value) is dict:
+            if key not in submodels:
+                raise ValueError(
+                    f"Field {path + key!r} of {model.__name__} has no sub-fields."
+                )
+            _validate(submodels[key], value, f"{path}{key}.")
+
+
+@lru_cache(maxsize=4096)
+def _compile(
+    model: Type[BaseModel],
+    frozen: Frozen,
+    required: tuple[str, ...],
+    expand: tuple[str, ...],
+) -> FieldSpec:
+    """Build a FieldSpec. Memoized, so equal requests share a FieldSpec.
+
+    Args:
+        model (Type[BaseModel]): The model the fields belong to.
+        frozen (Frozen): The hashable Field Data.
+        required (tuple[str, ...]): Dotted paths of fields to add, see `FieldSpec.compile`.
+        expand (tuple[str, ...]): Nested fields to turn into dictionaries, see `FieldSpec.compile`.
+
+    Returns:
+        FieldSpec: The compiled fields.
+    """
+    fields = _thaw(frozen)
+    submodels = get_submodels(model)
+
+    for key in expand:
+        value = fields.get(key, False)
+        if value is True:
+            fields[key] = {
+                subkey: True for subkey in get_fields(submodels[key])
+            }  # ! True requests the API's defaults. Expanded to every sub-field, so required sub-fields can be added alongside.
+        elif value is False:
+            fields[key] = {}
+
+    for path in required:
+        *parents, leaf = path.split(".")
+        target = fields
+        for parent in parents:
+            target = target.get(parent)
+            if type(target) is not dict:
+                break  # ! Sub-fields are only required if the parent is requested with sub-fields.
+        else:
+            target[leaf] = True
+
+    _validate(model, fields)
+
+    return FieldSpec(model, fields)
+
+
+class FieldSpec:
+    """A validated, immutable set of fields to request for a model. Use `FieldSpec.compile` to create one.
+    **Note**: FieldSpecs are hashable and compiled once. Reuse them in hot loops instead of passing dictionaries.
+
+    Attributes:
+        model (Type[BaseModel]): The model the fields belong to.
+        query (str): The field query string, see `construct_fields`.
+    """
+
+    __slots__ = ("model", "query", "_frozen", "_hash")
+
+    def __init__(self, model: Type[BaseModel], fields: dict):
+        """Create a FieldSpec object. Fields aren't validated, use `FieldSpec.compile` instead.
+
+        Args:
+            model (Type[BaseModel]): The model the fields belong to.
+            fields (dict): Field Data.
+        """
+        self.model = model
+        self.query: str = construct_fields(fields)
+        self._frozen: Frozen = _freeze(fields)
+        self._hash = hash((model, self._frozen))
+
+    def __repr__(self) -> str:
+        return f"<FieldSpec model={self.model.__name__} query={self.query!r}>"
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FieldSpec):
+            return NotImplemented
+        return self.model is other.model and self._frozen == other._frozen
+
+    def __bool__(self) -> bool:
+        return bool(self._frozen)
+
+    @classmethod
+    def compile(
+        cls,
+        model: Type[BaseModel],
+        include: Union[bool, dict, FieldSpec] = False,
+        required: tuple[str, ...] = (),
+        expand: tuple[str, ...] = (),
+    ) -> FieldSpec:
+        """Compile the `include` argument of an API-Interfacing method. Results are memoized.
+
+        Example:
+        ```py
+        >>> FieldSpec.compile(StoryModel, {"parts": {"title": True}}, required=("id", "parts.id")).query
+        'parts(title,id),id'
+        >>> FieldSpec.compile(StoryModel, False, required=("user.username",), expand=("user",)).query
+        'user(username)'
+        ```
+
+        Args:
+            model (Type[BaseModel]): The model the fields belong to.
+            include (bool | dict | FieldSpec, optional): Fields to request. True requests every field. Defaults to False.
+            required (tuple[str, ...], optional): Dotted paths of fields that are always requested. A sub-field is only added if its parent is requested with sub-fields. Defaults to ().
+            expand (tuple[str, ...], optional): Nested fields that are always requested with sub-fields. True is expanded to every sub-field, False to no sub-fields. Defaults to ().
+
+        Raises:
+            ValueError: A field doesn't exist on the model, or `include` was compiled for another model.
+
+        Returns:
+            FieldSpec: The compiled fields.
+        """
+        if isinstance(include, FieldSpec):
+            if include.model is not model:
+                raise ValueError(
+                    f"{include!r} was compiled for {include.model.__name__}, not {model.__name__}."
+                )
+            if not required and not expand:
+                return include
+            frozen = include._frozen
+        elif include is True:
+            frozen = _all_fields(model)
+        elif include is False:
+            frozen = ()
+        else:
+            frozen = _freeze(include)
+
+        return _compile(model, frozen, tuple(required), tuple(expand))
+
+    def as_dict(self) -> dict:
+        """Retrieve the Field Data of this FieldSpec.
+
+        Returns:
+            dict: A new dictionary of the Field Data.
+        """
+        return _thaw(self._frozen)
+
+    def wrap(self, key: str) -> str:
+        """Retrieve the field query string nested under a key, as required by endpoints returning collections, e.g. `users(<fields>)`.
+
+        Args:
+            key (str): The key to nest the fields under.
+
+        Returns:
+            str: The nested field query string.
+        """
+        return f"{key}({self.query})"
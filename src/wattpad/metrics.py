@@ -0,0 +1,397 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+Request metrics, collected through the hooks of a client. Requests are grouped by endpoint pattern, e.g. `users/*/followers` or `cover/*`, with counters and latency histograms for each.
+
+>>> metrics = Metrics()
+>>> metrics.install(client)
+>>> await User("<username>").fetch_followers()
+>>> metrics.snapshot()["users/*/followers"]["requests"]
+1
+>>> print(metrics.prometheus())  # The Prometheus text exposition format.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from threading import Lock
+from typing import Optional, cast
+from urllib.parse import urlsplit
+
+from .client import HOOK_EVENTS, HookEvent, WattpadClient
+
+# ! Upper bounds, in seconds. An implicit `+Inf` bucket follows.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_KEYED = {"users", "stories", "lists", "parts"}
+# ! URLs outside of the API are grouped by these, and any other as `other`, so the number of patterns (and Prometheus labels) stays bounded.
+_PAGES = {"apiv2/storytext"}
+_IMAGES = {"cover", "useravatar", "userbg"}
+
+
+def endpoint_pattern(url: str) -> str:
+    """Group a URL by its endpoint, replacing usernames and IDs with `*`. Images are grouped by their kind, e.g. `cover/*`, and other URLs outside of the API as `other`.
+
+    Example:
+    ```py
+    >>> endpoint_pattern("https://www.wattpad.com/api/v3/users/wattpad/followers?limit=10")
+    'users/*/followers'
+    >>> endpoint_pattern("https://img.wattpad.com/cover/12345-256-k123.jpg")
+    'cover/*'
+    ```
+
+    Args:
+        url (str): The URL.
+
+    Returns:
+        str: The endpoint pattern.
+    """
+    path = urlsplit(url).path
+    _, found, endpoint = path.partition("/api/v3/")
+    if not found:
+        path = path.strip("/")
+        if path in _PAGES:
+            return path
+        kind = path.partition("/")[0]
+        return f"{kind}/*" if kind in _IMAGES else "other"
+
+    segments = endpoint.split("/")
+    for index, segment in enumerate(segments):
+        if segment.isdigit() or (index % 2 and segments[index - 1] in _KEYED):
+            segments[index] = "*"
+    return "/".join(segments)
+
+
+class Histogram:
+    """Counts observations into cumulative buckets, as Prometheus histograms do.
+
+    Attributes:
+        buckets (tuple[float, ...]): The upper bound of each bucket, ascending.
+        counts (list[int]): Number of observations in each bucket, not cumulative. The last is the `+Inf` bucket.
+        count (int): Number of observations.
+        sum (float): Sum of observations.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """Create an empty Histogram object.
+
+        Args:
+            buckets (tuple[float, ...], optional): The upper bound of each bucket, ascending. Defaults to `DEFAULT_BUCKETS`.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Record an observation.
+
+        Args:
+            value (float): The observation.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile, interpolating linearly within its bucket.
+
+        Args:
+            q (float): The quantile, from 0 to 1.
+
+        Returns:
+            Optional[float]: The estimate. The largest bound if it falls in the `+Inf` bucket, None if there are no observations.
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """The cumulative count of each bucket, labelled by its upper bound.
+
+        Returns:
+            list[tuple[str, int]]: The `le` label and cumulative count of each bucket, ending with `+Inf`.
+        """
+        total = 0
+        result = []
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self) -> dict:
+        """Summarize the histogram.
+
+        Returns:
+            dict: The `count`, `sum`, estimated `p50`, `p90` and `p99`, and cumulative `buckets`.
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class EndpointMetrics:
+    """The metrics of one endpoint pattern.
+
+    Attributes:
+        requests (int): Number of attempts started, retries included.
+        responses (dict[int, int]): Number of final responses, per status.
+        retries (int): Number of attempts that were retried.
+        bytes (int): Total size of response bodies.
+        cache_hits (int): Number of requests answered by the cache.
+        cache_misses (int): Number of requests the cache couldn't answer.
+        objects (int): Number of Users, Stories and Lists parsed from responses.
+        latency (Histogram): Seconds from the start of an attempt to the end of its response.
+        parse (Histogram): Seconds spent turning responses into objects.
+    """
+
+    __slots__ = (
+        "requests",
+        "responses",
+        "retries",
+        "bytes",
+        "cache_hits",
+        "cache_misses",
+        "objects",
+        "latency",
+        "parse",
+    )
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """Create an empty EndpointMetrics object.
+
+        Args:
+            buckets (tuple[float, ...], optional): The upper bounds of histogram buckets, in seconds. Defaults to `DEFAULT_BUCKETS`.
+        """
+        self.requests = 0
+        self.responses: dict[int, int] = {}
+        self.retries = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.objects = 0
+        self.latency = Histogram(buckets)
+        self.parse = Histogram(buckets)
+
+    def snapshot(self) -> dict:
+        """Copy the metrics, as plain data.
+
+        Returns:
+            dict: The counters, and summaries of the histograms. Statuses are strings, as JSON keys are.
+        """
+        return {
+            "requests": self.requests,
+            "responses": {
+                str(status): count for status, count in self.responses.items()
+            },
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "objects": self.objects,
+            "latency": self.latency.snapshot(),
+            "parse": self.parse.snapshot(),
+        }
+
+
+class Metrics:
+    """Collects metrics from the hooks of one or more clients, per endpoint pattern.
+
+    Attributes:
+        buckets (tuple[float, ...]): The upper bounds of latency histogram buckets, in seconds.
+        endpoints (dict[str, EndpointMetrics]): The metrics of each endpoint pattern.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """Create an empty Metrics object.
+
+        Args:
+            buckets (tuple[float, ...], optional): The upper bounds of latency histogram buckets, in seconds, ascending. Defaults to `DEFAULT_BUCKETS`.
+        """
+        self.buckets = buckets
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"<Metrics endpoints={len(self.endpoints)}>"
+
+    def install(self, client: WattpadClient):
+        """Collect the metrics of a client's requests.
+
+        Args:
+            client (WattpadClient): The client.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        for event in HOOK_EVENTS:
+            client.add_hook(event, self.record)
+
+    def uninstall(self, client: WattpadClient):
+        """Stop collecting the metrics of a client's requests.
+
+        Args:
+            client (WattpadClient): The client.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        for event in HOOK_EVENTS:
+            client.remove_hook(event, self.record)
+
+    def record(self, event: HookEvent):
+        """Record an event. This is the hook `install` adds.
+
+        Args:
+            event (HookEvent): The event.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        pattern = endpoint_pattern(event.url)
+        with self._lock:
+            metrics = self.endpoints.get(pattern)
+            if metrics is None:
+                metrics = self.endpoints[pattern] = EndpointMetrics(self.buckets)
+
+            kind = event.event
+            if kind == "request_start":
+                metrics.requests += 1
+            elif kind == "response":
+                status = cast(int, event.status)
+                metrics.responses[status] = metrics.responses.get(status, 0) + 1
+                if event.size is not None:
+                    metrics.bytes += event.size
+                if event.elapsed is not None:
+                    metrics.latency.observe(event.elapsed)
+            elif kind == "retry":
+                metrics.retries += 1
+            elif kind == "cache_hit":
+                metrics.cache_hits += 1
+            elif kind == "cache_miss":
+                metrics.cache_misses += 1
+            elif kind == "parse_complete":
+                metrics.objects += len(event.objects)
+                if event.elapsed is not None:
+                    metrics.parse.observe(event.elapsed)
+
+    def reset(self):
+        """Discard every metric.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        with self._lock:
+            self.endpoints.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        """Copy the metrics of every endpoint pattern, as plain data.
+
+        Returns:
+            dict[str, dict]: The counters and histogram summaries of each endpoint pattern, see `EndpointMetrics`.
+        """
+        with self._lock:
+            return {
+                pattern: metrics.snapshot()
+                for pattern, metrics in sorted(self.endpoints.items())
+            }
+
+    def prometheus(self, prefix: str = "wattpad") -> str:
+        """Render the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): The prefix of metric names. Defaults to "wattpad".
+
+        Returns:
+            str: The exposition.
+        """
+        counters = (
+            (
+                "requests_total",
+                "Request attempts started, retries included.",
+                "requests",
+            ),
+            ("retries_total", "Request attempts that were retried.", "retries"),
+            ("response_bytes_total", "Size of response bodies.", "bytes"),
+            ("cache_hits_total", "Requests answered by the cache.", "cache_hits"),
+            (
+                "cache_misses_total",
+                "Requests the cache couldn't answer.",
+                "cache_misses",
+            ),
+            ("parsed_objects_total", "Objects parsed from responses.", "objects"),
+        )
+        histograms = (
+            ("request_duration_seconds", "Duration of request attempts.", "latency"),
+            ("parse_duration_seconds", "Time spent parsing responses.", "parse"),
+        )
+
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            lines = []
+
+            for name, help_, attribute in counters:
+                lines.append(f"# HELP {prefix}_{name} {help_}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for pattern, metrics in endpoints:
+                    lines.append(
+                        f'{prefix}_{name}{{endpoint="{_escape(pattern)}"}} {getattr(metrics, attribute)}'
+                    )
+
+            lines.append(
+                f"# HELP {prefix}_responses_total Final responses, per status."
+            )
+            lines.append(f"# TYPE {prefix}_responses_total counter")
+            for pattern, metrics in endpoints:
+                for status, count in sorted(metrics.responses.items()):
+                    lines.append(
+                        f'{prefix}_responses_total{{endpoint="{_escape(pattern)}",status="{status}"}} {count}'
+                    )
+
+            for name, help_, attribute in histograms:
+                lines.append(f"# HELP {prefix}_{name} {help_}")
+                lines.append(f"# TYPE {prefix}_{name} histogram")
+                for pattern, metrics in endpoints:
+                    histogram: Histogram = getattr(metrics, attribute)
+                    label = f'endpoint="{_escape(pattern)}"'
+                    for bound, count in histogram.cumulative():
+                        lines.append(
+                            f'{prefix}_{name}_bucket{{{label},le="{bound}"}} {count}'
+                        )
+                    lines.append(f"{prefix}_{name}_sum{{{label}}} {histogram.sum}")
+                    lines.append(f"{prefix}_{name}_count{{{label}}} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,472 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+Registries of singleton objects, and how long they're kept for. Every `User`, `Story`, `Part` and `List` is looked up in the registry of its class, which returns the existing object for a key, if there is one.
+
+Identity is tracked with weak references, so an object is never duplicated while it's referenced. By default, nothing else keeps objects alive: a User whose last reference is dropped is garbage collected, along with its data. A retention policy keeps strong references to recently used objects, turning the registry into an in-process object cache.
+
+>>> User.registry.retention = LRURetention(max_entries=10_000, ttl=60 * 60)
+>>> User.registry.stats()
+{'live': 0, 'retained': 0, 'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import weakref
+from collections import OrderedDict, deque
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional
+
+from pydantic import BaseModel
+
+_LEAVES = (str, bytes, int, float, bool, type(None))
+
+
+def estimate_size(obj: Any) -> int:
+    """Estimate the memory held by an object: its attributes, and the containers and models within them. Other objects it references, such as the Users in a Story's `user`, aren't counted.
+
+    Args:
+        obj (Any): The object to measure.
+
+    Returns:
+        int: The approximate size of the object, in bytes.
+    """
+    size = sys.getsizeof(obj)
+    seen = {id(obj)}
+    stack = [getattr(obj, "__dict__", {})]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, BaseModel):
+            stack.append(item.__dict__)
+        elif not isinstance(item, _LEAVES):
+            continue  # ! Other objects, e.g. singletons, are theirs to account for.
+        size += sys.getsizeof(item)
+
+    return size
+
+
+class Retention:
+    """Base class of retention policies. A policy decides which objects of a registry are kept alive while nothing else references them.
+
+    Attributes:
+        evictions (int): Number of objects released to make room for others.
+        expirations (int): Number of objects released as they expired.
+    """
+
+    def __init__(self):
+        """Create a Retention object."""
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return 0
+
+    def retain(self, key: Hashable, obj: Any):
+        """Record a use of an object, when it's created.
+
+        Args:
+            key (Hashable): The key of the object.
+            obj (Any): The object.
+
+        Returns:
+            None: Nothing is returned.
+        """
+
+    def touch(self, key: Hashable, obj: Any):
+        """Record a use of an existing object, when it's looked up. Called on every lookup, without a lock, and mustn't wait for one.
+
+        Args:
+            key (Hashable): The key of the object.
+            obj (Any): The object.
+
+        Returns:
+            None: Nothing is returned.
+        """
+
+    def resize(self, key: Hashable, obj: Any):
+        """Record that an object's size changed, e.g. as data was merged into it.
+
+        Args:
+            key (Hashable): The key of the object.
+            obj (Any): The object.
+
+        Returns:
+            None: Nothing is returned.
+        """
+
+    def discard(self, key: Hashable):
+        """Release an object, if it's retained.
+
+        Args:
+            key (Hashable): The key of the object.
+
+        Returns:
+            None: Nothing is returned.
+        """
+
+    def clear(self):
+        """Release every object.
+
+        Returns:
+            None: Nothing is returned.
+        """
+
+
+class WeakRetention(Retention):
+    """Retain nothing. Objects are garbage collected as soon as they're no longer referenced, this is the default."""
+
+    def __repr__(self) -> str:
+        return "<WeakRetention>"
+
+
+class LRURetention(Retention):
+    """Retain recently used objects. The least recently used objects are released first once a limit is exceeded, and objects unused for `ttl` seconds are released as they expire.
+    **Note**: Lookups of existing objects don't lock. Their uses are queued, and applied to the order of objects in batches, or before an object is created.
+
+    Attributes:
+        max_entries (Optional[int]): Maximum number of retained objects.
+        max_bytes (Optional[int]): Maximum approximate size of retained objects.
+        ttl (Optional[float]): Seconds an object is retained for after its last use.
+        sizeof (Callable[[Any], int]): Estimates the size of an object.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+    ):
+        """Create an LRURetention object.
+
+        Args:
+            max_entries (Optional[int], optional): Maximum number of retained objects. Defaults to None (unbounded).
+            max_bytes (Optional[int], optional): Maximum approximate size of retained objects, in bytes. Objects are measured with `sizeof` when they're retained, and again as data is merged into them, see `Retention.resize`. Defaults to None (unbounded).
+            ttl (Optional[float], optional): Seconds an object is retained for after its last use. Defaults to None (forever).
+            sizeof (Callable[[Any], int], optional): Estimates the size of an object. Only used with `max_bytes`. Defaults to `estimate_size`.
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+
+        self._entries: OrderedDict[
+            Hashable, tuple[Any, float, int]
+        ] = (
+            OrderedDict()
+        )  # ! Key to (object, expiry, size), least recently used first. The TTL is constant, so expiries are in order too.
+        self._bytes = 0
+        self._lock = Lock()
+        # ! Uses by lookups, not yet applied. Appending to a deque is atomic, so lookups don't lock.
+        self._touched: deque[tuple[Hashable, Any]] = deque()
+
+    def __repr__(self) -> str:
+        return f"<LRURetention entries={len(self._entries)} max_entries={self.max_entries} max_bytes={self.max_bytes} ttl={self.ttl}>"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """The approximate size of retained objects, as last measured. 0 unless `max_bytes` is set."""
+        return self._bytes
+
+    _BATCH = 256
+
+    def _expire(self, now: float):
+        entries = self._entries
+        while entries:
+            key, (_, expires_at, size) = next(iter(entries.items()))
+            if expires_at > now:
+                break
+            del entries[key]
+            self._bytes -= size
+            self.expirations += 1
+
+    def _use(self, key: Hashable, obj: Any, now: float, size: Optional[int] = None):
+        """Mark an object as the most recently used, with the lock held.
+
+        Args:
+            key (Hashable): The key of the object.
+            obj (Any): The object.
+            now (float): The current `time.monotonic()`.
+            size (Optional[int], optional): The size of the object. Defaults to None (its size as last measured, or measured now if it isn't retained).
+
+        Returns:
+            None: Nothing is returned.
+        """
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[2]
+            if size is None:
+                size = previous[2]
+        if size is None:
+            size = self.sizeof(obj) if self.max_bytes is not None else 0
+
+        expires_at = now + self.ttl if self.ttl is not None else float("inf")
+        self._entries[key] = (obj, expires_at, size)
+        self._bytes += size
+
+    def _apply(self, now: float):
+        """Apply the queued uses of lookups, then release expired objects, with the lock held.
+
+        Args:
+            now (float): The current `time.monotonic()`.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        touched = self._touched
+        while touched:
+            key, obj = touched.popleft()
+            self._use(key, obj, now)
+
+        if self.ttl is not None:
+            self._expire(now)
+
+    def _evict(self):
+        """Release the least recently used objects until the limits are met, with the lock held. The most recently used object is kept, even if it alone exceeds the budget.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        while len(self._entries) > 1 and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def retain(self, key: Hashable, obj: Any):
+        size = (
+            self.sizeof(obj) if self.max_bytes is not None else 0
+        )  # ! Measured outside of the lock, it walks the object.
+
+        with self._lock:
+            now = time.monotonic()
+            self._apply(now)
+            self._use(key, obj, now, size)
+            self._evict()
+
+    def touch(self, key: Hashable, obj: Any):
+        touched = self._touched
+        touched.append((key, obj))
+
+        # ! Applied by whichever lookup finds the lock free, the others carry on.
+        if len(touched) >= self._BATCH and self._lock.acquire(blocking=False):
+            try:
+                self._apply(time.monotonic())
+                self._evict()
+            finally:
+                self._lock.release()
+
+    def resize(self, key: Hashable, obj: Any):
+        if self.max_bytes is None or key not in self._entries:
+            return
+
+        size = self.sizeof(obj)  # ! Measured outside of the lock, it walks the object.
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not obj:
+                return
+            self._entries[key] = (
+                obj,
+                entry[1],
+                size,
+            )  # ! Updated in place, its use isn't recorded.
+            self._bytes += size - entry[2]
+            self._evict()
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            self._apply(time.monotonic())
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._touched.clear()
+            self._entries.clear()
+            self._bytes = 0
+
+
+class TTLRetention(LRURetention):
+    """Retain objects for `ttl` seconds after their last use, without limiting how many are retained."""
+
+    def __init__(self, ttl: float):
+        """Create a TTLRetention object.
+
+        Args:
+            ttl (float): Seconds an object is retained for after its last use.
+        """
+        super().__init__(ttl=ttl)
+
+    def __repr__(self) -> str:
+        return f"<TTLRetention entries={len(self)} ttl={self.ttl}>"
+
+
+class Registry:
+    """The objects of a singleton class, by key. Objects are tracked with weak references, and kept alive as per the retention policy.
+
+    Attributes:
+        hits (int): Number of lookups answered with an existing object. Approximate while lookups run in several threads.
+        misses (int): Number of lookups that created an object. Approximate while lookups run in several threads.
+    """
+
+    def __init__(self, retention: Optional[Retention] = None, stripes: int = 64):
+        """Create a Registry object.
+
+        Args:
+            retention (Optional[Retention], optional): The retention policy. Defaults to `WeakRetention`.
+            stripes (int, optional): Number of locks objects are created under. Keys are spread across them, so creating objects of different keys rarely contends. Defaults to 64.
+        """
+        # ! Weak, so identity is tracked without keeping objects alive. Retention policies hold the strong references.
+        self._instances: weakref.WeakValueDictionary[
+            Hashable, Any
+        ] = weakref.WeakValueDictionary()
+        self._retention: Retention = (
+            retention if retention is not None else WeakRetention()
+        )  # ! Not `or`, an empty policy is falsy.
+        self._locks = tuple(Lock() for _ in range(stripes))
+
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return f"<Registry live={len(self)} retention={self._retention!r}>"
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._instances
+
+    @property
+    def retention(self) -> Retention:
+        """The retention policy. Objects retained by a replaced policy are released."""
+        return self._retention
+
+    @retention.setter
+    def retention(self, retention: Retention):
+        previous, self._retention = self._retention, retention
+        previous.clear()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retrieve the object of a key, without locking. The retention policy records the use without locking either, see `Retention.touch`.
+
+        Args:
+            key (Hashable): The key of the object.
+
+        Returns:
+            Optional[Any]: The object. None if there's none, use `lookup` to create it.
+        """
+        obj = self._instances.get(key)
+        if obj is not None:
+            self.hits += 1
+            self._retention.touch(key, obj)
+        return obj
+
+    def lookup(self, key: Hashable, create: Callable[[], Any]) -> Any:
+        """Retrieve the object of a key, creating it if there's none.
+
+        Existing objects are retrieved without locking. Objects are created with the lock of their key's stripe held, so an object is never created twice, and creating objects of other keys doesn't wait. No lock is held across an `await`, lookups from an event loop's thread only ever wait for another thread's `create`.
+
+        Args:
+            key (Hashable): The key of the object.
+            create (Callable[[], Any]): Creates the object.
+
+        Returns:
+            Any: The object.
+        """
+        obj = self.get(key)
+        if obj is None:
+            obj = self.create(key, create)
+        return obj
+
+    def create(self, key: Hashable, create: Callable[[], Any]) -> Any:
+        """Create the object of a key, the slow path of `lookup`. If another thread created it first, that object is returned instead.
+
+        Args:
+            key (Hashable): The key of the object.
+            create (Callable[[], Any]): Creates the object.
+
+        Returns:
+            Any: The object.
+        """
+        with self._locks[hash(key) % len(self._locks)]:
+            # ! Checked again, another thread may have created it while this one waited.
+            obj = self._instances.get(key)
+            if obj is None:
+                self.misses += 1
+                obj = create()
+                self._instances[key] = obj
+            else:
+                self.hits += 1
+
+        self._retention.retain(key, obj)
+        return obj
+
+    def resize(self, key: Hashable, obj: Any):
+        """Record that an object's size changed, so the retention policy measures it again, see `Retention.resize`.
+
+        Args:
+            key (Hashable): The key of the object.
+            obj (Any): The object.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        self._retention.resize(key, obj)
+
+    def values(self) -> list[Any]:
+        """Retrieve every live object. Lookups aren't counted, and retention isn't affected.
+
+        Returns:
+            list[Any]: The objects, in no particular order.
+        """
+        # ! Copied, the garbage collector may remove entries while they're iterated over.
+        return list(self._instances.values())
+
+    def clear(self):
+        """Release every retained object. Objects that are still referenced elsewhere remain registered.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        self._retention.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Count the objects of the registry, and the outcomes of lookups.
+
+        Returns:
+            dict[str, int]: The number of `live` (registered) and `retained` objects, lookup `hits` and `misses`, and objects released by the policy through `evictions` and `expirations`.
+        """
+        return {
+            "live": len(self._instances),
+            "retained": len(self._retention),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self._retention.evictions,
+            "expirations": self._retention.expirations,
+        }
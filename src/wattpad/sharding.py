@@ -0,0 +1,302 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+Fetch Users and Stories across several processes, so parsing responses isn't limited to one core. Objects are assigned to processes by consistent hashing, every process shares one `SQLiteCache`, and the objects each process fetched are merged back as snapshot records, see `wattpad.snapshot`.
+
+>>> if __name__ == "__main__":  # Processes are spawned, and import the main module.
+...     result = fetch_sharded(users=usernames, include=True, relations=("followers",), processes=8)
+...     result.items[0].followers
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+from bisect import bisect
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Any, Iterable, NamedTuple, Optional
+
+from .cache import SQLiteCache
+from .client import WattpadClient
+from .fields import FieldSpec
+from .model_types import StoryModelFieldsType, UserModelFieldsType
+from .snapshot import (
+    RECORD_TYPES,
+    apply_record,
+    iter_records,
+    read_snapshot,
+    write_snapshot,
+)
+from .utils import map_unordered
+from .wattpad import Story, User
+
+USER_RELATIONS = ("stories", "followers", "following", "lists")
+STORY_RELATIONS = ("recommended",)
+
+
+def _hash(value: str) -> int:
+    """Hash a string to 64 bits, the same in every process. `hash` is randomized per process.
+
+    Args:
+        value (str): The string.
+
+    Returns:
+        int: The hash.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(), "big"
+    )
+
+
+class HashRing:
+    """A consistent hash ring, assigning keys to shards. Adding a shard only moves about `1 / shards` of the keys, so caches and checkpoints keyed by shard mostly stay valid.
+
+    Attributes:
+        shards (int): Number of shards.
+        replicas (int): Number of points each shard has on the ring. More points spread keys more evenly.
+    """
+
+    def __init__(self, shards: int, replicas: int = 64):
+        """Create a HashRing object.
+
+        Args:
+            shards (int): Number of shards.
+            replicas (int, optional): Number of points each shard has on the ring. Defaults to 64.
+
+        Raises:
+            ValueError: There are no shards.
+        """
+        if shards < 1:
+            raise ValueError(f"A ring needs at least one shard, not {shards}.")
+
+        self.shards = shards
+        self.replicas = replicas
+
+        points = sorted(
+            (_hash(f"{shard}:{replica}"), shard)
+            for shard in range(shards)
+            for replica in range(replicas)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    def __repr__(self) -> str:
+        return f"<HashRing shards={self.shards} replicas={self.replicas}>"
+
+    def shard(self, key: str) -> int:
+        """Find the shard of a key.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            int: The shard, from 0 to `shards - 1`.
+        """
+        index = bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+
+class _Shard(NamedTuple):
+    """The work of one process, and where its results are written."""
+
+    users: list[str]
+    stories: list[str]
+    include: Any
+    relations: tuple[str, ...]
+    concurrency: int
+    cache: str
+    client_options: dict
+    path: str
+
+
+class ShardedResult(NamedTuple):
+    """The outcome of `fetch_sharded`.
+
+    Attributes:
+        items (list[User | Story]): The Users and Stories that were fetched, merged into this process. Empty if the results were written to a snapshot file instead. Holds the objects and everything they link to, so they aren't garbage collected.
+        fetched (int): Number of Users and Stories fetched, with their relations.
+        failed (dict[str, str]): Keys of the Users (`user:<username>`) and Stories (`story:<id>`) that couldn't be fetched, mapped to the error.
+        records (dict[str, int]): Number of snapshot records merged or written, of each type. Objects fetched by several processes are counted once per process.
+    """
+
+    items: list
+    fetched: int
+    failed: dict[str, str]
+    records: dict[str, int]
+
+
+async def _fetch_shard(shard: _Shard) -> tuple[int, dict[str, str], dict[str, int]]:
+    """Fetch the Users and Stories of a shard, and write every object of this process to the shard's snapshot file.
+
+    Args:
+        shard (_Shard): The shard.
+
+    Returns:
+        tuple[int, dict[str, str], dict[str, int]]: The number of objects fetched, the errors of those that couldn't be, and the number of records written of each type.
+    """
+    cache = SQLiteCache(shard.cache)
+    client = WattpadClient(cache=cache, **shard.client_options)
+    failed: dict[str, str] = {}
+
+    async def fetch(item: User | Story):
+        try:
+            await item.fetch(include=shard.include, client=client)
+            if isinstance(item, User):
+                for relation in shard.relations:
+                    if relation == "stories":
+                        await item.fetch_stories(client=client)
+                    elif relation in USER_RELATIONS:
+                        async for _ in getattr(item, f"iter_{relation}")(client=client):
+                            pass
+            elif "recommended" in shard.relations:
+                async for _ in item.iter_recommended(client=client):
+                    pass
+        except Exception as error:
+            key = (
+                f"user:{item.username}"
+                if isinstance(item, User)
+                else f"story:{item.id}"
+            )
+            failed[key] = repr(error)
+
+    items = [User(username) for username in shard.users]
+    items.extend(Story(id_) for id_ in shard.stories)
+    try:
+        async for _ in map_unordered(fetch, items, shard.concurrency):
+            pass
+    finally:
+        await client.close()
+        cache.close()
+
+    # ! `items` holds what was fetched alive until it's written.
+    records = write_snapshot(shard.path, iter_records(), compress=False)
+    return len(items) - len(failed), failed, records
+
+
+def _run_shard(shard: _Shard) -> tuple[int, dict[str, str], dict[str, int]]:
+    """Fetch a shard in a worker process, see `_fetch_shard`."""
+    return asyncio.run(_fetch_shard(shard))
+
+
+def fetch_sharded(
+    users: Iterable[str] = (),
+    stories: Iterable[str] = (),
+    include: bool | UserModelFieldsType | StoryModelFieldsType | FieldSpec = False,
+    relations: Iterable[str] = (),
+    processes: Optional[int] = None,
+    concurrency: int = 10,
+    cache: Optional[str] = None,
+    client_options: Optional[dict] = None,
+    output: Optional[str] = None,
+    validation: str = "lazy",
+) -> ShardedResult:
+    """Fetch Users and Stories in a pool of processes, each fetching the objects assigned to it by a `HashRing`. Blocks until every process is done.
+    **Note**: Processes are spawned rather than forked, so they start without this process's objects. Call this from an `if __name__ == "__main__":` block. From async code, call it in an executor, e.g. `await loop.run_in_executor(None, fetch_sharded, ...)`.
+
+    Example:
+    ```py
+    >>> fetch_sharded(stories=story_ids, include={"title": True}, processes=4, cache="crawl.sqlite", output="stories.jsonl.gz")
+    ```
+
+    Args:
+        users (Iterable[str], optional): Usernames of Users to fetch. Defaults to ().
+        stories (Iterable[str], optional): IDs of Stories to fetch. Defaults to ().
+        include (bool | UserModelFieldsType | StoryModelFieldsType | FieldSpec, optional): Fields to fetch, passed to each object's `fetch`. True fetches all fields. Defaults to False.
+        relations (Iterable[str], optional): Relations to retrieve of each object, every page of them. Users support `USER_RELATIONS`, Stories `STORY_RELATIONS`. Defaults to ().
+        processes (Optional[int], optional): Number of processes. Defaults to None (the number of CPUs).
+        concurrency (int, optional): Maximum number of objects fetched at once, per process. Defaults to 10.
+        cache (Optional[str], optional): Path of the `SQLiteCache` shared by the processes. Defaults to None (a temporary database, removed afterwards).
+        client_options (Optional[dict], optional): Keyword arguments of each process's `WattpadClient`, e.g. `base_url` or `rate_limiter`. Limits apply per process. Defaults to None.
+        output (Optional[str], optional): Path of a snapshot file to write the results to, instead of merging them into this process. Objects fetched by several processes have a record from each, load it with `load_snapshot(output, replace=False)`. Defaults to None.
+        validation (str, optional): How merged data is validated, see `WattpadClient.validation`. Defaults to "lazy".
+
+    Raises:
+        ValueError: A relation isn't supported.
+
+    Returns:
+        ShardedResult: The fetched objects, and the outcome of the fetch.
+    """
+    relations = tuple(relations)
+    for relation in relations:
+        if relation not in USER_RELATIONS + STORY_RELATIONS:
+            raise ValueError(
+                f"Unsupported relation {relation!r}, expected one of {USER_RELATIONS + STORY_RELATIONS}."
+            )
+
+    usernames = list(dict.fromkeys(username.lower() for username in users))
+    story_ids = list(dict.fromkeys(str(id_).lower() for id_ in stories))
+    processes = processes or os.cpu_count() or 1
+
+    ring = HashRing(processes)
+    assigned: list[tuple[list[str], list[str]]] = [([], []) for _ in range(processes)]
+    for username in usernames:
+        assigned[ring.shard(f"user:{username}")][0].append(username)
+    for id_ in story_ids:
+        assigned[ring.shard(f"story:{id_}")][1].append(id_)
+
+    directory = tempfile.mkdtemp(prefix="wattpad-shards-")
+    try:
+        if cache is None:
+            cache = os.path.join(directory, "cache.sqlite")
+        # ! Created once, rather than by every process at once.
+        SQLiteCache(cache).close()
+
+        shards = [
+            _Shard(
+                shard_users,
+                shard_stories,
+                include,
+                relations,
+                concurrency,
+                cache,
+                client_options or {},
+                os.path.join(directory, f"shard-{index}.jsonl"),
+            )
+            for index, (shard_users, shard_stories) in enumerate(assigned)
+            if shard_users or shard_stories
+        ]
+
+        fetched = 0
+        failed: dict[str, str] = {}
+        if shards:
+            with ProcessPoolExecutor(
+                max_workers=len(shards),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                for shard_fetched, shard_failed, _ in pool.map(_run_shard, shards):
+                    fetched += shard_fetched
+                    failed.update(shard_failed)
+
+        paths = [shard.path for shard in shards]
+        if output is not None:
+            records = write_snapshot(
+                output, chain.from_iterable(map(read_snapshot, paths))
+            )
+            return ShardedResult([], fetched, failed, records)
+
+        # ! Created first, so the objects are held while their records are merged.
+        items: list = [User(username) for username in usernames]
+        items.extend(Story(id_) for id_ in story_ids)
+
+        records = dict.fromkeys(RECORD_TYPES, 0)
+        for path in paths:
+            for record in read_snapshot(path):
+                # ! Merged, an object fetched by one process may only be linked to by another, with fewer fields.
+                apply_record(record, validation, replace=False)
+                records[record["type"]] += 1
+
+        return ShardedResult(items, fetched, failed, records)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
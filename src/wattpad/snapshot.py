@@ -0,0 +1,276 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+Snapshots of every live User, Story and List, with their data and the links between them. Snapshots are JSON-lines files, one record per object, written and read one record at a time. A worker can dump what it fetched and a new one can load it, instead of fetching it all again.
+
+>>> dump_snapshot("snapshot.jsonl.gz")  # Compressed, as per the extension.
+{'user': 1200, 'story': 5400, 'list': 300}
+>>> loaded = load_snapshot("snapshot.jsonl.gz")  # Holds the loaded objects.
+>>> loaded.counts
+{'user': 1200, 'story': 5400, 'list': 300}
+
+Records reference other objects by key. Referenced objects are created as records are loaded, and receive their data once their own record is reached, so records can be loaded in any order, e.g. merged from several snapshots.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import time
+from typing import IO, Iterable, Iterator, NamedTuple, Optional
+
+from .client import get_client
+from .utils import atomic_path
+from .wattpad import List, Story, User
+
+SNAPSHOT_VERSION = 1
+RECORD_TYPES = ("user", "story", "list")
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+class LoadedSnapshot(NamedTuple):
+    """The outcome of `load_snapshot`.
+
+    Attributes:
+        objects (list[User | Story | List]): The object of each record. Holds the objects alive, they're only kept alive by each other and their registry's retention policy otherwise, see `wattpad.registry`.
+        counts (dict[str, int]): The number of objects loaded of each type.
+    """
+
+    objects: list
+    counts: dict[str, int]
+
+
+def _user_record(user: User) -> dict:
+    record: dict = {"type": "user", "username": user.username}
+    data = user._dump_data()
+    if data:
+        record["data"] = data
+    if user.stories:
+        record["stories"] = [story.id for story in user.stories]
+    if user.followers:
+        record["followers"] = [follower.username for follower in user.followers]
+    if user.following:
+        record["following"] = [followed.username for followed in user.following]
+    if user.lists:
+        record["lists"] = [list_.id for list_ in user.lists]
+    return record
+
+
+def _story_record(story: Story) -> dict:
+    # ! Parts are kept in the Story's data, and linked again as it's loaded.
+    record: dict = {"type": "story", "id": story.id}
+    data = story._dump_data()
+    if data:
+        record["data"] = data
+    if story.user is not None:
+        record["user"] = story.user.username
+    if story.recommended:
+        record["recommended"] = [item.id for item in story.recommended]
+    return record
+
+
+def _list_record(list_: List) -> dict:
+    record: dict = {"type": "list", "id": list_.id, "user": list_.user.username}
+    if list_.name:
+        record["name"] = list_.name
+    if list_.stories:
+        record["stories"] = [story.id for story in list_.stories]
+    return record
+
+
+def iter_records() -> Iterator[dict]:
+    """Iterate over the snapshot records of every live User, Story and List. Objects are read as records are requested, their data isn't copied or materialized ahead of time.
+
+    Yields:
+        dict: Each record, Users first, then Stories, then Lists.
+    """
+    for user in User.registry.values():
+        yield _user_record(user)
+    for story in Story.registry.values():
+        yield _story_record(story)
+    for list_ in List.registry.values():
+        yield _list_record(list_)
+
+
+def apply_record(
+    record: dict, validation: str = "lazy", replace: bool = True
+) -> User | Story | List:
+    """Load a snapshot record, creating or updating its object. A User's `stories` and a Story's `recommended` replace the current ones, other links are added to the current ones.
+
+    Args:
+        record (dict): The record, see `iter_records`.
+        validation (str, optional): How the object's data is validated, see `WattpadClient.validation`. Defaults to "lazy".
+        replace (bool, optional): Whether the object's data replaces its current data, rather than being merged into it. Merge records of the same object from several snapshots, as they may each hold some of its fields. Defaults to True.
+
+    Raises:
+        ValueError: The record's type is unknown.
+
+    Returns:
+        User | Story | List: The object of the record.
+    """
+    type_ = record.get("type")
+
+    if type_ == "user":
+        user = User(record["username"])
+        if "data" in record:
+            user._load_data(record["data"], validation, replace)
+        if "stories" in record:
+            user.stories = [Story(id_) for id_ in record["stories"]]
+        if "followers" in record:
+            user.followers.update(User(username) for username in record["followers"])
+        if "following" in record:
+            user.following.update(User(username) for username in record["following"])
+        if "lists" in record:
+            user.lists.update(List(id_, user) for id_ in record["lists"])
+        return user
+
+    elif type_ == "story":
+        story = Story(record["id"])
+        if "user" in record:
+            story.user = User(record["user"])
+        if "data" in record:
+            story._load_data(record["data"], validation, replace)
+        if "recommended" in record:
+            story.recommended = [Story(id_) for id_ in record["recommended"]]
+        return story
+
+    elif type_ == "list":
+        user = User(record["user"])
+        list_ = List(record["id"], user)
+        list_._update_data(
+            name=record.get("name"),
+            user=user,
+            stories={Story(id_) for id_ in record.get("stories", ())},
+        )
+        return list_
+
+    else:
+        raise ValueError(f"Unknown snapshot record type {type_!r}.")
+
+
+def _open(path: str, mode: str, compress: bool = False) -> IO[str]:
+    """Open a snapshot file as text. Compressed files are detected when reading.
+
+    Args:
+        path (str): The path of the file.
+        mode (str): "r" to read, or "w" to write.
+        compress (bool, optional): Whether to compress the file with gzip, when writing. Defaults to False.
+
+    Returns:
+        IO[str]: The file.
+    """
+    if mode == "r":
+        with open(path, "rb") as file:
+            compress = file.read(2) == _GZIP_MAGIC
+
+    if compress:
+        # ! A low level, snapshots are written often and compressing them shouldn't dominate.
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=3)
+    return open(path, mode, encoding="utf-8")
+
+
+def write_snapshot(
+    path: str, records: Iterable[dict], compress: Optional[bool] = None
+) -> dict[str, int]:
+    """Write records to a snapshot file, one line at a time. The file is replaced once every record is written, a failed write doesn't leave a partial snapshot behind.
+
+    Args:
+        path (str): The path of the snapshot.
+        records (Iterable[dict]): The records to write, see `iter_records`. Consumed lazily.
+        compress (Optional[bool], optional): Whether to compress the snapshot with gzip. Defaults to None (if `path` ends with ".gz").
+
+    Returns:
+        dict[str, int]: The number of records written of each type.
+    """
+    if compress is None:
+        compress = path.endswith(".gz")
+
+    counts = dict.fromkeys(RECORD_TYPES, 0)
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    with atomic_path(path) as temporary, _open(temporary, "w", compress) as file:
+        header = {"type": "header", "version": SNAPSHOT_VERSION, "created": time.time()}
+        file.write(encode(header) + "\n")
+        for record in records:
+            file.write(encode(record) + "\n")
+            counts[record["type"]] = counts.get(record["type"], 0) + 1
+
+    return counts
+
+
+def read_snapshot(path: str) -> Iterator[dict]:
+    """Iterate over the records of a snapshot file, reading one line at a time.
+
+    Args:
+        path (str): The path of the snapshot. Compressed snapshots are detected.
+
+    Raises:
+        ValueError: The file isn't a snapshot, or was written by an unsupported version.
+
+    Yields:
+        dict: Each record, in the order it was written.
+    """
+    with _open(path, "r") as file:
+        header = json.loads(file.readline() or "null")
+        if not isinstance(header, dict) or header.get("type") != "header":
+            raise ValueError(f"{path!r} isn't a snapshot.")
+        if header.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"{path!r} is a version {header.get('version')} snapshot, only version {SNAPSHOT_VERSION} is supported."
+            )
+
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def dump_snapshot(path: str, compress: Optional[bool] = None) -> dict[str, int]:
+    """Write every live User, Story and List to a snapshot file.
+    **Note**: Only objects that are still referenced, or retained by their registry, are live. See `wattpad.registry`.
+
+    Args:
+        path (str): The path of the snapshot.
+        compress (Optional[bool], optional): Whether to compress the snapshot with gzip. Defaults to None (if `path` ends with ".gz").
+
+    Returns:
+        dict[str, int]: The number of objects written of each type.
+    """
+    return write_snapshot(path, iter_records(), compress)
+
+
+def load_snapshot(
+    path: str, validation: Optional[str] = None, replace: bool = True
+) -> LoadedSnapshot:
+    """Load every User, Story and List of a snapshot file, one record at a time.
+    **Note**: The loaded objects are held by the returned `LoadedSnapshot`. Keep it for as long as the objects are needed, or set a retention policy before loading, see `wattpad.registry`.
+
+    Args:
+        path (str): The path of the snapshot. Compressed snapshots are detected.
+        validation (Optional[str], optional): How loaded data is validated, see `WattpadClient.validation`. Defaults to the validation mode of the client in use.
+        replace (bool, optional): Whether loaded data replaces the current data of objects, rather than being merged into it, see `apply_record`. Defaults to True.
+
+    Raises:
+        ValueError: The file isn't a snapshot, was written by an unsupported version, or has a record of an unknown type.
+
+    Returns:
+        LoadedSnapshot: The loaded objects, and the number loaded of each type.
+    """
+    if validation is None:
+        validation = get_client().validation
+
+    objects: list = []
+    counts = dict.fromkeys(RECORD_TYPES, 0)
+    for record in read_snapshot(path):
+        # ! Held, the default retention policy would release each object as soon as the next record is loaded.
+        objects.append(apply_record(record, validation, replace))
+        counts[record["type"]] += 1
+
+    return LoadedSnapshot(objects, counts)
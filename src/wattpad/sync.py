@@ -0,0 +1,372 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+A synchronous interface, for code that doesn't run an event loop. Coroutines are submitted to one event loop running in a background thread, so every call shares that loop's connection pool, instead of creating a loop and a session per call as `asyncio.run` does.
+
+>>> user = blocking(User("<username>"))
+>>> user.fetch()
+>>> for follower in user.iter_followers():
+...     print(follower)
+>>> run(Story("<id>").fetch())
+
+Calls are safe from any number of threads. Objects are only updated from the background loop's thread, as results arrive.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import inspect
+import threading
+from concurrent.futures import Future
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Coroutine,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+from .client import WattpadClient, _current_client
+
+T = TypeVar("T")
+
+_EXHAUSTED = object()
+
+
+async def _next(iterator: AsyncIterator[T]) -> Any:
+    """Await the next item of an async iterator. Exhaustion is signalled with a sentinel, rather than `StopAsyncIteration`, which can't cross into the caller's thread as is.
+
+    Args:
+        iterator (AsyncIterator[T]): The iterator.
+
+    Returns:
+        Any: The item, or `_EXHAUSTED`.
+    """
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return _EXHAUSTED
+
+
+class BackgroundLoop:
+    """An event loop running in a daemon thread, that coroutines are submitted to from other threads.
+
+    Attributes:
+        client (Optional[WattpadClient]): The client coroutines use, as if they ran in an `async with client` block. None if they use the client in use, see `wattpad.client.get_client`.
+        name (str): The name of the thread.
+    """
+
+    def __init__(
+        self, client: Optional[WattpadClient] = None, name: str = "wattpad-loop"
+    ):
+        """Create a BackgroundLoop object. The thread is started on first use.
+
+        Args:
+            client (Optional[WattpadClient], optional): The client coroutines use. Defaults to None (the client in use).
+            name (str, optional): The name of the thread. Defaults to "wattpad-loop".
+        """
+        self.client = client
+        self.name = name
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<BackgroundLoop name={self.name!r} running={self.running}>"
+
+    def __enter__(self) -> BackgroundLoop:
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        """Whether the loop's thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop's thread, if it isn't running.
+
+        Returns:
+            asyncio.AbstractEventLoop: The loop.
+        """
+        loop = self._loop
+        if loop is not None and self.running:
+            return loop
+
+        with self._lock:
+            if self._loop is not None and self.running:
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def serve():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=serve, name=self.name, daemon=True)
+            thread.start()
+            started.wait()
+
+            self._loop, self._thread = loop, thread
+            return loop
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        """Cancel pending work, close the loop's sessions and stop its thread. The loop is started anew if it's used again.
+
+        Args:
+            timeout (Optional[float], optional): Seconds to wait for pending work to be cancelled. Defaults to 10.0.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if loop is None or thread is None or not thread.is_alive():
+            return
+
+        async def shutdown():
+            # ! Cancelling every task closes the client sessions of this loop, as `asyncio.run` does.
+            tasks = [
+                task
+                for task in asyncio.all_tasks()
+                if task is not asyncio.current_task()
+            ]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+
+    async def _with_client(self, coroutine: Awaitable[T]) -> T:
+        """Await a coroutine with this loop's client in use, see `wattpad.client.get_client`."""
+        # ! Each submitted coroutine runs in its own task, and so its own context. The client is only in use within it.
+        _current_client.set(self.client)
+        return await coroutine
+
+    def submit(self, coroutine: Coroutine[Any, Any, T]) -> Future[T]:
+        """Schedule a coroutine on the loop, without waiting for it.
+
+        Args:
+            coroutine (Coroutine[Any, Any, T]): The coroutine.
+
+        Returns:
+            concurrent.futures.Future[T]: The future of the coroutine's result. Cancelling it cancels the coroutine.
+        """
+        loop = self.start()
+        if self.client is not None:
+            coroutine = self._with_client(coroutine)
+        return asyncio.run_coroutine_threadsafe(coroutine, loop)
+
+    def run(
+        self, coroutine: Coroutine[Any, Any, T], timeout: Optional[float] = None
+    ) -> T:
+        """Run a coroutine on the loop, and wait for its result.
+
+        Example:
+        ```py
+        >>> loop.run(User("<username>").fetch())
+        ```
+
+        Args:
+            coroutine (Coroutine[Any, Any, T]): The coroutine.
+            timeout (Optional[float], optional): Seconds to wait for the result. The coroutine is cancelled if it takes longer. Defaults to None (forever).
+
+        Raises:
+            RuntimeError: Called from the loop's own thread, which would wait on itself forever.
+            TimeoutError: The coroutine took longer than `timeout`.
+
+        Returns:
+            T: The coroutine's result. Its exception is raised if it failed.
+        """
+        if self._thread is threading.current_thread():
+            coroutine.close()
+            raise RuntimeError(
+                "BackgroundLoop.run can't be called from its own thread, await the coroutine instead."
+            )
+
+        future = self.submit(coroutine)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def iterate(
+        self, iterator: AsyncIterator[T], timeout: Optional[float] = None
+    ) -> Iterator[T]:
+        """Iterate over an async iterator from this thread, running it on the loop one item at a time. The iterator is closed if iteration stops early.
+
+        Example:
+        ```py
+        >>> for follower in loop.iterate(user.iter_followers()):
+        ...     print(follower)
+        ```
+
+        Args:
+            iterator (AsyncIterator[T]): The async iterator, e.g. an async generator.
+            timeout (Optional[float], optional): Seconds to wait for each item. Defaults to None (forever).
+
+        Yields:
+            T: Each item of the iterator.
+        """
+        try:
+            while True:
+                item = self.run(_next(iterator), timeout)
+                if item is _EXHAUSTED:
+                    return
+                yield item
+        finally:
+            close = getattr(iterator, "aclose", None)
+            if close is not None and self.running:
+                self.run(close())
+
+
+class Blocking:
+    """A proxy of an object whose coroutine methods block until they complete on a background loop, and whose async generator methods return plain iterators. Other attributes are passed through.
+
+    Example:
+    ```py
+    >>> story = Blocking(Story("<id>"))
+    >>> story.fetch({"title": True})
+    >>> story.data.title
+    ```
+    """
+
+    __slots__ = ("_obj", "_loop")
+
+    def __init__(self, obj: Any, loop: Optional[BackgroundLoop] = None):
+        """Create a Blocking object.
+
+        Args:
+            obj (Any): The object, e.g. a User, Story or Part.
+            loop (Optional[BackgroundLoop], optional): The loop to run coroutines on. Defaults to the shared loop, see `get_loop`.
+        """
+        self._obj = obj
+        self._loop = loop
+
+    def __repr__(self) -> str:
+        return f"<Blocking {self._obj!r}>"
+
+    def __dir__(self) -> list[str]:
+        return dir(self._obj)
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._obj, name)
+        loop = self._loop or get_loop()
+
+        if inspect.iscoroutinefunction(attribute):
+
+            def call(*args, **kwargs):
+                return loop.run(attribute(*args, **kwargs))
+
+        elif inspect.isasyncgenfunction(attribute):
+
+            def call(*args, **kwargs):
+                return loop.iterate(attribute(*args, **kwargs))
+
+        else:
+            return attribute
+
+        call.__name__ = name
+        call.__doc__ = attribute.__doc__
+        return call
+
+    def __setattr__(self, name: str, value: Any):
+        if name in Blocking.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._obj, name, value)
+
+    @property
+    def wrapped(self) -> Any:
+        """The proxied object."""
+        return self._obj
+
+
+_shared: Optional[BackgroundLoop] = None
+_shared_lock = threading.Lock()
+
+
+def get_loop() -> BackgroundLoop:
+    """Retrieve the shared background loop, creating it if required. It's stopped when the interpreter exits.
+
+    Returns:
+        BackgroundLoop: The shared loop.
+    """
+    global _shared
+
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = BackgroundLoop()
+                atexit.register(_shared.stop)
+    return _shared
+
+
+def run(coroutine: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """Run a coroutine on the shared background loop, and wait for its result. See `BackgroundLoop.run`.
+
+    Args:
+        coroutine (Coroutine[Any, Any, T]): The coroutine.
+        timeout (Optional[float], optional): Seconds to wait for the result. Defaults to None (forever).
+
+    Returns:
+        T: The coroutine's result.
+    """
+    return get_loop().run(coroutine, timeout)
+
+
+def iterate(iterator: AsyncIterator[T], timeout: Optional[float] = None) -> Iterator[T]:
+    """Iterate over an async iterator on the shared background loop. See `BackgroundLoop.iterate`.
+
+    Example:
+    ```py
+    >>> for result in iterate(fetch_many(stories, concurrency=25)):
+    ...     print(result.item, result.error)
+    ```
+
+    Args:
+        iterator (AsyncIterator[T]): The async iterator.
+        timeout (Optional[float], optional): Seconds to wait for each item. Defaults to None (forever).
+
+    Returns:
+        Iterator[T]: The items of the iterator.
+    """
+    return get_loop().iterate(iterator, timeout)
+
+
+def blocking(obj: T) -> T:
+    """Wrap an object in a `Blocking` proxy on the shared background loop. Typed as the object, though its coroutine methods return their results directly.
+
+    Args:
+        obj (T): The object, e.g. a User, Story or Part.
+
+    Returns:
+        T: The proxy.
+    """
+    return Blocking(obj)  # type: ignore
@@ -0,0 +1,602 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+An append-only time-series store of the counters of Users, Stories and Parts: their reads, votes, comments and followers. Fetching an object overwrites its data, the store keeps a sample of its counters from every fetch.
+
+Samples are stored in columns of machine types, one array per counter. A store with a directory keeps each column in a file, appended to and memory-mapped for reading, so a store's history isn't loaded into memory when it's opened.
+
+>>> store = TimeSeriesStore("stats/")
+>>> store.install(client)  # Records a sample whenever the client's responses are parsed.
+>>> await Story("<id>").fetch({"readCount": True, "voteCount": True})
+>>> store.delta("story", "<id>", "read_count", start=time.time() - 24 * 60 * 60)
+1204
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import time
+from array import array
+from threading import Lock
+from typing import Any, Iterator, NamedTuple, Optional
+
+from .client import WattpadClient
+from .graph import _Interner
+from .wattpad import Part, Story, User
+
+SERIES = {
+    "user": ("num_followers", "votes_received"),
+    "story": ("read_count", "vote_count", "comment_count"),
+    "part": ("read_count", "vote_count", "comment_count"),
+}  # ! The counters recorded for each kind of object, by field name.
+
+# ! The value of a counter a sample didn't include. Counters are never negative.
+MISSING = -1
+
+_ALIASES = {
+    "num_followers": "numFollowers",
+    "votes_received": "votesReceived",
+    "read_count": "readCount",
+    "vote_count": "voteCount",
+    "comment_count": "commentCount",
+}
+_KINDS = {User: "user", Story: "story", Part: "part"}
+
+_KEY = "I"
+_TIME = "d"
+_VALUE = "q"
+# ! Rows buffered in memory before a file-backed column is written to.
+_FLUSH_ROWS = 4096
+# ! Rows `iter_samples` copies at once, while holding the lock.
+_READ_ROWS = 1024
+
+
+class Series(NamedTuple):
+    """The samples of one object, in time order.
+
+    Attributes:
+        times (array): The time of each sample, as a UNIX timestamp.
+        values (dict[str, array]): The values of each counter, aligned with `times`. `MISSING` where a sample didn't include the counter.
+    """
+
+    times: array
+    values: dict[str, array]
+
+
+class _Column:
+    """An append-only array of one machine type. File-backed columns are memory-mapped, with recent values buffered in memory until they're flushed."""
+
+    __slots__ = ("typecode", "_tail", "_file", "_mmap", "_view")
+
+    def __init__(self, typecode: str, path: Optional[str] = None):
+        self.typecode = typecode
+        self._tail = array(typecode)
+        self._file = open(path, "a+b") if path is not None else None
+        self._mmap: Optional[mmap.mmap] = None
+        self._view = memoryview(array(typecode))
+
+    def __len__(self) -> int:
+        return len(self._view) + len(self._tail)
+
+    def __getitem__(self, index: int) -> Any:
+        mapped = len(self._view)
+        if index < mapped:
+            return self._view[index]
+        return self._tail[index - mapped]
+
+    def append(self, value: Any):
+        self._tail.append(value)
+
+    def nbytes(self) -> int:
+        return len(self) * self._tail.itemsize
+
+    def truncate(self, length: int):
+        """Discard values past `length`, and any partial value, such as those of a row that was partially written."""
+        assert self._file is not None
+        self._file.truncate(length * self._tail.itemsize)
+        self._map()
+
+    def flush(self):
+        if self._file is None or not self._tail:
+            return
+        self._file.write(self._tail.tobytes())
+        self._file.flush()
+        del self._tail[:]
+        self._map()
+
+    def _map(self):
+        assert self._file is not None
+        self._unmap()
+
+        size = os.fstat(self._file.fileno()).st_size
+        size -= size % self._tail.itemsize
+        if size:
+            self._mmap = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap).cast(self.typecode)
+
+    def _unmap(self):
+        # ! Views are released first, a mapping can't be closed while it's exported.
+        self._view.release()
+        self._view = memoryview(array(self.typecode))
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        self._unmap()
+        self._file.close()
+        self._file = None
+
+
+class _Table:
+    """The samples of one kind of object: a key column, a time column, and one column per counter. Rows of each key are indexed, in time order."""
+
+    __slots__ = ("metrics", "columns", "keys", "rows", "_keys_file")
+
+    def __init__(self, kind: str, directory: Optional[str] = None):
+        self.metrics = SERIES[kind]
+        self.keys = _Interner()
+        self.rows: list[array] = []
+
+        def path(column: str) -> Optional[str]:
+            return (
+                os.path.join(directory, f"{kind}.{column}")
+                if directory is not None
+                else None
+            )
+
+        self.columns = {
+            "key": _Column(_KEY, path("key")),
+            "time": _Column(_TIME, path("time")),
+            **{metric: _Column(_VALUE, path(metric)) for metric in self.metrics},
+        }
+
+        self._keys_file = None
+        if directory is not None:
+            self._open(os.path.join(directory, f"{kind}.keys"))
+
+    def _open(self, path: str):
+        """Load the keys and index the rows of a file-backed table."""
+        if os.path.exists(path):
+            with open(path, "r+b") as file:
+                data = file.read()
+                end = data.rfind(b"\n") + 1
+                if end != len(data):
+                    # ! A key interrupted while it was written. The next key would be appended to it.
+                    file.truncate(end)
+            for key in data[:end].decode("utf-8").split("\n")[:-1]:
+                self.keys.intern(key)
+        self._keys_file = open(path, "a", encoding="utf-8")
+
+        for column in self.columns.values():
+            column._map()
+        length = min(len(column) for column in self.columns.values())
+        for column in self.columns.values():
+            # ! Discards a row interrupted while it was written, down to the bytes of a partial value. Appends would be misaligned after them.
+            column.truncate(length)
+
+        self.rows = [array(_KEY) for _ in range(len(self.keys))]
+        keys = self.columns["key"]
+        for row in range(length):
+            self.rows[keys[row]].append(row)
+
+    def __len__(self) -> int:
+        return len(self.columns["time"])
+
+    def append(self, key: str, timestamp: float, values: dict[str, int]):
+        id_ = self.keys.intern(key)
+        if id_ == len(self.rows):
+            self.rows.append(array(_KEY))
+            if self._keys_file is not None:
+                self._keys_file.write(key + "\n")
+                self._keys_file.flush()  # ! Before any row references it.
+
+        rows = self.rows[id_]
+        if rows and timestamp < self.columns["time"][rows[-1]]:
+            raise ValueError(
+                f"Samples of {key!r} must be appended in time order, {timestamp} precedes the last sample."
+            )
+
+        row = len(self)
+        self.columns["key"].append(id_)
+        self.columns["time"].append(timestamp)
+        for metric in self.metrics:
+            value = values.get(metric)
+            self.columns[metric].append(MISSING if value is None else value)
+        rows.append(row)
+
+        if len(self.columns["time"]._tail) >= _FLUSH_ROWS:
+            self.flush()
+
+    def last_time(self, key: str) -> Optional[float]:
+        id_ = self.keys.ids.get(key)
+        if id_ is None or not self.rows[id_]:
+            return None
+        return self.columns["time"][self.rows[id_][-1]]
+
+    def select(
+        self, key: str, start: Optional[float], end: Optional[float]
+    ) -> list[int]:
+        """The rows of a key within a time range, both ends included."""
+        id_ = self.keys.ids.get(key)
+        if id_ is None:
+            return []
+
+        rows = self.rows[id_]
+        times = self.columns["time"]
+        low = 0 if start is None else _search(rows, times, start, right=False)
+        high = len(rows) if end is None else _search(rows, times, end, right=True)
+        return rows[low:high].tolist()
+
+    def flush(self):
+        for column in self.columns.values():
+            column.flush()
+
+    def close(self):
+        for column in self.columns.values():
+            column.close()
+        if self._keys_file is not None:
+            self._keys_file.close()
+            self._keys_file = None
+
+
+def _search(rows: array, times: _Column, value: float, right: bool) -> int:
+    """Find where a time would be inserted among the rows of a key, as `bisect.bisect_left` and `bisect.bisect_right` do."""
+    low, high = 0, len(rows)
+    while low < high:
+        middle = (low + high) // 2
+        time_ = times[rows[middle]]
+        if time_ < value or (right and time_ == value):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+class TimeSeriesStore:
+    """An append-only store of counter samples, per User, Story and Part. Samples are appended in time order for each object, and queried by time range.
+
+    Kinds of objects, and their counters, are listed in `SERIES`. Objects are keyed by their username or ID.
+    **Note**: File-backed columns are stored in the machine's byte order. Copy stores between machines of the same architecture.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Create a TimeSeriesStore object.
+
+        Args:
+            path (Optional[str], optional): The directory to store samples in, created if it doesn't exist. Existing samples are kept, and new ones appended. Defaults to None (samples are kept in memory).
+        """
+        self.path = path
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+        self._tables = {kind: _Table(kind, path) for kind in SERIES}
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        samples = sum(len(table) for table in self._tables.values())
+        return f"<TimeSeriesStore path={self.path!r} samples={samples}>"
+
+    def __enter__(self) -> TimeSeriesStore:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _table(self, kind: str) -> _Table:
+        table = self._tables.get(kind)
+        if table is None:
+            raise ValueError(
+                f"Unknown kind {kind!r}, expected one of {', '.join(SERIES)}."
+            )
+        return table
+
+    def append(
+        self,
+        kind: str,
+        key: str,
+        values: dict[str, Optional[int]],
+        timestamp: Optional[float] = None,
+    ):
+        """Append a sample.
+
+        Example:
+        ```py
+        >>> store.append("user", "wattpad", {"num_followers": 1200, "votes_received": 80})
+        ```
+
+        Args:
+            kind (str): The kind of object, a key of `SERIES`.
+            key (str): The username or ID of the object.
+            values (dict[str, Optional[int]]): The value of each counter, by field name. Counters that are absent or None are stored as `MISSING`.
+            timestamp (Optional[float], optional): The time of the sample, as a UNIX timestamp. Defaults to now.
+
+        Raises:
+            ValueError: The kind is unknown, or the sample precedes the object's last sample.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        table = self._table(kind)
+        with self._lock:
+            table.append(key, time.time() if timestamp is None else timestamp, values)
+
+    def record(self, obj: Any, timestamp: Optional[float] = None) -> int:
+        """Append a sample of an object's counters, as per its data. Objects without any of their counters aren't sampled, and neither are objects of other types, such as Lists. The Parts of a Story are sampled alongside it.
+        **Note**: Pending raw data is read as-is, recording a sample doesn't materialize an object's data.
+
+        Args:
+            obj (Any): The User, Story or Part.
+            timestamp (Optional[float], optional): The time of the sample, as a UNIX timestamp. Defaults to now, or the object's last sample if the clock went backwards.
+
+        Returns:
+            int: The number of samples appended.
+        """
+        kind = _KINDS.get(type(obj))
+        if kind is None:
+            return 0
+
+        appended = 0
+        values = _counters(obj, SERIES[kind])
+        if values:
+            table = self._tables[kind]
+            key = getattr(obj, obj._key)
+            with self._lock:
+                now = time.time() if timestamp is None else timestamp
+                if timestamp is None:
+                    last = table.last_time(key)
+                    if last is not None and now < last:
+                        now = last
+                table.append(key, now, values)
+            appended += 1
+
+        if kind == "story":
+            for part in obj.parts:
+                appended += self.record(part, timestamp)
+        return appended
+
+    def install(self, client: WattpadClient):
+        """Record a sample of every object parsed from a client's responses, see `WattpadClient.add_hook`.
+
+        Args:
+            client (WattpadClient): The client.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        client.add_hook("parse_complete", self._on_parse)
+
+    def uninstall(self, client: WattpadClient):
+        """Stop recording the objects parsed from a client's responses.
+
+        Args:
+            client (WattpadClient): The client.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        client.remove_hook("parse_complete", self._on_parse)
+
+    def _on_parse(self, event):
+        for obj in event.objects:
+            self.record(obj)
+
+    def keys(self, kind: str) -> list[str]:
+        """Retrieve the objects of a kind with samples.
+
+        Args:
+            kind (str): The kind of object, a key of `SERIES`.
+
+        Raises:
+            ValueError: The kind is unknown.
+
+        Returns:
+            list[str]: The usernames or IDs of the objects, in order of their first sample.
+        """
+        return list(self._table(kind).keys.keys)
+
+    def range(
+        self,
+        kind: str,
+        key: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Series:
+        """Retrieve the samples of an object within a time range.
+
+        Example:
+        ```py
+        >>> series = store.range("story", "<id>", start=time.time() - 7 * 24 * 60 * 60)
+        >>> list(zip(series.times, series.values["read_count"]))
+        [(1718000000.0, 9120), (1718086400.0, 9480)]
+        ```
+
+        Args:
+            kind (str): The kind of object, a key of `SERIES`.
+            key (str): The username or ID of the object.
+            start (Optional[float], optional): The earliest time, as a UNIX timestamp, included. Defaults to None (the first sample).
+            end (Optional[float], optional): The latest time, as a UNIX timestamp, included. Defaults to None (the last sample).
+
+        Raises:
+            ValueError: The kind is unknown.
+
+        Returns:
+            Series: The samples, in time order. Empty if there are none.
+        """
+        table = self._table(kind)
+        with self._lock:
+            rows = table.select(key, start, end)
+            columns = table.columns
+            return Series(
+                array(_TIME, [columns["time"][row] for row in rows]),
+                {
+                    metric: array(_VALUE, [columns[metric][row] for row in rows])
+                    for metric in table.metrics
+                },
+            )
+
+    def latest(self, kind: str, key: str) -> Optional[dict[str, int]]:
+        """Retrieve the last sample of an object.
+
+        Args:
+            kind (str): The kind of object, a key of `SERIES`.
+            key (str): The username or ID of the object.
+
+        Raises:
+            ValueError: The kind is unknown.
+
+        Returns:
+            Optional[dict[str, int]]: The `time` of the sample, and the value of each counter. None if the object has no samples.
+        """
+        table = self._table(kind)
+        with self._lock:
+            id_ = table.keys.ids.get(key)
+            if id_ is None or not table.rows[id_]:
+                return None
+
+            row = table.rows[id_][-1]
+            return {
+                "time": table.columns["time"][row],
+                **{metric: table.columns[metric][row] for metric in table.metrics},
+            }
+
+    def delta(
+        self,
+        kind: str,
+        key: str,
+        metric: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Optional[int]:
+        """Calculate how much a counter of an object changed within a time range, from its first to its last sample in the range. Samples without the counter are skipped.
+
+        Args:
+            kind (str): The kind of object, a key of `SERIES`.
+            key (str): The username or ID of the object.
+            metric (str): The counter, by field name.
+            start (Optional[float], optional): The earliest time, as a UNIX timestamp, included. Defaults to None (the first sample).
+            end (Optional[float], optional): The latest time, as a UNIX timestamp, included. Defaults to None (the last sample).
+
+        Raises:
+            ValueError: The kind or counter is unknown.
+
+        Returns:
+            Optional[int]: The change. None if fewer than two samples in the range include the counter.
+        """
+        table = self._table(kind)
+        if metric not in table.metrics:
+            raise ValueError(f"Unknown counter {metric!r} for {kind}s.")
+
+        with self._lock:
+            column = table.columns[metric]
+            values = [
+                value
+                for value in map(column.__getitem__, table.select(key, start, end))
+                if value != MISSING
+            ]
+        if len(values) < 2:
+            return None
+        return values[-1] - values[0]
+
+    def iter_samples(self, kind: str) -> Iterator[tuple[str, float, dict[str, int]]]:
+        """Iterate over every sample of a kind, in the order they were appended. Samples appended after the iteration started aren't included.
+        **Note**: Samples are copied in batches while holding the store's lock, so other threads can append and flush while the caller processes them.
+
+        Args:
+            kind (str): The kind of object, a key of `SERIES`.
+
+        Raises:
+            ValueError: The kind is unknown.
+
+        Yields:
+            tuple[str, float, dict[str, int]]: The username or ID of the object, the time of the sample, and the value of each counter.
+        """
+        table = self._table(kind)
+        columns = table.columns
+        with self._lock:
+            length = len(table)
+
+        for start in range(0, length, _READ_ROWS):
+            # ! Flushing remaps columns, releasing the views being read. Rows are read under the lock, and yielded outside of it.
+            with self._lock:
+                samples = [
+                    (
+                        table.keys.keys[columns["key"][row]],
+                        columns["time"][row],
+                        {metric: columns[metric][row] for metric in table.metrics},
+                    )
+                    for row in range(start, min(start + _READ_ROWS, length))
+                ]
+            yield from samples
+
+    def stats(self) -> dict[str, int]:
+        """Count the samples and objects of each kind.
+
+        Returns:
+            dict[str, int]: The number of samples of each kind, the number of objects with samples of each kind suffixed with `_keys`, and the approximate size of the columns, as `bytes`.
+        """
+        with self._lock:
+            stats = {}
+            for kind, table in self._tables.items():
+                stats[kind] = len(table)
+                stats[f"{kind}_keys"] = len(table.keys)
+            stats["bytes"] = sum(
+                column.nbytes()
+                for table in self._tables.values()
+                for column in table.columns.values()
+            )
+            return stats
+
+    def flush(self):
+        """Write buffered samples to disk. Does nothing if the store is in memory.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        with self._lock:
+            for table in self._tables.values():
+                table.flush()
+
+    def close(self):
+        """Write buffered samples to disk, and close the store's files. Does nothing if the store is in memory.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        with self._lock:
+            for table in self._tables.values():
+                table.close()
+
+
+def _counters(obj: Any, metrics: tuple[str, ...]) -> dict[str, int]:
+    """Read the counters of an object from its data, without materializing pending raw data.
+
+    Args:
+        obj (Any): The User, Story or Part.
+        metrics (tuple[str, ...]): The counters, by field name.
+
+    Returns:
+        dict[str, int]: The counters that are set, by field name.
+    """
+    raw = obj._raw or {}
+    data = obj._data
+
+    values = {}
+    for metric in metrics:
+        value = raw.get(_ALIASES[metric])
+        if value is None and data is not None:
+            value = getattr(data, metric)
+        if value is not None:
+            values[metric] = value
+    return values
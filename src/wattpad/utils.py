@@ -10,14 +10,42 @@ You should have received a copy of the GNU General Public License along with thi
 
 Utility functions for the wattpad package."""
 
-from typing import Any, Optional
-import aiohttp
-import weakref
-from threading import Lock  # https://stackoverflow.com/a/77918570
-from os import environ
-from aiohttp_client_cache.session import CachedSession
+from __future__ import annotations
+
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+    TYPE_CHECKING,
+    cast,
+)
+import asyncio
+import codecs
+import inspect
+import json
+import os
+import re
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+from urllib.parse import urlsplit
 from pydantic import BaseModel
 
+from .registry import Registry, Retention
+
+if TYPE_CHECKING:
+    from .client import WattpadClient
+
+T = TypeVar("T")
+U = TypeVar("U")
+
 base_headers = {
     "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36 OPR/105.0.0.0"
 }
@@ -33,13 +61,38 @@ def get_fields(model: BaseModel, prefer_alias: bool = True) -> list[str]:
     Returns:
         list[str]: A list of fields.
     """
+    return list(
+        _get_fields(model if isinstance(model, type) else type(model), prefer_alias)
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_fields(model: BaseModel, prefer_alias: bool) -> tuple[str, ...]:
+    """`get_fields`, memoized per model."""
     attribs = []
     for name, field in model.model_fields.items():
         if field.alias and prefer_alias:
             attribs.append(field.alias)
         else:
             attribs.append(name)
-    return attribs
+    return tuple(attribs)
+
+
+@lru_cache(maxsize=None)
+def get_alias_map(model: BaseModel) -> dict[str, str]:
+    """Retrieve a mapping of a model's field aliases to their original names. Memoized per model, the returned dictionary must not be modified.
+
+    Args:
+        model (BaseModel): The model to derive aliases from.
+
+    Returns:
+        dict[str, str]: Aliases mapped to their original names. Fields without an alias are excluded.
+    """
+    return {
+        alias: original
+        for alias, original in zip(_get_fields(model, True), _get_fields(model, False))
+        if alias != original
+    }
 
 
 def convert_from_aliases(data: dict, model: BaseModel) -> dict:
@@ -52,25 +105,11 @@ def convert_from_aliases(data: dict, model: BaseModel) -> dict:
     Returns:
         dict: Updated dictionary with keys that are aliases replaced for their non-aliased variants.
     """
-    to_return = {}
+    alias_to_original = get_alias_map(
+        model if isinstance(model, type) else type(model)
+    )  # ! Instances are accepted too, the map is cached per class.
 
-    fields = get_fields(model)
-    fields_without_alias = get_fields(model, prefer_alias=False)
-
-    alias_to_original: dict[str, str] = {}
-
-    for alias, original in zip(fields, fields_without_alias):
-        if alias == original:
-            continue
-        alias_to_original[alias] = original
-
-    for key, value in data.items():
-        if key in alias_to_original:
-            to_return[alias_to_original[key]] = value
-        else:
-            to_return[key] = value
-
-    return to_return
+    return {alias_to_original.get(key, key): value for key, value in data.items()}
 
 
 def construct_fields(fields: dict) -> str:
@@ -111,9 +150,114 @@ def construct_fields(fields: dict) -> str:
     return fields_str
 
 
+def parse_fields(fields_str: str) -> dict:
+    """Parses a field query string into a dictionary representing the same. This is the inverse of `construct_fields`.
+
+    Example:
+    ```py
+    >>> parse_fields('tags,id,parts(id),tagRankings')
+    {'tags': True, 'id': True, 'parts': {'id': True}, 'tagRankings': True}
+    ```
+
+    Args:
+        fields_str (str): Field Query String.
+
+    Raises:
+        ValueError: The parentheses of the field query string are unbalanced.
+
+    Returns:
+        dict: Field Data.
+    """
+    root: dict = {}
+    stack: list[dict] = [root]
+    name = ""
+
+    for char in fields_str:
+        if char == ",":
+            if name:
+                stack[-1][name] = True
+            name = ""
+        elif char == "(":
+            nested: dict = {}
+            stack[-1][name] = nested
+            stack.append(nested)
+            name = ""
+        elif char == ")":
+            if len(stack) == 1:
+                raise ValueError(f"Unbalanced parentheses in {fields_str!r}.")
+            if name:
+                stack[-1][name] = True
+            stack.pop()
+            name = ""
+        else:
+            name += char
+
+    if len(stack) != 1:
+        raise ValueError(f"Unbalanced parentheses in {fields_str!r}.")
+    if name:
+        root[name] = True
+
+    return root
+
+
+def fields_cover(available: dict, requested: dict) -> bool:
+    """Check whether a response with the `available` fields contains every field of the `requested` fields.
+    **Note**: A nested field requested as True (its default sub-fields) is only covered by True, and vice versa. The API's defaults are unknown.
+
+    Args:
+        available (dict): Field Data of the response.
+        requested (dict): Field Data of the request.
+
+    Returns:
+        bool: Whether the requested fields are a subset of the available fields.
+    """
+    for key, value in requested.items():
+        if value is False:
+            continue
+
+        other = available.get(key, False)
+        if value is True:
+            if other is not True:
+                return False
+        elif type(other) is not dict or not fields_cover(other, value):
+            return False
+
+    return True
+
+
+def project_fields(data: Any, requested: dict, available: dict) -> Any:
+    """Remove the fields of a response that weren't requested. Keys that aren't fields (such as `total` or `nextUrl`) are kept.
+
+    Args:
+        data (Any): The JSON-Decoded response, retrieved with the `available` fields.
+        requested (dict): Field Data to keep. Must be covered by `available`, see `fields_cover`.
+        available (dict): Field Data the response was retrieved with.
+
+    Returns:
+        Any: The response, as if it were retrieved with the `requested` fields.
+    """
+    if type(data) is list:
+        return [project_fields(item, requested, available) for item in data]
+
+    if type(data) is not dict:
+        return data
+
+    projected = {}
+    for key, value in data.items():
+        wanted = requested.get(key, False)
+        if wanted is True:
+            projected[key] = value
+        elif type(wanted) is dict:
+            projected[key] = project_fields(value, wanted, available[key])
+        elif key not in available:
+            projected[key] = value
+
+    return projected
+
+
 def build_url(
     path: str,
-    fields: Optional[dict] = None,
+    fields: Optional[dict | str] = None,
     limit: Optional[int] = None,
     offset: Optional[int] = None,
 ) -> str:
@@ -121,7 +265,7 @@ def build_url(
 
     Args:
         path (str): The API Endpoint to request.
-        fields (Optional[dict], optional): Fields Data, processed by `construct_fields`. Defaults to None.
+        fields (Optional[dict | str], optional): Fields Data, processed by `construct_fields`, or a prebuilt field query string. Defaults to None.
         limit (Optional[int], optional): Number of records to limit the response to. Defaults to None.
         offset (Optional[int], optional): Number of records to skip before beginning the response. Defaults to None.
 
@@ -130,7 +274,7 @@ def build_url(
     """
     base_url = f"https://www.wattpad.com/api/v3/{path}?"
     if fields:
-        fields_str = construct_fields(fields)
+        fields_str = fields if type(fields) is str else construct_fields(fields)
         base_url += f"fields={fields_str}&"
 
     if limit:
@@ -144,60 +288,670 @@ def build_url(
     return url
 
 
-async def fetch_url(url: str, headers: dict = {}) -> dict | list:
+def get_endpoint(url: str) -> str:
+    """Retrieve the API Endpoint of a URL, the path following `/api/v3/`.
+
+    Example:
+    ```py
+    >>> get_endpoint("https://www.wattpad.com/api/v3/users/wattpad/followers?limit=10")
+    'users/wattpad/followers'
+    ```
+
+    Args:
+        url (str): The URL to process.
+
+    Returns:
+        str: The API Endpoint. URLs outside of the API return their full path.
+    """
+    path = urlsplit(url).path
+    _, found, endpoint = path.partition("/api/v3/")
+    if not found:
+        return path.removeprefix("/")
+    return endpoint
+
+
+async def fetch_url(
+    url: str,
+    headers: dict = {},
+    client: Optional[WattpadClient] = None,
+    revalidate: bool = False,
+) -> dict | list:
     """Perform a GET Request to the provided URL, merging the provided headers with `base_headers`.
-    **Note**: API Responses are cached using the URL as a key. Set the `WPPY_SKIP_CACHE` Environment Variable to True to bypass the cache.
+    **Note**: API Responses are cached by the client's `cache`, using the URL as a key. Set the `WPPY_SKIP_CACHE` Environment Variable to True to bypass the cache.
 
     Args:
         url (str): The URL to request.
         headers (dict, optional): Additional headers to merge atop of `base_headers`. Defaults to {}.
+        client (Optional[WattpadClient], optional): The client to perform the request with. Defaults to the client in use, see `wattpad.client.get_client`.
+        revalidate (bool, optional): Whether to check a fresh cached response with the API, using a conditional request if possible. Defaults to False.
 
     Returns:
         dict | list: The JSON-Decoded Response.
     """
-    use_headers = base_headers.copy()
-    use_headers.update(headers)
+    # ! Imported here to prevent a circular import, `client` depends on this module.
+    from .client import get_client
+
+    if client is None:
+        client = get_client()
+
+    return await client.fetch(url, headers=headers, revalidate=revalidate)
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# ! Outside of strings, only brackets and quotes change the nesting. Any other character that can't appear in JSON is raised at once.
+_STRUCTURE = re.compile(r'["{}\[\]]|[^ \t\n\r,:0-9a-z.+\-E]')
+_STRING_SPECIAL = re.compile(r'["\\\x00-\x1f]')
+_SCALAR = re.compile(r"[\w.+\-]*")
+_PARTIAL_SCALAR = re.compile(
+    r"-?(?:0|[1-9]\d*)?(?:\.\d*)?(?:[eE][+\-]?\d*)?|t(?:r(?:ue?)?)?|f(?:a(?:l(?:se?)?)?)?|n(?:u(?:ll?)?)?"
+)
+
+# ! States of `JSONItemParser`, one per token it expects next.
+_START, _MEMBERS, _NAME, _COLON, _VALUE, _AFTER_MEMBER = range(6)
+_ITEMS, _ITEM, _AFTER_ITEM, _END = range(6, 10)
+
+
+class JSONItemParser:
+    """Parse the items of a JSON array incrementally, as the bytes of the document arrive. Only the item being parsed is buffered, each item is decoded once, as soon as its last byte arrives.
+    **Note**: Invalid JSON is raised as soon as it's received, or at the latest once the value containing it ends, rather than when the document is complete.
+
+    Example:
+    ```py
+    >>> parser = JSONItemParser("users")
+    >>> parser.feed(b'{"users": [{"username": "a"}, {"user')
+    [{'username': 'a'}]
+    >>> parser.feed(b'name": "b"}], "total": 2}')
+    [{'username': 'b'}]
+    >>> parser.close(), parser.rest
+    ([], {'total': 2})
+    ```
+
+    Attributes:
+        key (Optional[str]): The key of the array in the top-level object. None if the document is the array.
+        rest (dict): The other members of the top-level object, e.g. `total` or `nextUrl`, as they're parsed.
+    """
+
+    def __init__(self, key: Optional[str] = None):
+        """Create a JSONItemParser object.
+
+        Args:
+            key (Optional[str], optional): The key of the array in the top-level object. Defaults to None (the document is the array).
+        """
+        self.key = key
+        self.rest: dict = {}
+
+        self._chunks: list[
+            str
+        ] = (
+            []
+        )  # ! The unparsed text, starting at the value being received. Joined once that value ends.
+        self._length = 0
+        self._state = _START
+        self._name: Optional[str] = None
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._decode = json.JSONDecoder().raw_decode
+
+        # ! Where the scan of an object, array or string stopped, so each chunk is scanned once.
+        self._open = False
+        self._end: Optional[int] = None
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: bytes) -> list:
+        """Parse the next chunk of the document.
+
+        Args:
+            chunk (bytes): The chunk. May end anywhere, including within a character.
+
+        Raises:
+            ValueError: The document isn't valid JSON, or isn't shaped as expected.
+
+        Returns:
+            list: The items completed by this chunk, in order.
+        """
+        return self._receive(self._decoder.decode(chunk), final=False)
+
+    def close(self) -> list:
+        """Finish parsing the document, once every chunk was fed.
+
+        Raises:
+            ValueError: The document is incomplete, or isn't valid JSON.
+
+        Returns:
+            list: The items completed by the end of the document.
+        """
+        items = self._receive(self._decoder.decode(b"", final=True), final=True)
+        if self._state != _END:
+            raise ValueError("The JSON document ended early.")
+        return items
+
+    def _receive(self, text: str, final: bool) -> list:
+        """Buffer decoded text, and parse it unless it continues a value that hasn't ended yet.
+
+        Args:
+            text (str): The decoded text.
+            final (bool): Whether the document is complete.
+
+        Raises:
+            ValueError: The document isn't valid JSON, or isn't shaped as expected.
+
+        Returns:
+            list: The items completed, in order.
+        """
+        offset = self._length
+        self._chunks.append(text)
+        self._length += len(text)
+
+        if self._open:
+            end = self._scan(text, 0)
+            if end is None:
+                if final:
+                    raise ValueError("The JSON document ended early.")
+                return (
+                    []
+                )  # ! Only the new text was scanned, the buffer is joined once the value ends.
+            self._open = False
+            self._end = offset + end
+
+        return self._advance(final)
+
+    def _scan(self, text: str, index: int) -> Optional[int]:
+        """Scan an object, array or string for its end, continuing from where the previous scan stopped.
+
+        Args:
+            text (str): The text to scan.
+            index (int): The position to start at.
+
+        Raises:
+            ValueError: The text can't be part of a valid JSON value.
+
+        Returns:
+            Optional[int]: The position after the value. None if the value continues past `text`.
+        """
+        stack = self._stack
+        in_string = self._in_string
+        if self._escaped and index < len(text):
+            index += 1  # ! The previous chunk ended within an escape sequence, `\"`.
+            self._escaped = False
+
+        while True:
+            if in_string:
+                match = _STRING_SPECIAL.search(text, index)
+                if match is None:
+                    break
+                index = match.start()
+                char = text[index]
+                if char == "\\":
+                    if index + 1 == len(text):
+                        self._escaped = True
+                        break
+                    index += 2
+                    continue
+                if char != '"':
+                    raise ValueError(
+                        f"Unescaped control character {char!r} in a JSON string."
+                    )
+                index += 1
+                in_string = False
+                if not stack:
+                    break
+            else:
+                match = _STRUCTURE.search(text, index)
+                if match is None:
+                    break
+                index = match.end()
+                char = match.group()
+                if char == '"':
+                    in_string = True
+                elif char == "{":
+                    stack.append("}")
+                elif char == "[":
+                    stack.append("]")
+                elif char in "}]":
+                    if not stack or stack.pop() != char:
+                        raise ValueError(f"Unexpected {char!r} in a JSON value.")
+                    if not stack:
+                        break
+                else:
+                    raise ValueError(f"Unexpected {char!r} in a JSON value.")
+
+        self._in_string = in_string
+        if in_string or stack or self._escaped:
+            return None
+        return index
+
+    def _value(
+        self, text: str, position: int, final: bool
+    ) -> Optional[tuple[Any, int]]:
+        """Decode the value starting at `position`, once it's complete.
+
+        Args:
+            text (str): The buffered text.
+            position (int): The start of the value.
+            final (bool): Whether the document is complete.
+
+        Raises:
+            ValueError: The value is invalid, or incomplete and the document is complete.
+
+        Returns:
+            Optional[tuple[Any, int]]: The value and the position after it. None if the value may not be complete yet.
+        """
+        if self._end is not None:
+            self._end = None  # ! Scanned to its end as it arrived, see `_receive`.
+        elif text[position] in '{["':
+            if self._scan(text, position) is None:
+                if final:
+                    raise ValueError("The JSON document ended early.")
+                self._open = True
+                return None
+        else:
+            end = _SCALAR.match(text, position).end()
+            if end == len(text) and not final:
+                if not _PARTIAL_SCALAR.fullmatch(text, position):
+                    raise ValueError(f"Invalid JSON value {text[position:]!r}.")
+                return None  # ! A number may continue in the next chunk, `12` of `123`.
+
+        return self._decode(text, position)  # ! Decoded once, the value is complete.
+
+    def _advance(self, final: bool) -> list:
+        """Consume as many tokens of the buffered text as are complete.
+
+        Args:
+            final (bool): Whether the document is complete.
+
+        Raises:
+            ValueError: The document isn't valid JSON, or isn't shaped as expected.
+
+        Returns:
+            list: The items completed, in order.
+        """
+        text = "".join(self._chunks)
+        state = self._state
+        items: list = []
+        position = 0
+
+        while True:
+            position = _WHITESPACE.match(text, position).end()
+            if position == len(text):
+                break
+            char = text[position]
+
+            if state == _START:
+                expected = "[" if self.key is None else "{"
+                if char != expected:
+                    raise ValueError(
+                        f"Expected the JSON document to start with {expected!r}, not {char!r}."
+                    )
+                position += 1
+                state = _ITEMS if self.key is None else _MEMBERS
+
+            elif state == _MEMBERS:
+                if char == "}":
+                    position += 1
+                    state = _END
+                else:
+                    state = _NAME
+
+            elif state == _NAME:
+                if char != '"':
+                    raise ValueError(f"Expected a key, not {char!r}.")
+                decoded = self._value(text, position, final)
+                if decoded is None:
+                    break
+                self._name, position = decoded
+                state = _COLON
+
+            elif state == _COLON:
+                if char != ":":
+                    raise ValueError(f"Expected ':' after a key, not {char!r}.")
+                position += 1
+                state = _VALUE
+
+            elif state == _VALUE:
+                if char == "[" and self._name == self.key:
+                    position += 1
+                    state = _ITEMS
+                    continue
+
+                decoded = self._value(text, position, final)
+                if decoded is None:
+                    break
+                value, position = decoded
+                self.rest[cast(str, self._name)] = value
+                state = _AFTER_MEMBER
+
+            elif state == _AFTER_MEMBER:
+                if char not in ",}":
+                    raise ValueError(
+                        f"Expected ',' or '}}' after a value, not {char!r}."
+                    )
+                position += 1
+                state = _NAME if char == "," else _END
+
+            elif state == _ITEMS:
+                if char == "]":
+                    position += 1
+                    state = _END if self.key is None else _AFTER_MEMBER
+                else:
+                    state = _ITEM
+
+            elif state == _ITEM:
+                decoded = self._value(text, position, final)
+                if decoded is None:
+                    break
+                item, position = decoded
+                items.append(item)
+                state = _AFTER_ITEM
+
+            elif state == _AFTER_ITEM:
+                if char not in ",]":
+                    raise ValueError(
+                        f"Expected ',' or ']' after an item, not {char!r}."
+                    )
+                position += 1
+                if char == ",":
+                    state = _ITEM
+                else:
+                    state = _END if self.key is None else _AFTER_MEMBER
+
+            else:
+                raise ValueError(f"Unexpected {char!r} after the JSON document.")
+
+        # ! Only the unparsed remainder is kept, at most the item being downloaded.
+        text = text[position:]
+        self._chunks = [text] if text else []
+        self._length = len(text)
+        self._state = state
+        return items
+
+
+async def stream_items(
+    url: str,
+    key: Optional[str] = None,
+    headers: dict = {},
+    client: Optional[WattpadClient] = None,
+    chunk_size: int = 64 * 1024,
+) -> AsyncIterator[Any]:
+    """Perform a GET Request to the provided URL, yielding the items of a JSON array in the response as they download, rather than once the whole response is decoded. See `JSONItemParser`.
+    **Note**: Cached responses are parsed from the cache. Streamed responses aren't cached or coalesced, see `WattpadClient.stream`.
+
+    Example:
+    ```py
+    >>> async for user in stream_items(url, "users"):
+    ...     print(user["username"])
+    ```
+
+    Args:
+        url (str): The URL to request.
+        key (Optional[str], optional): The key of the array in the response. Defaults to None (the response is the array).
+        headers (dict, optional): Additional headers for this request. Defaults to {}.
+        client (Optional[WattpadClient], optional): The client to perform the request with. Defaults to the client in use, see `wattpad.client.get_client`.
+        chunk_size (int, optional): Maximum size of each chunk parsed at once, in bytes. Defaults to 64 KiB.
+
+    Raises:
+        ValueError: The response isn't valid JSON, or isn't shaped as expected.
 
-    if environ.get("WPPY_SKIP_CACHE", False):
-        session = aiohttp.ClientSession
+    Yields:
+        Any: Each item of the array, decoded.
+    """
+    # ! Imported here to prevent a circular import, `client` depends on this module.
+    from .client import get_client
+
+    if client is None:
+        client = get_client()
+
+    parser = JSONItemParser(key)
+    cache = None if os.environ.get("WPPY_SKIP_CACHE", False) else client.cache
+    body = cache.get(url) if cache is not None else None
+
+    if body is not None:
+        client.emit("cache_hit", url)
+        for start in range(0, len(body), chunk_size):
+            for item in parser.feed(body[start : start + chunk_size]):
+                yield item
     else:
-        session = CachedSession
+        if cache is not None:
+            client.emit("cache_miss", url)
+
+        chunks = cast(
+            AsyncGenerator[bytes, None], client.stream(url, headers, chunk_size)
+        )
+        try:
+            async for chunk in chunks:
+                for item in parser.feed(chunk):
+                    yield item
+        finally:
+            await chunks.aclose()  # ! Releases the connection if the caller stops early.
+
+    for item in parser.close():
+        yield item
+
+
+async def paginate(
+    fetch_page: Callable[[int, int], Awaitable[list[T]]],
+    page_size: int = 100,
+    prefetch: int = 1,
+    offset: int = 0,
+) -> AsyncIterator[T]:
+    """Iterate over a paginated endpoint, requesting up to `prefetch` pages ahead of the page being processed. Iteration stops at the first page with fewer than `page_size` records.
+
+    Args:
+        fetch_page (Callable[[int, int], Awaitable[list[T]]]): Called with the limit and offset of a page, returns the records of that page.
+        page_size (int, optional): Number of records to request per page. Defaults to 100.
+        prefetch (int, optional): Number of pages to request ahead of the page being processed. Defaults to 1.
+        offset (int, optional): Number of records to skip before the first page. Defaults to 0.
+
+    Yields:
+        T: The records of each page, in order.
+    """
+    pending: deque[asyncio.Future[list[T]]] = deque()
+    next_offset = offset
+
+    def schedule():
+        nonlocal next_offset
+        pending.append(asyncio.ensure_future(fetch_page(page_size, next_offset)))
+        next_offset += page_size
+
+    try:
+        for _ in range(prefetch + 1):
+            schedule()
+
+        while pending:
+            page = await pending.popleft()
+            if len(page) < page_size:
+                for record in page:
+                    yield record
+                break
+
+            schedule()  # ! Scheduled before yielding, so the next page downloads while the caller processes this one.
+            for record in page:
+                yield record
+    finally:
+        for future in pending:
+            future.cancel()
+        await asyncio.gather(
+            *pending, return_exceptions=True
+        )  # ! Pages requested beyond the last page are discarded.
+
+
+async def paginate_stream(
+    stream_page: Callable[[int, int], AsyncIterator[T]],
+    page_size: int = 100,
+    offset: int = 0,
+) -> AsyncIterator[T]:
+    """Iterate over a paginated endpoint one page at a time, yielding each record as its page streams in, see `stream_items`. Iteration stops at the first page with fewer than `page_size` records.
+    **Note**: Pages aren't requested ahead, as with `paginate`. Processing already overlaps the download of the page.
+
+    Args:
+        stream_page (Callable[[int, int], AsyncIterator[T]]): Called with the limit and offset of a page, yields the records of that page.
+        page_size (int, optional): Number of records to request per page. Defaults to 100.
+        offset (int, optional): Number of records to skip before the first page. Defaults to 0.
+
+    Yields:
+        T: The records of each page, in order.
+    """
+    while True:
+        count = 0
+        page = stream_page(page_size, offset)
+        try:
+            async for record in page:
+                count += 1
+                yield record
+        finally:
+            close = getattr(page, "aclose", None)
+            if close is not None:
+                await close()  # ! Releases the page's connection if the caller stops early.
+
+        if count < page_size:
+            return
+        offset += page_size
+
+
+async def map_ordered(
+    func: Callable[[T], Awaitable[U]], items: Iterable[T], concurrency: int = 8
+) -> AsyncIterator[U]:
+    """Apply a coroutine function to each item, running up to `concurrency` calls at once, and yield the results in the order of `items`. A result is yielded as soon as every result before it is available.
+
+    Args:
+        func (Callable[[T], Awaitable[U]]): The coroutine function to call with each item.
+        items (Iterable[T]): The items. Consumed lazily, as calls complete.
+        concurrency (int, optional): Maximum number of calls in flight, including completed calls whose results are waiting on an earlier call. Defaults to 8.
+
+    Yields:
+        U: The result of each call, in order.
+    """
+    iterator = iter(items)
+    pending: deque[asyncio.Future[U]] = deque()
+
+    def schedule():
+        for item in islice(iterator, concurrency - len(pending)):
+            pending.append(asyncio.ensure_future(func(item)))
+
+    try:
+        schedule()
+        while pending:
+            result = await pending.popleft()
+            schedule()  # ! Refilled before yielding, so calls progress while the caller processes this result.
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def map_unordered(
+    func: Callable[[T], Awaitable[U]], items: Iterable[T], concurrency: int = 10
+) -> AsyncIterator[U]:
+    """Apply a coroutine function to each item, running up to `concurrency` calls at once, and yield the results as they complete.
 
-    async with session(headers=use_headers) as session:
-        async with session.get(url) as response:
-            response.raise_for_status()
-            return await response.json()
+    Args:
+        func (Callable[[T], Awaitable[U]]): The coroutine function to call with each item. Exceptions it raises abort the iteration.
+        items (Iterable[T]): The items. Consumed lazily, as calls complete.
+        concurrency (int, optional): Maximum number of calls in flight. Defaults to 10.
+
+    Yields:
+        U: The result of each call, in order of completion.
+    """
+    iterator = iter(items)
+    results: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue(
+        maxsize=concurrency
+    )  # ! Bounded, so workers stop pulling items while the caller is busy.
+
+    async def worker():
+        # ! Only a worker that stops on its own reports it. One cancelled as the iteration stops mustn't wait on a queue nothing reads.
+        try:
+            # ! The iterator is shared between workers, each item is processed once.
+            for item in iterator:
+                await results.put((True, await func(item)))
+        except Exception as error:
+            await results.put((False, error))
+        else:
+            await results.put((False, None))
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        remaining = len(workers)
+        while remaining:
+            has_result, result = await results.get()
+            if not has_result:
+                if result is not None:
+                    raise result
+                remaining -= 1
+                continue
+            yield result
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+@contextmanager
+def atomic_path(path: str) -> Iterator[str]:
+    """Write to a temporary file, and move it to `path` if no exception is raised. A failed write doesn't leave a partial file behind, and readers never see one.
+
+    Example:
+    ```py
+    >>> with atomic_path("story.txt") as temporary, open(temporary, "w") as file:
+    ...     file.write(text)
+    ```
+
+    Args:
+        path (str): The final path of the file.
+
+    Yields:
+        str: The temporary path to write to.
+    """
+    temporary = f"{path}.part"
+    try:
+        yield temporary
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
 
 
-def create_singleton() -> Any:
-    """Make a class a singleton using the first argument as the key.
+def create_singleton(retention: Optional[Retention] = None) -> Any:
+    """Make a class a singleton using the first argument as the key. Objects are looked up in the class's `registry`, see `wattpad.registry`.
 
     Thanks https://medium.com/@pavankumarmasters/exploring-the-singleton-design-pattern-in-python-a34efa5e8cfa#:~:text=Code%20Magic%3A%20Conjuring%20Singletons%20with%20Metaclasses.
 
+    Args:
+        retention (Optional[Retention], optional): The retention policy of the registry. Defaults to `WeakRetention`, objects are garbage collected once they're no longer referenced.
+
     Returns:
         SingletonMeta: The Singleton metaclass.
     """
 
     class SingletonMeta(type):
-        _instances = (
-            weakref.WeakValueDictionary()
-        )  # Thanks to https://stackoverflow.com/a/77918570
-        # ! This is to prevent memory leaking. Python objects are only GC'd when their reference count hits zero. Due the reference from the singleton dict, the RC will be 1 at minimum, when no user-facing code is interfacing with it. To prevent this, the WeakValueDictionary is used. It's values don't count their presence in this dict as a reference, and hence, there's no interference with garbage collection.  |  Thanks to ChatGPT for giving me the idea of looking into the weakref package.
-        LOCK = Lock()
+        registry = Registry(retention)  # Thanks to https://stackoverflow.com/a/77918570
+        # ! Objects are tracked with weak references, to prevent memory leaking. Python objects are only GC'd when their reference count hits zero, a plain dict would keep every object alive. The retention policy decides which objects are kept alive regardless.  |  Thanks to ChatGPT for giving me the idea of looking into the weakref package.
+
+        def __init__(cls, name, bases, namespace):
+            super().__init__(name, bases, namespace)
+            # ! The first parameter after `self`, e.g. `username`, whether it's passed positionally or as a keyword.
+            cls._singleton_key = list(inspect.signature(cls.__init__).parameters)[1]
 
         def __call__(cls, *args, **kwargs):
-            with cls.LOCK:  # To prevent cases where two threads see a missing entry and both threads try to populate it. | https://stackoverflow.com/questions/77918487/python-magic-method-for-when-the-objects-reference-count-changes#comment137367057_77918570
-                if args:
-                    key: str = args[0].lower()
-                else:
-                    if "username" in kwargs:
-                        key: str = kwargs["username"]
-                    else:
-                        key: str = kwargs["id"]
-
-                if key not in cls._instances:
-                    new = super(SingletonMeta, cls).__call__(*args, **kwargs)
-                    cls._instances[key] = new
-                return cls._instances[key]
+            if args:
+                key = args[0]
+            elif cls._singleton_key in kwargs:
+                key = kwargs[cls._singleton_key]
+            else:
+                raise TypeError(
+                    f"{cls.__name__}() missing required argument: '{cls._singleton_key}'"
+                )
+            # ! Normalized, `User("X")`, `User(username="x")` and `List(1)`, `List(id="1")` are the same objects.
+            key = str(key).lower()
+
+            registry = cls.registry
+            obj = registry.get(
+                key
+            )  # ! Lock-free, most lookups are of existing objects.
+            if obj is None:
+                obj = registry.create(
+                    key, lambda: super(SingletonMeta, cls).__call__(*args, **kwargs)
+                )
+            return obj
 
     return SingletonMeta
@@ -0,0 +1,439 @@
+"""Copyright (C) 2024 TheOnlyWayUp
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program. If not, see https://www.gnu.org/licenses/.
+
+---
+
+Watch many Stories for new parts. Each Story is polled on its own schedule, more often while it's updated often and less often while it's quiet, and only the fields that reveal a change are requested.
+
+>>> watcher = Watcher(story_ids, min_interval=5 * 60, max_interval=24 * 60 * 60)
+>>> async for change in watcher.watch():
+...     print(change.story, "has", change.new_parts, "new parts")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from typing import AsyncIterator, Iterable, NamedTuple, Optional, cast
+
+from .client import WattpadClient, get_client
+from .fields import FieldSpec
+from .model_types import StoryModelFieldsType
+from .utils import build_url, fetch_url
+from .wattpad import _STORY_VERSION, Story, _invalidate, _validation
+
+
+def _version(data: dict) -> dict:
+    """Extract the fields compared to detect a change, see `_STORY_VERSION`. Fields missing from the data are left out.
+
+    Args:
+        data (dict): Aliased Story Data.
+
+    Returns:
+        dict: The `modifyDate`, `numParts`, and `lastPublishedPart` ID and date of the Story, of those in the data.
+    """
+    version = {key: data[key] for key in ("modifyDate", "numParts") if key in data}
+    if "lastPublishedPart" in data:
+        last = data["lastPublishedPart"]
+        version["lastPublishedPart"] = (
+            {key: last[key] for key in ("id", "createDate") if key in last}
+            if isinstance(last, dict)
+            else last
+        )
+    return version
+
+
+def _changed(previous: dict, current: dict) -> bool:
+    """Compare two versions of a Story. Only fields present in both are compared, a Story may not have been fetched with every field.
+
+    Args:
+        previous (dict): The previous version, see `_version`.
+        current (dict): The current version.
+
+    Returns:
+        bool: Whether any of the fields differ.
+    """
+    for key in previous.keys() & current.keys():
+        before, after = previous[key], current[key]
+        if isinstance(before, dict) and isinstance(after, dict):
+            if _changed(before, after):
+                return True
+        elif before != after:
+            return True
+    return False
+
+
+class StoryChange(NamedTuple):
+    """A change detected by a `Watcher`.
+
+    Attributes:
+        story (Story): The Story that changed.
+        previous (dict): The `modifyDate`, `numParts` and `lastPublishedPart` of the Story at the previous poll, of those it had.
+        current (dict): The `modifyDate`, `numParts` and `lastPublishedPart` of the Story now.
+        detected_at (float): When the change was detected, as a UNIX timestamp.
+    """
+
+    story: Story
+    previous: dict
+    current: dict
+    detected_at: float
+
+    @property
+    def new_parts(self) -> int:
+        """The number of parts published since the previous poll. 0 if parts were only edited, or unpublished."""
+        return max(
+            (self.current.get("numParts") or 0) - (self.previous.get("numParts") or 0),
+            0,
+        )
+
+
+class _WatchState:
+    """The schedule and history of a watched Story."""
+
+    __slots__ = (
+        "interval",
+        "sequence",
+        "version",
+        "changed_at",
+        "period",
+        "polls",
+        "changes",
+    )
+
+    def __init__(self, interval: float, version: Optional[dict]):
+        self.interval = interval
+        # ! Of the Story's entry in the schedule. Older entries are stale.
+        self.sequence = 0
+        self.version = version
+        self.changed_at: Optional[float] = None
+        self.period: Optional[float] = None
+        self.polls = 0
+        self.changes = 0
+
+
+class Watcher:
+    """Polls Stories for changes, each on its own adaptive schedule.
+
+    A Story's interval shrinks when it changes, towards `1 / polls_per_change` of the average time between its changes, and grows by `backoff` with every poll that finds no change. Intervals are kept between `min_interval` and `max_interval`, and each poll is jittered so Stories added together drift apart.
+    **Note**: A Story's first poll records its version. Changes are detected from then on, unless the Story already had data, which then serves as the first version. Only the fields that data has are compared on the first poll.
+
+    Attributes:
+        min_interval (float): Minimum seconds between polls of a Story.
+        max_interval (float): Maximum seconds between polls of a Story.
+        interval (float): Seconds between the first polls of a Story, before it's adapted.
+        backoff (float): Factor a Story's interval grows by after each poll without a change, or that failed.
+        polls_per_change (float): Number of polls aimed for between a Story's changes.
+        jitter (float): Fraction of a Story's interval its polls are randomly moved by, earlier or later.
+        concurrency (int): Maximum number of polls at once.
+        include (bool | StoryModelFieldsType | FieldSpec): Fields to fetch of a Story that changed. False doesn't fetch it.
+        stories (dict[str, Story]): The watched Stories, by ID. Holds the Stories, so they aren't garbage collected while they're watched.
+        failed (dict[str, str]): IDs of Stories whose last poll failed, mapped to the error.
+    """
+
+    def __init__(
+        self,
+        stories: Iterable[Story | str] = (),
+        min_interval: float = 5 * 60,
+        max_interval: float = 24 * 60 * 60,
+        interval: float = 60 * 60,
+        backoff: float = 1.5,
+        polls_per_change: float = 4,
+        jitter: float = 0.1,
+        concurrency: int = 8,
+        include: bool | StoryModelFieldsType | FieldSpec = False,
+        client: Optional[WattpadClient] = None,
+    ):
+        """Create a Watcher object. Nothing is polled until `watch` is called.
+
+        Args:
+            stories (Iterable[Story | str], optional): Stories, or their IDs, to watch. Defaults to ().
+            min_interval (float, optional): Minimum seconds between polls of a Story. First polls are spread over this many seconds. Defaults to 5 minutes.
+            max_interval (float, optional): Maximum seconds between polls of a Story. Defaults to 24 hours.
+            interval (float, optional): Seconds between the first polls of a Story, before it's adapted. Defaults to 1 hour.
+            backoff (float, optional): Factor a Story's interval grows by after each poll without a change. Defaults to 1.5.
+            polls_per_change (float, optional): Number of polls aimed for between a Story's changes. Defaults to 4.
+            jitter (float, optional): Fraction of a Story's interval its polls are randomly moved by. Defaults to 0.1.
+            concurrency (int, optional): Maximum number of polls at once. Defaults to 8.
+            include (bool | StoryModelFieldsType | FieldSpec, optional): Fields to fetch of a Story that changed, before its change is yielded. True fetches all fields. Defaults to False (only the fields that detect changes are fetched).
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = interval
+        self.backoff = backoff
+        self.polls_per_change = polls_per_change
+        self.jitter = jitter
+        self.concurrency = concurrency
+        self.include = include
+        self.client = client
+
+        self.stories: dict[str, Story] = {}
+        self.failed: dict[str, str] = {}
+
+        # ! A heap of (next poll, sequence, story ID), by `time.monotonic()`.
+        self._schedule: list[tuple[float, int, str]] = []
+        self._states: dict[str, _WatchState] = {}
+        self._sequence = itertools.count(1)
+        self._wakeup: Optional[asyncio.Event] = None
+
+        for story in stories:
+            self.add(story)
+
+    def __repr__(self) -> str:
+        return f"<Watcher stories={len(self.stories)}>"
+
+    def __len__(self) -> int:
+        return len(self.stories)
+
+    def __contains__(self, story: object) -> bool:
+        key = story.id if isinstance(story, Story) else str(story).lower()
+        return key in self.stories
+
+    def add(self, story: Story | str, interval: Optional[float] = None):
+        """Watch a Story. It's first polled within `min_interval` seconds. Stories already watched are rescheduled.
+
+        Args:
+            story (Story | str): The Story, or its ID.
+            interval (Optional[float], optional): Seconds between the first polls of the Story. Defaults to None (`interval`).
+
+        Returns:
+            None: Nothing is returned.
+        """
+        if not isinstance(story, Story):
+            story = Story(str(story))
+
+        data = story._dump_data()
+        version = (
+            _version(data) if data else None
+        )  # ! Compared by the fields it has, see `_changed`.
+
+        self.stories[story.id] = story
+        self._states[story.id] = _WatchState(
+            interval if interval is not None else self.interval, version
+        )
+        self._push(story.id, random.uniform(0, self.min_interval))
+
+    def remove(self, story: Story | str):
+        """Stop watching a Story. Its scheduled poll is skipped.
+
+        Args:
+            story (Story | str): The Story, or its ID.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        key = story.id if isinstance(story, Story) else str(story).lower()
+        self.stories.pop(key, None)
+        self._states.pop(key, None)
+        self.failed.pop(key, None)
+
+    def _push(self, key: str, delay: float):
+        """Schedule the next poll of a Story, replacing its scheduled poll.
+
+        Args:
+            key (str): The ID of the Story.
+            delay (float): Seconds until the poll.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        state = self._states[key]
+        state.sequence = next(self._sequence)
+        heapq.heappush(self._schedule, (time.monotonic() + delay, state.sequence, key))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _reschedule(self, key: str, interval: float):
+        """Set a Story's interval, and schedule its next poll a jittered interval from now.
+
+        Args:
+            key (str): The ID of the Story.
+            interval (float): The interval, before it's clamped.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        state = self._states.get(key)
+        if state is None:
+            return  # ! Removed while it was polled.
+
+        state.interval = min(max(interval, self.min_interval), self.max_interval)
+        self._push(
+            key, state.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+        )
+
+    async def _next(self) -> str:
+        """Wait until a Story is due, and remove it from the schedule.
+
+        Returns:
+            str: The ID of the Story.
+        """
+        assert self._wakeup is not None
+        schedule = self._schedule
+
+        while True:
+            while schedule and (
+                schedule[0][2] not in self._states
+                or self._states[schedule[0][2]].sequence != schedule[0][1]
+            ):
+                # ! Stale, the Story was removed or rescheduled.
+                heapq.heappop(schedule)
+
+            timeout = None
+            if schedule:
+                timeout = schedule[0][0] - time.monotonic()
+                if timeout <= 0:
+                    return heapq.heappop(schedule)[2]
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def poll(self, story: Story | str) -> Optional[StoryChange]:
+        """Poll a watched Story now, and schedule its next poll.
+
+        Args:
+            story (Story | str): The Story, or its ID.
+
+        Raises:
+            KeyError: The Story isn't watched.
+
+        Returns:
+            Optional[StoryChange]: The change. None if the Story didn't change, or this is its first poll.
+        """
+        key = story.id if isinstance(story, Story) else str(story).lower()
+        story, state = self.stories[key], self._states[key]
+        client = self.client or get_client()
+
+        url = build_url(f"stories/{key}", fields=_STORY_VERSION.query)
+        try:
+            data = cast(dict, await fetch_url(url, client=client, revalidate=True))
+        except Exception as error:
+            self.failed[key] = repr(error)
+            self._reschedule(key, state.interval * self.backoff)
+            raise
+
+        self.failed.pop(key, None)
+        state.polls += 1
+        current = _version(data)
+        previous, state.version = state.version, current
+
+        if not previous or not _changed(previous, current):
+            self._reschedule(key, state.interval * self.backoff)
+            return None
+
+        now = time.time()
+        if state.changed_at is not None:
+            gap = now - state.changed_at
+            state.period = gap if state.period is None else (state.period + gap) / 2
+        state.changed_at = now
+        state.changes += 1
+
+        if state.period is not None:
+            self._reschedule(key, state.period / self.polls_per_change)
+        else:
+            self._reschedule(key, state.interval / 2)
+
+        story._load_data(
+            {name: value for name, value in data.items() if name != "id"},
+            _validation(client),
+        )
+        if self.include is not False:
+            _invalidate(client, f"stories/{key}", url)
+            await story.fetch(self.include, client=client)
+
+        return StoryChange(story, previous, current, now)
+
+    async def watch(self) -> AsyncIterator[StoryChange]:
+        """Poll Stories as they're due, until the caller stops iterating. Stories can be added and removed while watching. Polls that fail are recorded in `failed`, and retried after a longer interval.
+
+        Example:
+        ```py
+        >>> async for change in watcher.watch():
+        ...     if change.new_parts:
+        ...         await notify(change.story)
+        ```
+
+        Yields:
+            StoryChange: Each change, in order of detection.
+        """
+        self._wakeup = asyncio.Event()
+        slots = asyncio.Semaphore(self.concurrency)
+        changes: asyncio.Queue[StoryChange] = asyncio.Queue(
+            maxsize=self.concurrency
+        )  # ! Bounded, so polling pauses while the caller is busy.
+        polls: set[asyncio.Task] = set()
+
+        async def run(key: str):
+            # ! The slot is held until the change is queued, so polling stops while the caller is busy.
+            try:
+                change = await self.poll(key)
+                if change is not None:
+                    await changes.put(change)
+            except Exception:
+                pass  # ! Recorded in `failed` by `poll`.
+            finally:
+                slots.release()
+
+        async def schedule():
+            while True:
+                await slots.acquire()
+                key = await self._next()
+                if key not in self.stories:
+                    slots.release()
+                    continue
+                task = asyncio.ensure_future(run(key))
+                polls.add(task)
+                task.add_done_callback(polls.discard)
+
+        scheduler = asyncio.ensure_future(schedule())
+        get: Optional[asyncio.Future] = None
+        try:
+            while True:
+                get = asyncio.ensure_future(changes.get())
+                await asyncio.wait(
+                    {get, scheduler}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not get.done():
+                    get.cancel()
+                    scheduler.result()  # ! Re-raises the exception of the scheduler.
+                yield get.result()
+        finally:
+            if get is not None:
+                get.cancel()
+            scheduler.cancel()
+            for task in list(polls):
+                task.cancel()
+            await asyncio.gather(scheduler, *polls, return_exceptions=True)
+            self._wakeup = None
+
+    def stats(self) -> dict[str, int]:
+        """Count the watched Stories, and the outcomes of polls.
+
+        Returns:
+            dict[str, int]: The number of `watched` Stories, Stories `due` to be polled, successful `polls`, `changes` detected, and Stories whose last poll `failed`.
+        """
+        now = time.monotonic()
+        return {
+            "watched": len(self.stories),
+            "due": sum(
+                1
+                for due, sequence, key in self._schedule
+                if due <= now
+                and key in self._states
+                and self._states[key].sequence == sequence
+            ),
+            "polls": sum(state.polls for state in self._states.values()),
+            "changes": sum(state.changes for state in self._states.values()),
+            "failed": len(self.failed),
+        }
@@ -8,7 +8,7 @@ You should have received a copy of the GNU General Public License along with thi
 
 ---
 
-The main module for the wattpad package. This contains the User, Story, and List classes.
+The main module for the wattpad package. This contains the User, Story, Part, and List classes.
 
 >>> u = User("<username>")
 >>> await u.fetch()
@@ -18,36 +18,290 @@ Use `help(User)` for information. Refer to the documentation for more.
 """
 
 from __future__ import annotations
-from typing import Optional, cast
+import asyncio
+import codecs
+import time
+from collections import deque
+from itertools import islice
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    MutableSet,
+    NamedTuple,
+    Optional,
+    Type,
+    TypeVar,
+    cast,
+)
+from pydantic import BaseModel
 from .models import (
     ListModel,
+    PartModel,
     StoryModel,
     UserModel,
 )
 from .model_types import ListModelFieldsType, UserModelFieldsType, StoryModelFieldsType
+from .client import WattpadClient, get_client
+from .fields import FieldSpec, construct_model, merge_model
+from .graph import get_graph_store
 from .utils import (
-    get_fields,
-    convert_from_aliases,
     build_url,
     fetch_url,
-    construct_fields,
     create_singleton,
+    map_unordered,
+    paginate,
+    paginate_stream,
+    stream_items,
+)
+
+T = TypeVar("T")
+
+_USER_VERSION = FieldSpec.compile(UserModel, {"modifyDate": True})
+_STORY_PARTS = FieldSpec.compile(
+    StoryModel, {"parts": {"id": True, "title": True, "url": True}}
 )
+_STORY_VERSION = FieldSpec.compile(
+    StoryModel,
+    {
+        "modifyDate": True,
+        "numParts": True,
+        "lastPublishedPart": {"id": True, "createDate": True},
+    },
+)  # ! The fields `refresh` compares to detect changes. Publishing a part doesn't always update modifyDate.
+# ! Chunks of a Part's text buffered ahead of the reader, see `Story.iter_part_texts`.
+_TEXT_BUFFER = 4
+
+
+def _invalidate(client: WattpadClient, endpoint: str, keep: str):
+    """Remove the cached responses of a changed User or Story, so they're fetched anew. The response to the `refresh` check is kept, alongside its validators.
+
+    Args:
+        client (WattpadClient): The client whose cache is invalidated.
+        endpoint (str): The endpoint of the User or Story.
+        keep (str): The URL of the `refresh` check, which is up to date.
+
+    Returns:
+        None: Nothing is returned.
+    """
+    cache = client.cache
+    if cache is None:
+        return
+
+    entry = cache.get_entry(keep)
+    cache.invalidate(endpoint)
+    if entry is not None:
+        cache.set(keep, entry.body, etag=entry.etag, last_modified=entry.last_modified)
+
+
+def _validation(client: Optional[WattpadClient]) -> str:
+    """Retrieve the validation mode of a client, see `WattpadClient.validation`.
+
+    Args:
+        client (Optional[WattpadClient]): The client. Defaults to the client in use.
+
+    Returns:
+        str: The validation mode.
+    """
+    return (client or get_client()).validation
+
+
+def _parsed(
+    client: Optional[WattpadClient], url: str, started: float, objects: Iterable
+):
+    """Emit the `parse_complete` event of a response, see `WattpadClient.add_hook`.
+
+    Args:
+        client (Optional[WattpadClient]): The client the response was requested with. Defaults to the client in use.
+        url (str): The requested URL.
+        started (float): `time.perf_counter()` once the response was decoded.
+        objects (Iterable): The objects parsed from the response.
+
+    Returns:
+        None: Nothing is returned.
+    """
+    (client or get_client()).emit(
+        "parse_complete",
+        url,
+        elapsed=time.perf_counter() - started,
+        objects=tuple(objects),
+    )
+
+
+async def _stream_page(
+    client: Optional[WattpadClient],
+    url: str,
+    key: Optional[str],
+    parse: Callable[[dict, str], T],
+) -> AsyncIterator[T]:
+    """Stream a page of an array endpoint, parsing each item into an object as it downloads, see `wattpad.utils.stream_items`. Emits `parse_complete` once the page is parsed.
+
+    Args:
+        client (Optional[WattpadClient]): The client to perform the request with. Defaults to the client in use.
+        url (str): The URL of the page.
+        key (Optional[str]): The key of the array in the response. None if the response is the array.
+        parse (Callable[[dict, str], T]): Called with each item and the validation mode, returns its object.
+
+    Yields:
+        T: The object of each item, in order.
+    """
+    validation = _validation(client)
+    objects: list[T] = []
+    parsing = 0.0
+
+    items = cast(AsyncGenerator[dict, None], stream_items(url, key, client=client))
+    try:
+        async for item in items:
+            started = time.perf_counter()
+            objects.append(parse(item, validation))
+            parsing += time.perf_counter() - started
+            yield objects[-1]
+    finally:
+        await items.aclose()
+
+    # ! Shifted, so the event's `elapsed` is the time spent parsing rather than downloading.
+    _parsed(client, url, time.perf_counter() - parsing, objects)
+
+
+class _Materialized:
+    """Base class of objects holding API Data. The data may be kept as raw, aliased dictionaries until `data` is first accessed, see `WattpadClient.validation`."""
 
+    _model: Type[BaseModel]
+    _key: str  # ! The attribute holding the object's key, which is also the name of the model field.
 
-class User(metaclass=create_singleton()):
+    _data: Optional[BaseModel]
+    _raw: Optional[dict]
+    _trusted: bool
+
+    def _init_data(self, **kwargs):
+        """Set up the data of a new object. Keyword arguments are validated immediately.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        self._data = None
+        self._raw = None
+        self._trusted = False
+
+        if kwargs:
+            self.data = self._model(**{self._key: getattr(self, self._key), **kwargs})
+        else:
+            self._raw = {}
+
+    @property
+    def data(self):
+        """The API Data of this object. Pending raw data is turned into a model on access."""
+        if self._raw is not None:
+            self._materialize()
+        return self._data
+
+    @data.setter
+    def data(self, value: BaseModel):
+        self._data = value
+        self._raw = None
+
+    def _materialize(self):
+        """Turn pending raw data into a model, merged atop of the current model if there is one.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        raw, self._raw = self._raw, None
+        values = {self._key: getattr(self, self._key), **raw}
+
+        if self._trusted:
+            model = construct_model(self._model, values)
+        else:
+            model = self._model.model_validate(values)
+
+        if self._data is not None:
+            model = self._data.model_copy(
+                update={name: getattr(model, name) for name in model.model_fields_set}
+            )  # ! Only fields present in the raw data replace the current ones.
+        self._data = model
+        self._resized()
+
+    def _resized(self):
+        """Have this object's registry measure it again, once its data changed. See `wattpad.registry.Retention.resize`.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        type(self).registry.resize(str(getattr(self, self._key)).lower(), self)
+
+    def _load_data(self, raw: dict, validation: str, replace: bool = False):
+        """Store API Data, as per the validation mode.
+
+        Args:
+            raw (dict): The aliased API Data.
+            validation (str): The validation mode, see `WattpadClient.validation`.
+            replace (bool, optional): Whether the data replaces the current data, rather than being merged into it. Defaults to False.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        if validation == "eager":
+            if replace:
+                self.data = self._model(**{self._key: getattr(self, self._key), **raw})
+            else:
+                self._update_data(**raw)
+            self._resized()
+            return
+
+        trusted = validation == "trusted"
+        if replace:
+            self._data = None
+            self._raw = None
+
+        if not self._raw:
+            self._raw = dict(raw)
+            self._trusted = trusted
+        else:
+            self._raw.update(raw)
+            self._trusted = (
+                self._trusted and trusted
+            )  # ! Validated if any of the pending data isn't trusted.
+        self._resized()
+
+    def _dump_data(self) -> Optional[dict]:
+        """Retrieve the API Data of this object as an aliased dictionary, the inverse of `_load_data`. Pending raw data that was never materialized is returned as-is.
+
+        Returns:
+            Optional[dict]: The aliased API Data, without the object's key. None if no data was loaded.
+        """
+        if self._data is None:
+            return {**self._raw} if self._raw else None
+
+        data = self.data.model_dump(mode="json", by_alias=True, exclude_unset=True)
+        data.pop(self._key, None)
+        return data
+
+    def _update_data(self, **kwargs) -> set[str]:
+        """Updates self.data in place with kwargs, overwriting any duplicate values with a preference towards kwargs. Nested dictionaries are merged into nested models, see `wattpad.fields.merge_model`.
+
+        Returns:
+            set[str]: The names of the fields that changed.
+        """
+        return merge_model(self.data, kwargs)
+
+
+class User(_Materialized, metaclass=create_singleton()):
     """A representation of a User on Wattpad.
     **Note**: Users are singletons, unique as per their username. Two user classes with the same username are the _same_.
 
     Attributes:
         username (str): Lowercased username of this User.
         stories (list[Story]): Stories authored by this User.
-        followers (list[User]): Users that follow this User.
-        following (list[User]): Users this User follows.
+        followers (MutableSet[User]): Users that follow this User. A view over the graph store if one is installed, see `wattpad.graph`.
+        following (MutableSet[User]): Users this User follows. A view over the graph store if one is installed.
         lists (set[List]): Lists created by this User.
         data (UserModel): User Data from the Wattpad API.
     """
 
+    _model = UserModel
+    _key = "username"
+
     def __init__(self, username: str, **kwargs):
         """Create a User object.
 
@@ -57,79 +311,108 @@ class User(metaclass=create_singleton()):
         """
         self.username = username.lower()
         self.stories: list[Story] = []
-        self.followers: set[User] = set()
-        self.following: set[User] = set()
+
+        store = get_graph_store()
+        self.followers: MutableSet[User] = (
+            store.followers(self.username) if store else set()
+        )
+        self.following: MutableSet[User] = (
+            store.following(self.username) if store else set()
+        )
         self.lists: set[List] = set()
 
-        self.data = UserModel(username=self.username, **kwargs)
+        self._init_data(**kwargs)
 
     def __repr__(self) -> str:
         return f"<User username={self.username}>"
 
-    async def fetch(self, include: bool | UserModelFieldsType = False) -> dict:
+    async def fetch(
+        self,
+        include: bool | UserModelFieldsType | FieldSpec = False,
+        client: Optional[WattpadClient] = None,
+    ) -> dict:
         """Populates a User's data. Call this method after instantiation.
 
         Args:
-            include (bool | UserModelFieldsType, optional): Fields to fetch. True fetches all fields. Defaults to False.
+            include (bool | UserModelFieldsType | FieldSpec, optional): Fields to fetch. True fetches all fields. Defaults to False.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Raises:
+            ValueError: `include` requests a field that doesn't exist, or is a FieldSpec of another model.
 
         Returns:
             dict: The raw API Response.
         """
-        if include is False:
-            include_fields: UserModelFieldsType = {}
-        elif include is True:
-            include_fields: UserModelFieldsType = {
-                key: True for key in get_fields(UserModel)  # type: ignore
-            }
-        else:
-            include_fields: UserModelFieldsType = include
+        fields = FieldSpec.compile(UserModel, include)
 
-        data = cast(
-            dict,
-            await fetch_url(
-                build_url(f"users/{self.data.username}", fields=dict(include_fields))
-            ),
-        )
+        url = build_url(f"users/{self.username}", fields=fields.query)
+        data = cast(dict, await fetch_url(url, client=client))
+        started = time.perf_counter()
         if "username" in data:
             data.pop("username")
 
-        self.data = UserModel(username=self.username, **data)
+        self._load_data(data, _validation(client), replace=True)
+        _parsed(client, url, started, (self,))
 
         return data
 
-    async def fetch_stories(self, include: bool | StoryModelFieldsType = False) -> dict:
-        """Fetch a User's authored stories.
+    async def refresh(
+        self,
+        include: bool | UserModelFieldsType | FieldSpec = False,
+        client: Optional[WattpadClient] = None,
+    ) -> bool:
+        """Re-fetch a User's data, if it changed since it was last fetched. Only the User's `modifyDate` is requested to check, with a conditional request if the API supplied an `ETag` or `Last-Modified` header earlier.
+        **Note**: `include` should be the fields the User was last fetched with. Unchanged Users aren't re-fetched, even if `include` requests fields that weren't fetched before.
 
         Args:
-            include (bool | StoryModelFieldsType, optional): Fields of authored stories to fetch. True fetches all fields. Defaults to False.
+            include (bool | UserModelFieldsType | FieldSpec, optional): Fields to fetch if the User changed. True fetches all fields. Defaults to False.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
 
         Returns:
-            dict: The raw API Response.
+            bool: Whether the User changed, and was re-fetched.
         """
-        if include is False:
-            include_fields: StoryModelFieldsType = {}
-        elif include is True:
-            include_fields: StoryModelFieldsType = {
-                key: True for key in get_fields(StoryModel)  # type: ignore
-            }
-        else:
-            include_fields: StoryModelFieldsType = include
-
-        include_fields["id"] = True
+        if client is None:
+            client = get_client()
+
+        url = build_url(f"users/{self.username}", fields=_USER_VERSION.query)
+        data = cast(dict, await fetch_url(url, client=client, revalidate=True))
+        if (
+            self.data.modify_date is not None
+            and data.get("modifyDate") == self.data.modify_date
+        ):
+            return False
+
+        _invalidate(client, f"users/{self.username}", url)
+        await self.fetch(include, client=client)
+        return True
+
+    async def fetch_stories(
+        self,
+        include: bool | StoryModelFieldsType | FieldSpec = False,
+        client: Optional[WattpadClient] = None,
+    ) -> dict:
+        """Fetch a User's authored stories.
 
-        if "tagRankings" in include_fields:
-            if type(include_fields["tagRankings"]) is dict:
-                include_fields["tagRankings"]["name"] = True
+        Args:
+            include (bool | StoryModelFieldsType | FieldSpec, optional): Fields of authored stories to fetch. True fetches all fields. Defaults to False.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
 
-        if "parts" in include_fields:
-            if type(include_fields["parts"]) is dict:
-                include_fields["parts"]["id"] = True
+        Raises:
+            ValueError: `include` requests a field that doesn't exist, or is a FieldSpec of another model.
 
-        url = (
-            build_url(f"users/{self.data.username}/stories", fields=None)
-            + f"&fields=stories({construct_fields(dict(include_fields))})"  # ! The field format for story retrieval differs here. It's /stories?fields=stories(<fields>). Compared to the usual /path?fields=<fields>. For this reason, we need to manually edit the fields in.
+        Returns:
+            dict: The raw API Response.
+        """
+        fields = FieldSpec.compile(
+            StoryModel, include, required=("id", "tagRankings.name", "parts.id")
         )
-        data = cast(dict, await fetch_url(url))
+
+        url = build_url(
+            f"users/{self.username}/stories", fields=fields.wrap("stories")
+        )  # ! The field format for story retrieval differs here. It's /stories?fields=stories(<fields>). Compared to the usual /path?fields=<fields>.
+        data = cast(dict, await fetch_url(url, client=client))
+        started = time.perf_counter()
+        validation = _validation(client)
 
         stories: list[Story] = []
         for story in data["stories"]:
@@ -141,7 +424,7 @@ class User(metaclass=create_singleton()):
             story_cls = Story(
                 user=self, id=id_
             )  # ! This code is an artefact of the singleton design model. If a user already exists, their data will not be updated otherwise.
-            story_cls._update_data(**story)
+            story_cls._load_data(story, validation)
 
             stories.append(story_cls)
 
@@ -149,198 +432,449 @@ class User(metaclass=create_singleton()):
         self.data.num_stories_published = len(
             self.stories
         )  # ! The data['total'] can also be used, but it isn't always present. (Based on included_fields.)
+        _parsed(client, url, started, stories)
 
         return data
 
+    async def _fetch_followers(
+        self,
+        include: bool | UserModelFieldsType | FieldSpec = False,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        client: Optional[WattpadClient] = None,
+    ) -> tuple[dict, list[User]]:
+        """Fetches the User's followers, returning the parsed objects alongside the raw response.
+
+        Args:
+            include (bool | UserModelFieldsType | FieldSpec, optional): Fields of the following users' to fetch. True fetches all fields. Defaults to False.
+            limit (Optional[int], optional): Maximum number of users to return at once. Use this alongside `offset` for better performance. Defaults to None.
+            offset (Optional[int], optional): Number of users to skip before returning followers. Use this alongside `limit` for better performance. Defaults to None.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Returns:
+            tuple[dict, list[User]]: The raw API Response, and the users that follow this User.
+        """
+        url = self._followers_url(include, limit, offset)
+        data = cast(dict, await fetch_url(url, client=client))
+        started = time.perf_counter()
+        validation = _validation(client)
+
+        followers = [self._parse_follower(user, validation) for user in data["users"]]
+
+        self.followers.update(followers)
+        self.data.num_followers = len(self.followers)
+        _parsed(client, url, started, followers)
+
+        return data, followers
+
+    def _followers_url(
+        self,
+        include: bool | UserModelFieldsType | FieldSpec,
+        limit: Optional[int],
+        offset: Optional[int],
+    ) -> str:
+        """Build the URL of a page of the User's followers, see `_fetch_followers`."""
+        fields = FieldSpec.compile(UserModel, include, required=("username",))
+
+        return build_url(
+            f"users/{self.username}/followers",
+            fields=fields.wrap("users"),
+            limit=limit,
+            offset=offset,
+        )  # ! Similar to story retrieval, requested fields need to be wrapped in `users(<fields>)`.
+
+    def _parse_follower(self, user: dict, validation: str) -> User:
+        """Parse a User that follows this User, from an item of the API Response.
+
+        Args:
+            user (dict): The item. Its username is popped.
+            validation (str): How the User's data is validated, see `WattpadClient.validation`.
+
+        Returns:
+            User: The follower.
+        """
+        username = user.pop("username")
+        user_cls = User(
+            username=username
+        )  # ! This code is an artefact of the singleton design model. If a user already exists, their data will not be updated otherwise.
+        user_cls.following.add(
+            self
+        )  # ! The current user is followed by this fetched user
+        user_cls._load_data(user, validation)
+        return user_cls
+
     async def fetch_followers(
         self,
-        include: bool | UserModelFieldsType = False,
+        include: bool | UserModelFieldsType | FieldSpec = False,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
+        client: Optional[WattpadClient] = None,
     ) -> dict:
         """Fetches the User's followers.
 
         Args:
-            include (bool | UserModelFieldsType, optional): Fields of the following users' to fetch. True fetches all fields. Defaults to False.
+            include (bool | UserModelFieldsType | FieldSpec, optional): Fields of the following users' to fetch. True fetches all fields. Defaults to False.
             limit (Optional[int], optional): Maximum number of users to return at once. Use this alongside `offset` for better performance. Defaults to None.
             offset (Optional[int], optional): Number of users to skip before returning followers. Use this alongside `limit` for better performance. Defaults to None.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Raises:
+            ValueError: `include` requests a field that doesn't exist, or is a FieldSpec of another model.
 
         Returns:
             dict: The raw API Response.
         """
-        if include is False:
-            include_fields: UserModelFieldsType = {}
-        elif include is True:
-            include_fields: UserModelFieldsType = {
-                key: True for key in get_fields(UserModel)  # type: ignore
-            }
-        else:
-            include_fields: UserModelFieldsType = include
+        data, _ = await self._fetch_followers(include, limit, offset, client)
 
-        include_fields["username"] = True
+        return data
 
-        url = (
-            build_url(
-                f"users/{self.data.username}/followers",
-                fields=None,
-                limit=limit,
-                offset=offset,
-            )
-            + f"&fields=users({construct_fields(dict(include_fields))})"  # ! Similar to story retrieval, requested fields need to be wrapped in `users(<fields>)`.
-        )
-        data = cast(dict, await fetch_url(url))
+    async def iter_followers(
+        self,
+        include: bool | UserModelFieldsType | FieldSpec = False,
+        page_size: int = 100,
+        prefetch: int = 1,
+        stream: bool = False,
+        client: Optional[WattpadClient] = None,
+    ) -> AsyncIterator[User]:
+        """Iterate over all Users that follow this User, page by page. Up to `prefetch` pages are requested ahead of the page being processed.
+
+        Example:
+        ```py
+        >>> async for item in user.iter_followers(page_size=50, prefetch=2):
+        ...     print(item)
+        ```
 
-        followers: set[User] = set()
-        for user in data["users"]:
-            username = user.pop("username")
-            user_cls = User(
-                username=username
-            )  # ! This code is an artefact of the singleton design model. If a user already exists, their data will not be updated otherwise.
-            user_cls.following.add(
-                self
-            )  # ! The current user is followed by this fetched user
-            user_cls._update_data(**user)
-            followers.add(user_cls)
+        Args:
+            include (bool | UserModelFieldsType | FieldSpec, optional): Fields of the following users' to fetch. True fetches all fields. Defaults to False.
+            page_size (int, optional): Number of records to request per page. Defaults to 100.
+            prefetch (int, optional): Number of pages to request ahead of the page being processed. Ignored if `stream` is set. Defaults to 1.
+            stream (bool, optional): Whether to parse each page as it downloads, yielding each item once it's parsed, rather than once the whole page is. Keeps memory flat with a large `page_size`. Streamed pages aren't cached, see `wattpad.utils.stream_items`. Defaults to False.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
 
-        self.followers.update(followers)
-        self.data.num_followers = len(self.followers)
+        Raises:
+            ValueError: `include` requests a field that doesn't exist, or is a FieldSpec of another model.
 
-        return data
+        Yields:
+            User: The users that follow this User.
+        """
+
+        if stream:
+
+            async def stream_page(limit: int, offset: int) -> AsyncIterator[User]:
+                url = self._followers_url(include, limit, offset)
+                async for item in _stream_page(
+                    client, url, "users", self._parse_follower
+                ):
+                    self.followers.add(item)
+                    yield item
+                self.data.num_followers = len(self.followers)
+
+            async for item in paginate_stream(stream_page, page_size=page_size):
+                yield item
+            return
+
+        async def fetch_page(limit: int, offset: int) -> list[User]:
+            _, page = await self._fetch_followers(include, limit, offset, client)
+            return page
+
+        async for item in paginate(fetch_page, page_size=page_size, prefetch=prefetch):
+            yield item
+
+    async def _fetch_following(
+        self,
+        include: bool | UserModelFieldsType | FieldSpec = False,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        client: Optional[WattpadClient] = None,
+    ) -> tuple[dict, list[User]]:
+        """Fetch the users this User follows, returning the parsed objects alongside the raw response.
+
+        Args:
+            include (bool | UserModelFieldsType | FieldSpec, optional): Fields of the followed users' to fetch. True fetches all fields. Defaults to False.
+            limit (Optional[int], optional): Maximum number of users to return at once. Use this alongside `offset` for better performance. Defaults to None.
+            offset (Optional[int], optional): Number of users to skip before returning followers. Use this alongside `limit` for better performance. Defaults to None.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Returns:
+            tuple[dict, list[User]]: The raw API Response, and the users this User follows.
+        """
+        url = self._following_url(include, limit, offset)
+        data = cast(dict, await fetch_url(url, client=client))
+        started = time.perf_counter()
+        validation = _validation(client)
+
+        following = [self._parse_followed(user, validation) for user in data["users"]]
+
+        self.following.update(following)
+        self.data.num_following = len(self.following)
+        _parsed(client, url, started, following)
+
+        return data, following
+
+    def _following_url(
+        self,
+        include: bool | UserModelFieldsType | FieldSpec,
+        limit: Optional[int],
+        offset: Optional[int],
+    ) -> str:
+        """Build the URL of a page of the users this User follows, see `_fetch_following`."""
+        fields = FieldSpec.compile(UserModel, include, required=("username",))
+
+        return build_url(
+            f"users/{self.username}/following",
+            fields=fields.wrap("users"),
+            limit=limit,
+            offset=offset,
+        )  # ! Similar to story retrieval, requested fields need to be wrapped in `users(<fields>)`.
+
+    def _parse_followed(self, user: dict, validation: str) -> User:
+        """Parse a User this User follows, from an item of the API Response.
+
+        Args:
+            user (dict): The item. Its username is popped.
+            validation (str): How the User's data is validated, see `WattpadClient.validation`.
+
+        Returns:
+            User: The followed user.
+        """
+        username = user.pop("username")
+
+        user_cls = User(
+            username=username
+        )  # ! This code is an artefact of the singleton design model. If a user already exists, their data will not be updated otherwise.
+        user_cls.followers.add(self)  # ! The current user follows this fetched user
+        user_cls._load_data(user, validation)
+        return user_cls
 
     async def fetch_following(
         self,
-        include: bool | UserModelFieldsType = False,
+        include: bool | UserModelFieldsType | FieldSpec = False,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
+        client: Optional[WattpadClient] = None,
     ) -> dict:
         """Fetch the users this User follows.
 
         Args:
-            include (bool | UserModelFieldsType, optional): Fields of the followed users' to fetch. True fetches all fields. Defaults to False.
+            include (bool | UserModelFieldsType | FieldSpec, optional): Fields of the followed users' to fetch. True fetches all fields. Defaults to False.
             limit (Optional[int], optional): Maximum number of users to return at once. Use this alongside `offset` for better performance. Defaults to None.
             offset (Optional[int], optional): Number of users to skip before returning followers. Use this alongside `limit` for better performance. Defaults to None.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Raises:
+            ValueError: `include` requests a field that doesn't exist, or is a FieldSpec of another model.
 
         Returns:
             dict: The raw API Response.
         """
-        if include is False:
-            include_fields: UserModelFieldsType = {}
-        elif include is True:
-            include_fields: UserModelFieldsType = {
-                key: True for key in get_fields(UserModel)  # type: ignore
-            }
-        else:
-            include_fields: UserModelFieldsType = include
+        data, _ = await self._fetch_following(include, limit, offset, client)
 
-        include_fields["username"] = True
+        return data
 
-        url = (
-            build_url(
-                f"users/{self.data.username}/following",
-                fields=None,
-                limit=limit,
-                offset=offset,
-            )
-            + f"&fields=users({construct_fields(dict(include_fields))})"  # ! Similar to story retrieval, requested fields need to be wrapped in `users(<fields>)`.
-        )
-        data = cast(dict, await fetch_url(url))
+    async def iter_following(
+        self,
+        include: bool | UserModelFieldsType | FieldSpec = False,
+        page_size: int = 100,
+        prefetch: int = 1,
+        stream: bool = False,
+        client: Optional[WattpadClient] = None,
+    ) -> AsyncIterator[User]:
+        """Iterate over all Users this User follows, page by page. Up to `prefetch` pages are requested ahead of the page being processed.
+
+        Example:
+        ```py
+        >>> async for item in user.iter_following(page_size=50, prefetch=2):
+        ...     print(item)
+        ```
 
-        following: set[User] = set()
-        for user in data["users"]:
-            username = user.pop("username")
+        Args:
+            include (bool | UserModelFieldsType | FieldSpec, optional): Fields of the followed users' to fetch. True fetches all fields. Defaults to False.
+            page_size (int, optional): Number of records to request per page. Defaults to 100.
+            prefetch (int, optional): Number of pages to request ahead of the page being processed. Ignored if `stream` is set. Defaults to 1.
+            stream (bool, optional): Whether to parse each page as it downloads, yielding each item once it's parsed, rather than once the whole page is. Keeps memory flat with a large `page_size`. Streamed pages aren't cached, see `wattpad.utils.stream_items`. Defaults to False.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
 
-            user_cls = User(
-                username=username
-            )  # ! This code is an artefact of the singleton design model. If a user already exists, their data will not be updated otherwise.
-            user_cls.followers.add(self)  # ! The current user follows this fetched user
-            user_cls._update_data(**user)
+        Raises:
+            ValueError: `include` requests a field that doesn't exist, or is a FieldSpec of another model.
 
-            following.add(user_cls)
+        Yields:
+            User: The users this User follows.
+        """
 
-        self.followers.update(following)
-        self.data.num_following = len(self.following)
+        if stream:
 
-        return data
+            async def stream_page(limit: int, offset: int) -> AsyncIterator[User]:
+                url = self._following_url(include, limit, offset)
+                async for item in _stream_page(
+                    client, url, "users", self._parse_followed
+                ):
+                    self.following.add(item)
+                    yield item
+                self.data.num_following = len(self.following)
+
+            async for item in paginate_stream(stream_page, page_size=page_size):
+                yield item
+            return
+
+        async def fetch_page(limit: int, offset: int) -> list[User]:
+            _, page = await self._fetch_following(include, limit, offset, client)
+            return page
+
+        async for item in paginate(fetch_page, page_size=page_size, prefetch=prefetch):
+            yield item
+
+    async def _fetch_lists(
+        self,
+        include: bool | ListModelFieldsType | FieldSpec = False,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        client: Optional[WattpadClient] = None,
+    ) -> tuple[dict, list[List]]:
+        """Fetch a User's lists, returning the parsed objects alongside the raw response.
+
+        Args:
+            include (bool | ListModelFieldsType | FieldSpec, optional): Fields of the lists to fetch. True fetches all fields. Defaults to False.
+            limit (Optional[int], optional): Maximum number of users to return at once. Use this alongside `offset` for better performance. Defaults to None.
+            offset (Optional[int], optional): Number of users to skip before returning followers. Use this alongside `limit` for better performance. Defaults to None.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Returns:
+            tuple[dict, list[List]]: The raw API Response, and the lists created by this User.
+        """
+        url = self._lists_url(include, limit, offset)
+        data = cast(dict, await fetch_url(url, client=client))
+        started = time.perf_counter()
+        validation = _validation(client)
+
+        lists = [self._parse_list(list_, validation) for list_ in data["lists"]]
+
+        self.lists.update(lists)
+        self.data.num_lists = len(self.lists)
+        _parsed(client, url, started, lists)
+
+        return data, lists
+
+    def _lists_url(
+        self,
+        include: bool | ListModelFieldsType | FieldSpec,
+        limit: Optional[int],
+        offset: Optional[int],
+    ) -> str:
+        """Build the URL of a page of the User's lists, see `_fetch_lists`."""
+        fields = FieldSpec.compile(ListModel, include, required=("id", "stories.id"))
+
+        return build_url(
+            f"users/{self.username}/lists",
+            fields=fields.wrap("lists"),
+            limit=limit,
+            offset=offset,
+        )  # ! Similar to story retrieval, requested fields need to be wrapped in `lists(<fields>)`.
+
+    def _parse_list(self, list_: dict, validation: str) -> List:
+        """Parse a List created by this User, with its Stories, from an item of the API Response.
+
+        Args:
+            list_ (dict): The item. Its ID, and those of its stories, are popped.
+            validation (str): How the stories' data is validated, see `WattpadClient.validation`.
+
+        Returns:
+            List: The list.
+        """
+        id_ = list_.pop("id")
+        list_cls = List(
+            id=id_, user=self
+        )  # ! This code is an artefact of the singleton design model. If a list already exists, its data will not be updated otherwise.
+
+        stories: set[Story] = set()
+        for story in list_["stories"]:
+            s_id_ = story.pop("id")
+            story_cls = Story(id=s_id_)
+            story_cls._load_data(story, validation)
+            stories.add(story_cls)
+
+        list_cls.stories.update(stories)
+        return list_cls
 
     async def fetch_lists(
         self,
-        include: bool | ListModelFieldsType = False,
+        include: bool | ListModelFieldsType | FieldSpec = False,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
+        client: Optional[WattpadClient] = None,
     ) -> dict:
         """Fetch a User's lists.
 
         Args:
-            include (bool | ListModelFieldsType, optional): Fields of the lists to fetch. True fetches all fields. Defaults to False.
+            include (bool | ListModelFieldsType | FieldSpec, optional): Fields of the lists to fetch. True fetches all fields. Defaults to False.
             limit (Optional[int], optional): Maximum number of users to return at once. Use this alongside `offset` for better performance. Defaults to None.
             offset (Optional[int], optional): Number of users to skip before returning followers. Use this alongside `limit` for better performance. Defaults to None.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Raises:
+            ValueError: `include` requests a field that doesn't exist, or is a FieldSpec of another model.
 
         Returns:
             dict: The raw API Response.
         """
-        if include is False:
-            include_fields: ListModelFieldsType = {}
-        elif include is True:
-            include_fields: ListModelFieldsType = {
-                key: True for key in get_fields(ListModel)  # type: ignore
-            }
-        else:
-            include_fields: ListModelFieldsType = include
+        data, _ = await self._fetch_lists(include, limit, offset, client)
 
-        include_fields["id"] = True
+        return data
 
-        if "stories" in include_fields:
-            if type(include_fields["stories"]) is dict:
-                include_fields["stories"]["id"] = True
+    async def iter_lists(
+        self,
+        include: bool | ListModelFieldsType | FieldSpec = False,
+        page_size: int = 100,
+        prefetch: int = 1,
+        stream: bool = False,
+        client: Optional[WattpadClient] = None,
+    ) -> AsyncIterator[List]:
+        """Iterate over all Lists created by this User, page by page. Up to `prefetch` pages are requested ahead of the page being processed.
+
+        Example:
+        ```py
+        >>> async for item in user.iter_lists(page_size=50, prefetch=2):
+        ...     print(item)
+        ```
 
-        url = (
-            build_url(
-                f"users/{self.data.username}/lists",
-                fields=None,
-                limit=limit,
-                offset=offset,
-            )
-            + f"&fields=lists({construct_fields(dict(include_fields))})"  # ! Similar to story retrieval, requested fields need to be wrapped in `lists(<fields>)`.
-        )
-        data = cast(dict, await fetch_url(url))
+        Args:
+            include (bool | ListModelFieldsType | FieldSpec, optional): Fields of the lists to fetch. True fetches all fields. Defaults to False.
+            page_size (int, optional): Number of records to request per page. Defaults to 100.
+            prefetch (int, optional): Number of pages to request ahead of the page being processed. Ignored if `stream` is set. Defaults to 1.
+            stream (bool, optional): Whether to parse each page as it downloads, yielding each item once it's parsed, rather than once the whole page is. Keeps memory flat with a large `page_size`. Streamed pages aren't cached, see `wattpad.utils.stream_items`. Defaults to False.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
 
-        lists: set[List] = set()
-        for list_ in data["lists"]:
-            id_ = list_.pop("id")
-            list_cls = List(
-                id=id_, user=self
-            )  # ! This code is an artefact of the singleton design model. If a list already exists, its data will not be updated otherwise.
+        Raises:
+            ValueError: `include` requests a field that doesn't exist, or is a FieldSpec of another model.
 
-            stories: set[Story] = set()
-            for story in list_["stories"]:
-                s_id_ = story.pop("id")
-                story_cls = Story(id=s_id_)
-                story_cls._update_data(**story)
-                stories.add(story_cls)
+        Yields:
+            List: The lists created by this User.
+        """
 
-            list_cls.stories.update(stories)
-            lists.add(list_cls)
+        if stream:
 
-        self.lists.update(lists)
-        self.data.num_lists = len(self.lists)
+            async def stream_page(limit: int, offset: int) -> AsyncIterator[List]:
+                url = self._lists_url(include, limit, offset)
+                async for item in _stream_page(client, url, "lists", self._parse_list):
+                    self.lists.add(item)
+                    yield item
+                self.data.num_lists = len(self.lists)
 
-        return data
+            async for item in paginate_stream(stream_page, page_size=page_size):
+                yield item
+            return
 
-    def _update_data(self, **kwargs):
-        """Updates self.data with kwargs, overwriting any duplicate values with a preference towards kwargs.
+        async def fetch_page(limit: int, offset: int) -> list[List]:
+            _, page = await self._fetch_lists(include, limit, offset, client)
+            return page
 
-        Returns:
-            None: Nothing is returned.
-        """
-        self.data = self.data.model_copy(
-            update=convert_from_aliases(kwargs, self.data), deep=True
-        )
+        async for item in paginate(fetch_page, page_size=page_size, prefetch=prefetch):
+            yield item
 
 
 # --- #
 
 
-class Story(metaclass=create_singleton()):
+class Story(_Materialized, metaclass=create_singleton()):
     """A representation of a Story on Wattpad.
     **Note**: Stories are singletons, unique as per their ID. Two story classes with the same ID are the _same_.
 
@@ -348,9 +882,13 @@ class Story(metaclass=create_singleton()):
         id (str): Lowercased ID of this Story.
         user (User): The User who authored this Story.
         recommended (list[Story]): Stories recommended from this Story.
+        parts (list[Part]): Parts of this Story, in reading order. Populated when the Story's `parts` are fetched.
         data (StoryModel): Story Data from the Wattpad API.
     """
 
+    _model = StoryModel
+    _key = "id"
+
     def __init__(self, id: str, user: Optional[User] = None, **kwargs):
         """Create a Story object.
 
@@ -361,124 +899,457 @@ class Story(metaclass=create_singleton()):
         self.id = id.lower()
         self.user: Optional[User] = user
         self.recommended: list[Story] = []
-        # self.parts: list[Part]  # ! NotImplemented. In the future, if Part text retrieval is a part of this library, that would warrant the creation of a seperate Part singleton. Right now, having self.parts would cause inconsistency with the rest of the library.
-        self.data = StoryModel(id=self.id, **kwargs)
+        self.parts: list[Part] = []
+
+        self._init_data(**kwargs)
+        if kwargs:
+            self._link_parts(self.data.parts, "eager")
 
     def __repr__(self) -> str:
         return f"<Story id={self.id}>"
 
-    async def fetch(self, include: bool | StoryModelFieldsType = False) -> dict:
+    async def fetch(
+        self,
+        include: bool | StoryModelFieldsType | FieldSpec = False,
+        client: Optional[WattpadClient] = None,
+    ) -> dict:
         """Populates a Story's data. Call this method after instantiation.
 
         Args:
-            include (bool | StoryModelFieldsType, optional): Fields to fetch. True fetches all fields. Defaults to False.
+            include (bool | StoryModelFieldsType | FieldSpec, optional): Fields to fetch. True fetches all fields. Defaults to False.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Raises:
+            ValueError: `include` requests a field that doesn't exist, or is a FieldSpec of another model.
 
         Returns:
             dict: The raw API Response.
         """
-        if include is False:
-            include_fields: StoryModelFieldsType = {}
-        elif include is True:
-            include_fields: StoryModelFieldsType = {
-                key: True for key in get_fields(StoryModel)  # type: ignore
-            }
-        else:
-            include_fields: StoryModelFieldsType = include
+        fields = FieldSpec.compile(
+            StoryModel, include, required=("user.username",), expand=("user",)
+        )
 
-        if "user" in include_fields:
-            if include_fields["user"] is True:
-                include_fields["user"] = cast(
-                    UserModelFieldsType, {key: True for key in get_fields(UserModel)}  # type: ignore
-                )
-            elif include_fields["user"] is False:
-                include_fields["user"] = {"username": True}
-            else:
-                include_fields["user"]["username"] = True
-        else:
-            include_fields["user"] = {"username": True}
+        url = build_url(f"stories/{self.id}", fields=fields.query)
+        data = cast(dict, await fetch_url(url, client=client))
+        started = time.perf_counter()
+        validation = _validation(client)
 
-        data = cast(
-            dict,
-            await fetch_url(
-                build_url(f"stories/{self.data.id}", fields=dict(include_fields))
-            ),
-        )
         if "id" in data:
             data.pop("id")
         if "user" in data:
             user_data = data.pop("user")
             user = User(user_data.pop("username"))
-            user._update_data(**user_data)
+            user._load_data(user_data, validation)
             self.user = user
 
-        self.data = StoryModel(id=self.id, **data)
+        self._load_data(data, validation, replace=True)
+        _parsed(client, url, started, (self, self.user) if self.user else (self,))
 
         return data
 
+    async def refresh(
+        self,
+        include: bool | StoryModelFieldsType | FieldSpec = False,
+        client: Optional[WattpadClient] = None,
+    ) -> bool:
+        """Re-fetch a Story's data, if it changed since it was last fetched. Only the Story's `modifyDate`, `numParts` and `lastPublishedPart` are requested to check, with a conditional request if the API supplied an `ETag` or `Last-Modified` header earlier.
+        **Note**: `include` should be the fields the Story was last fetched with. Unchanged Stories aren't re-fetched, even if `include` requests fields that weren't fetched before.
+
+        Args:
+            include (bool | StoryModelFieldsType | FieldSpec, optional): Fields to fetch if the Story changed. True fetches all fields. Defaults to False.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Returns:
+            bool: Whether the Story changed, and was re-fetched.
+        """
+        if client is None:
+            client = get_client()
+
+        url = build_url(f"stories/{self.id}", fields=_STORY_VERSION.query)
+        data = cast(dict, await fetch_url(url, client=client, revalidate=True))
+        current = self.data.model_dump(
+            by_alias=True, include={"modify_date", "num_parts", "last_published_part"}
+        )
+        # ! Fields the Story was never fetched with aren't compared.
+        if self.data.modify_date is not None and all(
+            data.get(key) == value
+            for key, value in current.items()
+            if value is not None
+        ):
+            return False
+
+        _invalidate(client, f"stories/{self.id}", url)
+        await self.fetch(include, client=client)
+        return True
+
+    async def _fetch_recommended(
+        self,
+        include: bool | StoryModelFieldsType | FieldSpec = False,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        client: Optional[WattpadClient] = None,
+    ) -> tuple[list, list[Story]]:
+        """Fetch Stories recommended from this Story, returning the parsed objects alongside the raw response.
+
+        Args:
+            include (bool | StoryModelFieldsType | FieldSpec, optional): Fields to fetch of the recommended stories. True fetches all fields. Defaults to False.
+            limit (Optional[int], optional): Maximum number of users to return at once. Use this alongside `offset` for better performance. Defaults to None.
+            offset (Optional[int], optional): Number of users to skip before returning followers. Use this alongside `limit` for better performance. Defaults to None.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Returns:
+            tuple[list, list[Story]]: The raw API Response, and the stories recommended from this Story.
+        """
+        url = self._recommended_url(include, limit, offset)
+        data = cast(list[dict], await fetch_url(url, client=client))
+        started = time.perf_counter()
+        validation = _validation(client)
+
+        recommended = [self._parse_recommended(story, validation) for story in data]
+
+        _parsed(client, url, started, recommended)
+
+        return data, recommended
+
+    def _recommended_url(
+        self,
+        include: bool | StoryModelFieldsType | FieldSpec,
+        limit: Optional[int],
+        offset: Optional[int],
+    ) -> str:
+        """Build the URL of a page of Stories recommended from this Story, see `_fetch_recommended`."""
+        fields = FieldSpec.compile(
+            StoryModel, include, required=("id", "user.username"), expand=("user",)
+        )
+
+        return build_url(
+            f"stories/{self.id}/recommended",
+            fields=fields.query,
+            limit=limit,
+            offset=offset,
+        )
+
+    def _parse_recommended(self, story: dict, validation: str) -> Story:
+        """Parse a Story recommended from this Story, with its author, from an item of the API Response.
+
+        Args:
+            story (dict): The item.
+            validation (str): How the data of the story and its author is validated, see `WattpadClient.validation`.
+
+        Returns:
+            Story: The recommended story.
+        """
+        story_cls = Story(
+            id=story["id"]
+        )  # ! This code is an artefact of the singleton design model. If a story already exists, its data will not be updated otherwise.
+
+        if "user" in story:
+            user_data = dict(story["user"])
+            user = User(user_data.pop("username"))
+            user._load_data(user_data, validation)
+            story_cls.user = user
+
+        story_cls._load_data(
+            {key: value for key, value in story.items() if key not in ("id", "user")},
+            validation,
+        )
+        return story_cls
+
     async def fetch_recommended(
         self,
-        include: bool | StoryModelFieldsType = False,
+        include: bool | StoryModelFieldsType | FieldSpec = False,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
+        client: Optional[WattpadClient] = None,
     ) -> list:
         """Fetch Stories recommended from this Story.
 
         Args:
-            include (bool | StoryModelFieldsType, optional): Fields to fetch of the recommended stories. True fetches all fields. Defaults to False.
+            include (bool | StoryModelFieldsType | FieldSpec, optional): Fields to fetch of the recommended stories. True fetches all fields. Defaults to False.
             limit (Optional[int], optional): Maximum number of users to return at once. Use this alongside `offset` for better performance. Defaults to None.
             offset (Optional[int], optional): Number of users to skip before returning followers. Use this alongside `limit` for better performance. Defaults to None.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Raises:
+            ValueError: `include` requests a field that doesn't exist, or is a FieldSpec of another model.
 
         Returns:
             dict: The raw API Response.
         """
-        if include is False:
-            include_fields: StoryModelFieldsType = {}
-        elif include is True:
-            include_fields: StoryModelFieldsType = {
-                key: True for key in get_fields(StoryModel)  # type: ignore
-            }
+        data, recommended = await self._fetch_recommended(
+            include, limit, offset, client
+        )
+        self.recommended = recommended
+
+        return data
+
+    async def iter_recommended(
+        self,
+        include: bool | StoryModelFieldsType | FieldSpec = False,
+        page_size: int = 100,
+        prefetch: int = 1,
+        stream: bool = False,
+        client: Optional[WattpadClient] = None,
+    ) -> AsyncIterator[Story]:
+        """Iterate over all Stories recommended from this Story, page by page. Up to `prefetch` pages are requested ahead of the page being processed.
+
+        Example:
+        ```py
+        >>> async for item in story.iter_recommended(page_size=50, prefetch=2):
+        ...     print(item)
+        ```
+
+        Args:
+            include (bool | StoryModelFieldsType | FieldSpec, optional): Fields to fetch of the recommended stories. True fetches all fields. Defaults to False.
+            page_size (int, optional): Number of records to request per page. Defaults to 100.
+            prefetch (int, optional): Number of pages to request ahead of the page being processed. Ignored if `stream` is set. Defaults to 1.
+            stream (bool, optional): Whether to parse each page as it downloads, yielding each item once it's parsed, rather than once the whole page is. Keeps memory flat with a large `page_size`. Streamed pages aren't cached, see `wattpad.utils.stream_items`. Defaults to False.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Raises:
+            ValueError: `include` requests a field that doesn't exist, or is a FieldSpec of another model.
+
+        Yields:
+            Story: The stories recommended from this Story.
+        """
+
+        async def fetch_page(limit: int, offset: int) -> list[Story]:
+            _, page = await self._fetch_recommended(include, limit, offset, client)
+            return page
+
+        def stream_page(limit: int, offset: int) -> AsyncIterator[Story]:
+            url = self._recommended_url(include, limit, offset)
+            return _stream_page(client, url, None, self._parse_recommended)
+
+        self.recommended = []
+        if stream:
+            items = paginate_stream(stream_page, page_size=page_size)
         else:
-            include_fields: StoryModelFieldsType = include
+            items = paginate(fetch_page, page_size=page_size, prefetch=prefetch)
 
-        include_fields["id"] = True
+        async for item in items:
+            self.recommended.append(item)
+            yield item
 
-        if "user" in include_fields:
-            if include_fields["user"] is True:
-                include_fields["user"] = cast(
-                    UserModelFieldsType, {key: True for key in get_fields(UserModel)}  # type: ignore
-                )
-            elif include_fields["user"] is False:
-                include_fields["user"] = {"username": True}
+    def _update_data(self, **kwargs) -> set[str]:
+        """Updates self.data in place with kwargs, as `User._update_data` does, linking any changed parts.
+
+        Returns:
+            set[str]: The names of the fields that changed.
+        """
+        changed = super()._update_data(**kwargs)
+        if "parts" in changed:
+            self._link_parts(self.data.parts, "eager")
+        return changed
+
+    def _load_data(self, raw: dict, validation: str, replace: bool = False):
+        """Store API Data as per the validation mode, as `User._load_data` does, linking any parts without materializing this Story's data.
+
+        Args:
+            raw (dict): The aliased API Data.
+            validation (str): The validation mode, see `WattpadClient.validation`.
+            replace (bool, optional): Whether the data replaces the current data, rather than being merged into it. Defaults to False.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        super()._load_data(raw, validation, replace)
+        # ! Eager merges link parts through `_update_data`.
+        if "parts" in raw and (replace or validation != "eager"):
+            self._link_parts(raw["parts"], validation)
+
+    def _link_parts(self, parts: list, validation: str):
+        """Update self.parts with Part singletons for the given parts, without materializing this Story's data.
+
+        Args:
+            parts (list): The parts, as aliased dictionaries or `PartModel`s.
+            validation (str): The validation mode of dictionaries, see `WattpadClient.validation`.
+
+        Returns:
+            None: Nothing is returned.
+        """
+        linked: list[Part] = []
+        for part_data in parts:
+            if isinstance(part_data, PartModel):
+                part = Part(str(part_data.id))
+                part.data = part_data
             else:
-                include_fields["user"]["username"] = True
-        else:
-            include_fields["user"] = {"username": True}
-
-        data = cast(
-            list[dict],
-            await fetch_url(
-                build_url(
-                    f"stories/{self.data.id}/recommended",
-                    fields=dict(include_fields),
-                    limit=limit,
-                    offset=offset,
+                # ! `_update_data` doesn't validate, parts may still be dictionaries.
+                part = Part(str(part_data["id"]))
+                part._load_data(part_data, validation, replace=True)
+            part.story = self
+            linked.append(part)
+
+        self.parts = linked
+
+    async def iter_part_texts(
+        self,
+        concurrency: int = 8,
+        chunk_size: int = 64 * 1024,
+        client: Optional[WattpadClient] = None,
+    ) -> AsyncIterator[tuple[Part, AsyncIterator[str]]]:
+        """Stream the text of every Part of this Story, downloading up to `concurrency` at once, and yield them in reading order. Each Part is yielded with an iterator over its text, which streams as it downloads. The Story's parts are fetched first if they're unknown.
+        **Note**: Parts after the one being read download ahead of it, buffering up to 4 chunks each until their turn. Texts aren't kept in memory after they're read, and aren't stored on each `Part`. Use `Part.fetch_text` for that.
+
+        Example:
+        ```py
+        >>> async for part, texts in story.iter_part_texts(concurrency=16):
+        ...     async for text in texts:
+        ...         file.write(text)
+        ```
+
+        Args:
+            concurrency (int, optional): Maximum number of Parts downloading, including the Part being read. Defaults to 8.
+            chunk_size (int, optional): Maximum size of each streamed chunk, in bytes. Defaults to 64 KiB.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Yields:
+            tuple[Part, AsyncIterator[str]]: Each Part and consecutive pieces of its HTML text, in reading order. Pieces that aren't read before the next Part is requested are discarded.
+        """
+        if not self.parts:
+            data = cast(
+                dict,
+                await fetch_url(
+                    build_url(f"stories/{self.id}", fields=_STORY_PARTS.query),
+                    client=client,
+                ),
+            )
+            self._load_data({"parts": data.get("parts", [])}, _validation(client))
+
+        async def download(part: Part, queue: asyncio.Queue[str | Exception | None]):
+            # ! Only a download that stops on its own reports it, one cancelled after its Part was skipped mustn't wait on a queue nothing reads.
+            try:
+                async for text in part.iter_text(chunk_size=chunk_size, client=client):
+                    await queue.put(text)
+            except Exception as error:
+                await queue.put(error)
+            else:
+                await queue.put(None)
+
+        async def read(queue: asyncio.Queue[str | Exception | None]):
+            while True:
+                text = await queue.get()
+                if text is None:
+                    return
+                if isinstance(text, Exception):
+                    raise text
+                yield text
+
+        parts = iter(list(self.parts))
+        pending: deque[
+            tuple[Part, asyncio.Queue[str | Exception | None], asyncio.Task]
+        ] = deque()
+
+        def schedule():
+            for part in islice(parts, concurrency - len(pending)):
+                queue: asyncio.Queue[str | Exception | None] = asyncio.Queue(
+                    maxsize=_TEXT_BUFFER
+                )  # ! Bounded, so Parts ahead of the one being read only buffer a few chunks.
+                pending.append(
+                    (part, queue, asyncio.ensure_future(download(part, queue)))
                 )
-            ),
-        )
 
-        self.recommended = [Story(**story) for story in data]
+        try:
+            schedule()
+            while pending:
+                part, queue, task = pending[0]
+                texts = cast(AsyncGenerator[str, None], read(queue))
+                try:
+                    yield part, texts
+                    async for _ in texts:
+                        pass  # ! Discards what the caller didn't read, raising errors it didn't see.
+                finally:
+                    await texts.aclose()
+
+                pending.popleft()
+                if not task.done():
+                    task.cancel()  # ! The caller closed the texts before they ended.
+                await asyncio.gather(task, return_exceptions=True)
+                schedule()
+        finally:
+            for _, _, task in pending:
+                task.cancel()
+            await asyncio.gather(
+                *(task for _, _, task in pending), return_exceptions=True
+            )
+
 
-        return data
+# --- #
+
+
+class Part(_Materialized, metaclass=create_singleton()):
+    """A representation of a Part (chapter) of a Story on Wattpad.
+    **Note**: Parts are singletons, unique as per their ID. Two Part classes with the same ID are the _same_.
+
+    Attributes:
+        id (str): ID of this Part.
+        story (Optional[Story]): The Story this Part belongs to.
+        text (Optional[str]): The HTML text of this Part. None until `fetch_text` is called.
+        data (PartModel): Part Data from the Wattpad API.
+    """
+
+    _model = PartModel
+    _key = "id"
+
+    def __init__(self, id: str, story: Optional[Story] = None, **kwargs):
+        """Create a Part object.
+
+        Args:
+            id (str): The ID of the Part.
+            story (Optional[Story], optional): The Story this Part belongs to. Defaults to None.
+            **kwargs (any): Arguments to pass directly to the underlying `PartModel`. These are ignored if the Part has been instantiated earlier in the runtime.
+        """
+        self.id = id.lower()
+        self.story: Optional[Story] = story
+        self.text: Optional[str] = None
+
+        self._init_data(**kwargs)
+
+    def __repr__(self) -> str:
+        return f"<Part id={self.id}>"
+
+    async def iter_text(
+        self, chunk_size: int = 64 * 1024, client: Optional[WattpadClient] = None
+    ) -> AsyncIterator[str]:
+        """Stream the HTML text of this Part, decoding it as it downloads. The text isn't stored, see `fetch_text`.
+
+        Args:
+            chunk_size (int, optional): Maximum size of each streamed chunk, in bytes. Defaults to 64 KiB.
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+        Yields:
+            str: Consecutive pieces of the text.
+        """
+        if client is None:
+            client = get_client()
+
+        decoder = codecs.getincrementaldecoder("utf-8")(
+            errors="replace"
+        )  # ! Incremental, a character may be split between chunks.
+        async for chunk in client.stream(
+            f"https://www.wattpad.com/apiv2/storytext?id={self.id}",
+            chunk_size=chunk_size,
+        ):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+
+    async def fetch_text(self, client: Optional[WattpadClient] = None) -> str:
+        """Populates a Part's text.
 
-    def _update_data(self, **kwargs):
-        """Updates self.data with kwargs, overwriting any duplicate values with a preference towards kwargs.
+        Args:
+            client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
 
         Returns:
-            None: Nothing is returned.
+            str: The HTML text of this Part.
         """
-        self.data = self.data.model_copy(
-            update=convert_from_aliases(kwargs, self.data), deep=True
-        )
+        self.text = "".join([text async for text in self.iter_text(client=client)])
+
+        return self.text
 
 
 # --- #
@@ -492,11 +1363,15 @@ class List(metaclass=create_singleton()):
         id (str): Lowercased ID of this List.
         name (str): The name of this List.
         user (User): The User who created this List.
-        stories (list[Story]): Stories included within this List.
+        stories (MutableSet[Story]): Stories included within this List. A view over the graph store if one is installed, see `wattpad.graph`.
     """
 
     def __init__(
-        self, id: int, user: User, name: str = "", stories: set[Story] = set()
+        self,
+        id: int,
+        user: User,
+        name: str = "",
+        stories: Optional[set[Story]] = None,
     ):
         """Creates a List object.
 
@@ -504,12 +1379,18 @@ class List(metaclass=create_singleton()):
             id (str): The ID of this List.
             user (User): The User who created this List.
             name (str, optional): The name of this List. Defaults to "".
-            stories (list[Story], optional): The Stories within this List. Defaults to [].
+            stories (Optional[set[Story]], optional): The Stories within this List. Defaults to None.
         """
         self.id = id
         self.name: str = name
         self.user: User = user
-        self.stories: set[Story] = stories
+
+        store = get_graph_store()
+        self.stories: MutableSet[Story] = (
+            store.stories(id) if store else set()
+        )  # ! A fresh set per List, a shared default would leak Stories between Lists.
+        if stories:
+            self.stories |= stories
 
     def __repr__(self) -> str:
         return f"<List id={self.id}>"
@@ -529,5 +1410,67 @@ class List(metaclass=create_singleton()):
             self.name = name
         if user:
             self.user = user
-        if stories:
-            self.stories = stories
+        if stories and stories is not self.stories:
+            self.stories.clear()
+            self.stories |= stories  # ! Replaced in place, the set may be a view over the graph store.
+
+
+# --- #
+
+
+class FetchResult(NamedTuple):
+    """The outcome of fetching a single object with `fetch_many`.
+
+    Attributes:
+        item (User | Story): The fetched object.
+        data (Optional[dict]): The raw API Response. None if the fetch failed.
+        error (Optional[Exception]): The exception raised while fetching. None if the fetch succeeded.
+    """
+
+    item: User | Story
+    data: Optional[dict]
+    error: Optional[Exception]
+
+
+async def fetch_many(
+    items: Iterable[User | Story],
+    include: bool | UserModelFieldsType | StoryModelFieldsType | FieldSpec = False,
+    concurrency: int = 10,
+    client: Optional[WattpadClient] = None,
+) -> AsyncIterator[FetchResult]:
+    """Fetch many Users and Stories, with at most `concurrency` fetches in flight. Results are yielded as they complete, a failed fetch doesn't abort the batch.
+
+    Example:
+    ```py
+    >>> stories = (Story(id) for id in story_ids)
+    >>> async for result in fetch_many(stories, include={"title": True}, concurrency=25):
+    ...     if result.error:
+    ...         print(result.item, "failed:", result.error)
+    ```
+
+    Args:
+        items (Iterable[User | Story]): The objects to fetch. Consumed lazily, as workers free up.
+        include (bool | UserModelFieldsType | StoryModelFieldsType | FieldSpec, optional): Fields to fetch, passed to each object's `fetch`. True fetches all fields. Defaults to False.
+        concurrency (int, optional): Maximum number of simultaneous fetches. Defaults to 10.
+        client (Optional[WattpadClient], optional): The client to perform requests with. Defaults to the client in use, see `wattpad.client.get_client`.
+
+    Yields:
+        FetchResult: The outcome of each fetch, in order of completion.
+    """
+
+    async def fetch(item: User | Story) -> FetchResult:
+        try:
+            data = await item.fetch(include=include, client=client)
+            return FetchResult(item, data, None)
+        except Exception as error:
+            return FetchResult(item, None, error)
+
+    results = cast(
+        AsyncGenerator[FetchResult, None],
+        map_unordered(fetch, items, concurrency),
+    )
+    try:
+        async for result in results:
+            yield result
+    finally:
+        await results.aclose()  # ! Cancels the calls in flight if the caller stops early.
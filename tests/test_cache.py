@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from wattpad.cache import MemoryCache, ResponseCache, SQLiteCache
+
+URL = "https://www.wattpad.com/api/v3/users/test"
+
+
+def test_sqlite_reads_dont_write(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), touch_interval=60.0)
+    cache.set(URL, b'{"username": "test"}')
+    changes = cache._connection.total_changes
+
+    for _ in range(10):
+        assert cache.get(URL) == b'{"username": "test"}'
+    assert cache._connection.total_changes == changes
+    cache.close()
+
+
+def test_sqlite_uses_are_written_in_batches(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), touch_interval=0.0)
+    cache.set(URL, b"{}")
+    changes = cache._connection.total_changes
+
+    cache.get(URL)
+    assert cache._connection.total_changes == changes
+    assert URL in cache._touched
+
+    cache._evict()
+    assert cache._connection.total_changes == changes + 1
+    assert not cache._touched
+    cache.close()
+
+
+def test_response_cache_is_abstract():
+    with pytest.raises(TypeError):
+        ResponseCache()
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "users/*",
+        "users/[!a]*",
+        "users/[^a]*",
+        "users/[a-c]",
+        "stories/?",
+        "https://www.wattpad.com/api/v3/users/*",
+        "https://www.wattpad.com/api/v3/stories/1?fields=*",
+        "nothing",
+    ],
+)
+def test_backends_invalidate_the_same_responses(tmp_path, pattern):
+    urls = [
+        "https://www.wattpad.com/api/v3/users/a",
+        "https://www.wattpad.com/api/v3/users/b",
+        "https://www.wattpad.com/api/v3/users/B",
+        "https://www.wattpad.com/api/v3/users/^caret",
+        "https://www.wattpad.com/api/v3/stories/1?fields=id",
+        "https://www.wattpad.com/api/v3/stories/1?fields=title",
+        "https://www.wattpad.com/api/v3/stories/22",
+    ]
+    memory = MemoryCache()
+    sqlite = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    for cache in (memory, sqlite):
+        for url in urls:
+            cache.set(url, b"{}")
+
+    removed = memory.invalidate(pattern)
+    assert sqlite.invalidate(pattern) == removed
+    remaining = [url for url in urls if memory._load(url)]
+    assert [url for url in urls if sqlite._load(url)] == remaining
+    assert len(remaining) == len(urls) - removed
+    assert sqlite._count == len(remaining)
+    sqlite.close()
+
+
+def test_subset_requests_are_answered_from_superset_responses():
+    cache = MemoryCache()
+    endpoint = "https://www.wattpad.com/api/v3/stories/1"
+    cache.set(
+        f"{endpoint}?fields=id,title,user(name,avatar)",
+        json.dumps(
+            {"id": "1", "title": "A", "user": {"name": "a", "avatar": "x"}}
+        ).encode(),
+    )
+
+    assert json.loads(cache.get(f"{endpoint}?fields=user(name),id")) == {
+        "id": "1",
+        "user": {"name": "a"},
+    }
+    # ! A nested field the cached response doesn't have.
+    assert cache.get(f"{endpoint}?fields=id,user(name,username)") is None
+    assert cache.get(f"{endpoint}?fields=id,parts(id)") is None
+    assert cache.get(f"{endpoint}/parts?fields=id") is None
+
+    exact = MemoryCache(field_aware=False)
+    exact.set(f"{endpoint}?fields=id,title", b'{"id": "1", "title": "A"}')
+    assert exact.get(f"{endpoint}?fields=id") is None
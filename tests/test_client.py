@@ -0,0 +1,61 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from server import MockServer  # noqa: E402
+
+from wattpad import WattpadClient  # noqa: E402
+from wattpad.client import WATTPAD_ORIGIN, get_client  # noqa: E402
+
+
+def test_retry_after_is_capped():
+    client = WattpadClient(retry_after_max=60.0)
+
+    assert client._backoff(0, "5") == 5.0
+    assert client._backoff(0, "86400") == 60.0
+    assert client._backoff(0, "Wed, 21 Oct 2099 07:28:00 GMT") == 60.0
+    assert client._backoff(0, "-3") == 0.0
+    assert 0.0 <= client._backoff(0, "nan") <= client.backoff_base
+    assert 0.0 <= client._backoff(0, "soon") <= client.backoff_base
+
+
+def test_tasks_enter_a_client_concurrently():
+    async def main():
+        async with MockServer(total=10) as server:
+            client = WattpadClient(base_url=server.url, cache=None)
+            first_entered = asyncio.Event()
+            first_exited = asyncio.Event()
+
+            async def first():
+                async with client:
+                    first_entered.set()
+                    await client.fetch(WATTPAD_ORIGIN + "/api/v3/users/user-0")
+                    assert get_client() is client
+                first_exited.set()
+
+            async def second():
+                await first_entered.wait()
+                async with client:
+                    session = client.get_session()
+                    chunks = client.stream(
+                        WATTPAD_ORIGIN + "/apiv2/storytext?id=1", chunk_size=16
+                    )
+                    await chunks.__anext__()
+                    await first_exited.wait()  # ! The first task has left the block.
+
+                    assert not session.closed
+                    async for _ in chunks:
+                        pass
+                    await client.fetch(WATTPAD_ORIGIN + "/api/v3/users/user-1")
+                    assert client.get_session() is session
+                    assert get_client() is client
+                assert get_client() is not client
+                assert session.closed
+
+            await asyncio.gather(first(), second())
+            assert not client._tokens
+            assert not client._entered
+
+    asyncio.run(main())
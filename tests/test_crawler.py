@@ -0,0 +1,114 @@
+import asyncio
+import gc
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from server import MockServer  # noqa: E402
+
+from wattpad import WattpadClient  # noqa: E402
+from wattpad import crawler as crawler_module  # noqa: E402
+from wattpad.crawler import Crawler  # noqa: E402
+
+
+def test_crawl_stops_early_with_a_full_queue():
+    async def main():
+        async with MockServer(total=50) as server:
+            client = WattpadClient(base_url=server.url, cache=None)
+            crawler = Crawler(["seed"], max_depth=3, concurrency=4, client=client)
+
+            users = crawler.crawl()
+            async for _ in users:
+                await asyncio.sleep(0.2)  # ! Lets every worker fill the queue.
+                break
+            await asyncio.wait_for(users.aclose(), 5)
+            await client.close()
+            return [
+                task
+                for task in asyncio.all_tasks()
+                if "Crawler.crawl" in task.get_coro().__qualname__
+            ]
+
+    assert asyncio.run(main()) == []
+
+
+async def _crawl(crawler: Crawler, stop: int = 0) -> list[str]:
+    crawled = []
+    users = crawler.crawl()
+    async for user in users:
+        crawled.append(user.username)
+        if len(crawled) == stop:
+            break
+    await users.aclose()
+    return crawled
+
+
+def test_checkpoint_round_trips_and_resumes(tmp_path):
+    path = str(tmp_path / "crawl.json")
+    copy = str(tmp_path / "copy.json")
+    gc.collect()  # ! Drops users linked by earlier tests, the mock server reuses usernames.
+
+    def crawler(client: WattpadClient) -> Crawler:
+        return Crawler(
+            ["checkpoint-seed"],
+            direction="followers",
+            concurrency=1,
+            checkpoint=path,
+            client=client,
+        )
+
+    async def main():
+        async with MockServer(total=5) as server:
+            client = WattpadClient(base_url=server.url, cache=None)
+            first = crawler(client)
+            crawled = await _crawl(first, stop=2)
+            with open(path) as file:
+                saved = json.load(file)
+
+            second = crawler(client)
+            restored = dict(second.visited), sorted(second._frontier)
+            second.save(copy)
+            rest = await _crawl(second)
+            await client.close()
+            return first, crawled, saved, second, restored, rest
+
+    first, crawled, saved, second, (visited, frontier), rest = asyncio.run(main())
+    assert len(crawled) == 2 and set(crawled) <= set(first.visited)
+    assert not os.path.exists(f"{path}.part")
+
+    assert visited == first.visited
+    assert [entry[2:] for entry in frontier] == [
+        entry[2:] for entry in sorted(first._frontier) if entry[3] not in visited
+    ]
+    with open(copy) as file:
+        copied = json.load(file)
+    assert copied["edges"] == saved["edges"]
+    assert copied["frontier"] == saved["frontier"]
+    assert copied["visited"] == saved["visited"] == first.visited
+
+    assert not set(rest) & set(first.visited)  # ! Crawled users aren't crawled again.
+    assert set(second.visited) == set(first.visited) | set(rest)
+    assert second.visited["checkpoint-seed"] == 0
+    assert "follower0" in second.visited
+
+
+def test_failed_save_keeps_the_previous_checkpoint(tmp_path, monkeypatch):
+    path = tmp_path / "crawl.json"
+    crawler = Crawler(["save-seed"], checkpoint=str(path))
+    crawler.save()
+    previous = path.read_text()
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(crawler_module.json, "dump", fail)
+    crawler.visited["save-seed"] = 0
+    with pytest.raises(OSError):
+        crawler.save()
+
+    assert path.read_text() == previous
+    assert sorted(os.listdir(tmp_path)) == ["crawl.json"]
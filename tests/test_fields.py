@@ -0,0 +1,136 @@
+import pytest
+from pydantic import ValidationError
+
+from wattpad.fields import FieldSpec, _compile, merge_model
+from wattpad.models import PartModel, StoryModel, UserModel
+from wattpad.utils import get_fields
+
+
+def test_compile_adds_required_fields():
+    spec = FieldSpec.compile(
+        StoryModel,
+        {"title": True, "parts": {"title": True}, "tagRankings": True},
+        required=("id", "parts.id", "tagRankings.name"),
+    )
+    assert spec.query == "title,parts(title,id),tagRankings,id"
+
+    # ! Sub-fields are only required if the parent is requested with sub-fields.
+    assert FieldSpec.compile(StoryModel, {}, required=("parts.id",)).query == ""
+    assert FieldSpec.compile(StoryModel, False, required=("id",)).query == "id"
+
+
+def test_compile_expands_nested_fields():
+    spec = FieldSpec.compile(
+        StoryModel, False, required=("user.username",), expand=("user",)
+    )
+    assert spec.query == "user(username)"
+
+    spec = FieldSpec.compile(
+        StoryModel, {"user": True}, required=("user.username",), expand=("user",)
+    )
+    assert spec.as_dict()["user"] == {key: True for key in get_fields(UserModel)}
+
+    spec = FieldSpec.compile(StoryModel, True)
+    assert spec.as_dict() == {key: True for key in get_fields(StoryModel)}
+
+
+def test_compile_rejects_unknown_fields():
+    with pytest.raises(ValueError, match="'titel'"):
+        FieldSpec.compile(StoryModel, {"titel": True})
+    with pytest.raises(ValueError, match="'parts.name'"):
+        FieldSpec.compile(StoryModel, {"parts": {"name": True}})
+    with pytest.raises(ValueError, match="no sub-fields"):
+        FieldSpec.compile(StoryModel, {"title": {"id": True}})
+    with pytest.raises(ValueError, match="not StoryModel"):
+        FieldSpec.compile(StoryModel, FieldSpec.compile(PartModel, {"id": True}))
+    # ! Required fields are validated too.
+    with pytest.raises(ValueError):
+        FieldSpec.compile(StoryModel, {}, required=("unknown",))
+
+
+def test_field_specs_are_hashable_and_reused():
+    include = {"title": True, "parts": {"id": True}, "tags": False}
+    spec = FieldSpec.compile(StoryModel, include, required=("id",))
+
+    hits = _compile.cache_info().hits
+    again = FieldSpec.compile(StoryModel, dict(include), required=("id",))
+    assert again is spec
+    assert _compile.cache_info().hits == hits + 1
+    assert include == {"title": True, "parts": {"id": True}, "tags": False}
+
+    equal = FieldSpec(StoryModel, spec.as_dict())
+    assert equal == spec and hash(equal) == hash(spec)
+    assert len({spec, equal}) == 1
+    assert FieldSpec(PartModel, {"id": True}) != FieldSpec(StoryModel, {"id": True})
+    assert FieldSpec.compile(StoryModel, spec) is spec
+    assert not FieldSpec.compile(StoryModel)
+
+
+def _story() -> StoryModel:
+    return StoryModel.model_validate(
+        {
+            "id": "1",
+            "title": "A",
+            "numParts": 3,
+            "lastPublishedPart": {"id": 3, "createDate": "2024-01-03"},
+            "user": {"username": "a", "name": "A"},
+        }
+    )
+
+
+def test_merge_model_merges_nested_models_in_place():
+    story = _story()
+    user = story.user
+
+    changed = merge_model(
+        story,
+        {
+            "numParts": 4,
+            "title": "A",
+            "lastPublishedPart": {"id": 4},
+            "user": {"name": "B", "username": "a"},
+            "unknown": True,
+        },
+    )
+
+    assert changed == {"num_parts", "last_published_part.id", "user.name"}
+    assert story.num_parts == 4
+    assert story.last_published_part.id == 4
+    assert story.last_published_part.create_date == "2024-01-03"
+    assert story.user is user and user.name == "B"
+    assert merge_model(story, {"numParts": 4, "user": {"name": "B"}}) == set()
+
+
+def test_merge_model_sets_missing_nested_models():
+    story = StoryModel(id="1")
+
+    assert merge_model(story, {"user": {"username": "a"}, "parts": [{"id": 1}]}) == {
+        "user",
+        "parts",
+    }
+    assert story.user.username == "a"
+    assert story.parts[0].id == 1
+
+
+def test_merge_model_keeps_the_model_on_validation_errors():
+    story = _story()
+    before = story.model_dump()
+
+    with pytest.raises(ValidationError):
+        merge_model(story, {"numParts": "many"})
+    with pytest.raises(ValidationError):
+        merge_model(story, {"lastPublishedPart": {"id": "latest"}})
+    # ! Values merged before the invalid one are undone, nested ones included.
+    with pytest.raises(ValidationError):
+        merge_model(
+            story,
+            {
+                "title": "B",
+                "description": "New",
+                "user": {"name": "B"},
+                "lastPublishedPart": {"createDate": "2024-01-04", "id": None},
+            },
+        )
+    assert story.model_dump() == before
+    assert story.model_fields_set == _story().model_fields_set
+    assert story.user.model_fields_set == {"username", "name"}
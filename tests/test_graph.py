@@ -0,0 +1,29 @@
+import random
+
+from wattpad.graph import _Adjacency
+
+
+def test_adjacency_deduplicates_edges_as_they_are_added():
+    adjacency = _Adjacency()
+    targets = list(range(5000))
+    random.Random(0).shuffle(targets)
+
+    added = adjacency.extend(0, targets[:3000])
+    added += adjacency.extend(0, targets)  # ! Overlapping pages.
+    assert len(added) == 5000
+    assert adjacency.count(0) == 5000
+    assert adjacency.contains(0, targets[-1])
+    assert list(adjacency.row(0)) == list(range(5000))
+
+
+def test_adjacency_counts_without_sorting_rows():
+    adjacency = _Adjacency()
+    adjacency.extend(0, [5, 3, 1])
+    assert adjacency.count(0) == 3
+    assert adjacency.pending[0] == {3, 1}  # ! Still unmerged.
+
+    assert adjacency.remove(0, 3)
+    assert not adjacency.remove(0, 3)
+    assert list(adjacency.row(0)) == [1, 5]
+    assert sorted(adjacency.clear(0)) == [1, 5]
+    assert adjacency.count(0) == 0
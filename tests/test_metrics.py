@@ -0,0 +1,145 @@
+from wattpad.client import HookEvent
+from wattpad.metrics import Metrics, endpoint_pattern
+
+API = "https://www.wattpad.com/api/v3"
+
+
+def test_endpoint_patterns_stay_bounded():
+    assert endpoint_pattern(f"{API}/users/wattpad/followers?limit=10") == (
+        "users/*/followers"
+    )
+    assert endpoint_pattern(f"{API}/stories/123/recommended") == "stories/*/recommended"
+    assert endpoint_pattern(f"{API}/lists/9/stories") == "lists/*/stories"
+    assert endpoint_pattern("http://127.0.0.1:8080/api/v3/users/a") == "users/*"
+    assert endpoint_pattern("https://www.wattpad.com/apiv2/storytext?id=5") == (
+        "apiv2/storytext"
+    )
+
+    images = {
+        endpoint_pattern(f"https://img.wattpad.com/cover/{id_}-256-k{id_}.jpg")
+        for id_ in range(100)
+    }
+    assert images == {"cover/*"}
+    assert endpoint_pattern("https://img.wattpad.com/useravatar/a.128.jpg") == (
+        "useravatar/*"
+    )
+    assert endpoint_pattern("https://example.com/a/b/c.png") == "other"
+    assert endpoint_pattern("https://www.wattpad.com/story/1-title") == "other"
+
+
+def _record(metrics: Metrics):
+    user = f"{API}/users/a"
+    cover = "https://img.wattpad.com/cover/1-256-k1.jpg"
+    for event in (
+        HookEvent("cache_miss", user),
+        HookEvent("request_start", user),
+        HookEvent("retry", user, status=503, delay=0.5),
+        HookEvent("request_start", user, attempt=1),
+        HookEvent("response", user, attempt=1, status=200, elapsed=0.05, size=100),
+        HookEvent("parse_complete", user, elapsed=0.5, objects=(1, 2, 3)),
+        HookEvent("cache_hit", f"{API}/users/b"),
+        HookEvent("request_start", cover),
+        HookEvent("response", cover, status=404, elapsed=2.0),
+    ):
+        metrics.record(event)
+
+
+def test_record_and_snapshot():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    _record(metrics)
+    snapshot = metrics.snapshot()
+
+    assert list(snapshot) == ["cover/*", "users/*"]
+    users = snapshot["users/*"]
+    assert users["requests"] == 2 and users["retries"] == 1
+    assert users["responses"] == {"200": 1} and users["bytes"] == 100
+    assert users["cache_hits"] == 1 and users["cache_misses"] == 1
+    assert users["objects"] == 3
+    assert users["latency"]["count"] == 1 and users["latency"]["sum"] == 0.05
+    assert users["latency"]["buckets"] == {"0.1": 1, "1.0": 1, "+Inf": 1}
+    assert users["latency"]["p50"] == 0.05
+    assert users["parse"]["buckets"] == {"0.1": 0, "1.0": 1, "+Inf": 1}
+
+    cover = snapshot["cover/*"]
+    assert cover["responses"] == {"404": 1} and cover["bytes"] == 0
+    assert cover["latency"]["p99"] == 1.0  # ! In the `+Inf` bucket.
+    assert cover["parse"]["p50"] is None
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_prometheus_output():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    _record(metrics)
+
+    assert metrics.prometheus("wp") == (
+        """\
+# HELP wp_requests_total Request attempts started, retries included.
+# TYPE wp_requests_total counter
+wp_requests_total{endpoint="cover/*"} 1
+wp_requests_total{endpoint="users/*"} 2
+# HELP wp_retries_total Request attempts that were retried.
+# TYPE wp_retries_total counter
+wp_retries_total{endpoint="cover/*"} 0
+wp_retries_total{endpoint="users/*"} 1
+# HELP wp_response_bytes_total Size of response bodies.
+# TYPE wp_response_bytes_total counter
+wp_response_bytes_total{endpoint="cover/*"} 0
+wp_response_bytes_total{endpoint="users/*"} 100
+# HELP wp_cache_hits_total Requests answered by the cache.
+# TYPE wp_cache_hits_total counter
+wp_cache_hits_total{endpoint="cover/*"} 0
+wp_cache_hits_total{endpoint="users/*"} 1
+# HELP wp_cache_misses_total Requests the cache couldn't answer.
+# TYPE wp_cache_misses_total counter
+wp_cache_misses_total{endpoint="cover/*"} 0
+wp_cache_misses_total{endpoint="users/*"} 1
+# HELP wp_parsed_objects_total Objects parsed from responses.
+# TYPE wp_parsed_objects_total counter
+wp_parsed_objects_total{endpoint="cover/*"} 0
+wp_parsed_objects_total{endpoint="users/*"} 3
+# HELP wp_responses_total Final responses, per status.
+# TYPE wp_responses_total counter
+wp_responses_total{endpoint="cover/*",status="404"} 1
+wp_responses_total{endpoint="users/*",status="200"} 1
+# HELP wp_request_duration_seconds Duration of request attempts.
+# TYPE wp_request_duration_seconds histogram
+wp_request_duration_seconds_bucket{endpoint="cover/*",le="0.1"} 0
+wp_request_duration_seconds_bucket{endpoint="cover/*",le="1.0"} 0
+wp_request_duration_seconds_bucket{endpoint="cover/*",le="+Inf"} 1
+wp_request_duration_seconds_sum{endpoint="cover/*"} 2.0
+wp_request_duration_seconds_count{endpoint="cover/*"} 1
+wp_request_duration_seconds_bucket{endpoint="users/*",le="0.1"} 1
+wp_request_duration_seconds_bucket{endpoint="users/*",le="1.0"} 1
+wp_request_duration_seconds_bucket{endpoint="users/*",le="+Inf"} 1
+wp_request_duration_seconds_sum{endpoint="users/*"} 0.05
+wp_request_duration_seconds_count{endpoint="users/*"} 1
+# HELP wp_parse_duration_seconds Time spent parsing responses.
+# TYPE wp_parse_duration_seconds histogram
+wp_parse_duration_seconds_bucket{endpoint="cover/*",le="0.1"} 0
+wp_parse_duration_seconds_bucket{endpoint="cover/*",le="1.0"} 0
+wp_parse_duration_seconds_bucket{endpoint="cover/*",le="+Inf"} 0
+wp_parse_duration_seconds_sum{endpoint="cover/*"} 0.0
+wp_parse_duration_seconds_count{endpoint="cover/*"} 0
+wp_parse_duration_seconds_bucket{endpoint="users/*",le="0.1"} 0
+wp_parse_duration_seconds_bucket{endpoint="users/*",le="1.0"} 1
+wp_parse_duration_seconds_bucket{endpoint="users/*",le="+Inf"} 1
+wp_parse_duration_seconds_sum{endpoint="users/*"} 0.5
+wp_parse_duration_seconds_count{endpoint="users/*"} 1
+"""
+    )
+
+
+def test_install_collects_a_clients_hooks():
+    from wattpad import WattpadClient
+
+    client = WattpadClient()
+    metrics = Metrics()
+    metrics.install(client)
+    client.emit("cache_hit", f"{API}/stories/1")
+    assert metrics.snapshot()["stories/*"]["cache_hits"] == 1
+
+    metrics.uninstall(client)
+    client.emit("cache_hit", f"{API}/stories/1")
+    assert metrics.snapshot()["stories/*"]["cache_hits"] == 1
@@ -0,0 +1,47 @@
+from wattpad.registry import LRURetention, Registry
+
+
+class Item:
+    def __init__(self, key: str):
+        self.key = key
+
+
+def test_lookups_of_existing_objects_dont_lock():
+    retention = LRURetention(max_entries=10)
+    registry = Registry(retention)
+    item = registry.lookup("a", lambda: Item("a"))
+
+    with retention._lock:  # ! A lookup that waits for the lock would deadlock.
+        for _ in range(LRURetention._BATCH * 2):
+            assert registry.lookup("a", lambda: Item("a")) is item
+
+
+def test_lookups_count_as_uses():
+    registry = Registry(LRURetention(max_entries=2))
+    items = [registry.lookup(key, lambda key=key: Item(key)) for key in "ab"]
+    registry.lookup("a", lambda: Item("a"))
+    registry.lookup("c", lambda: Item("c"))
+
+    assert "a" in registry.retention._entries
+    assert "b" not in registry.retention._entries
+    assert registry.stats()["evictions"] == 1
+    del items
+
+
+def test_objects_are_measured_when_retained_and_resized_only():
+    measured = []
+
+    def sizeof(item: Item) -> int:
+        measured.append(item.key)
+        return 100 * len(item.key)
+
+    registry = Registry(LRURetention(max_bytes=1000, sizeof=sizeof))
+    item = registry.lookup("a", lambda: Item("a"))
+    for _ in range(LRURetention._BATCH * 2):
+        registry.lookup("a", lambda: Item("a"))
+    assert measured == ["a"]
+
+    item.key = "a" * 5
+    registry.resize("a", item)
+    assert measured == ["a", "aaaaa"]
+    assert registry.retention.nbytes == 500
@@ -0,0 +1,93 @@
+import os
+import sys
+
+import pytest
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from server import MockServer  # noqa: E402
+
+from wattpad import Story, User  # noqa: E402
+from wattpad.sharding import HashRing, fetch_sharded  # noqa: E402
+from wattpad.sync import BackgroundLoop  # noqa: E402
+
+
+def test_hash_ring_moves_few_keys_when_a_shard_is_added():
+    keys = [f"user:{index}" for index in range(20000)]
+    before = HashRing(4)
+    after = HashRing(5)
+
+    counts = [0] * 5
+    moved = 0
+    for key in keys:
+        shard = after.shard(key)
+        counts[shard] += 1
+        if shard != before.shard(key):
+            moved += 1
+            assert shard == 4  # ! Keys only move to the new shard.
+
+    assert 0.1 < moved / len(keys) < 0.3  # ! About 1/5.
+    assert all(0.1 < count / len(keys) < 0.3 for count in counts)
+    assert [HashRing(5).shard(key) for key in keys[:100]] == [
+        after.shard(key) for key in keys[:100]
+    ]
+
+    with pytest.raises(ValueError):
+        HashRing(0)
+
+
+class MissingServer(MockServer):
+    """Responds to requests for the User `missing` with a 404."""
+
+    async def _user(self, request: web.Request) -> web.Response:
+        if request.match_info["username"] == "missing":
+            return web.Response(status=404)
+        return await super()._user(request)
+
+
+def test_fetch_sharded_merges_the_objects_of_every_process(tmp_path):
+    usernames = [f"sharded{index}" for index in range(6)]
+    story_ids = ["101", "102", "103"]
+    server = MissingServer(total=30)
+    ring = HashRing(2)
+    assert {ring.shard(f"user:{username}") for username in usernames} == {0, 1}
+
+    with BackgroundLoop() as loop:
+        loop.run(server.start())
+        try:
+            result = fetch_sharded(
+                users=usernames + ["Missing"],
+                stories=story_ids,
+                include=True,
+                relations=("followers",),
+                processes=2,
+                cache=str(tmp_path / "cache.sqlite"),
+                client_options={"base_url": server.url, "max_retries": 0},
+            )
+        finally:
+            loop.run(server.stop())
+
+    assert result.fetched == len(usernames) + len(story_ids)
+    assert list(result.failed) == ["user:missing"]
+    assert "404" in result.failed["user:missing"]
+
+    users = {item.username: item for item in result.items if isinstance(item, User)}
+    stories = {item.id: item for item in result.items if isinstance(item, Story)}
+    assert set(users) == set(usernames) | {"missing"}
+    assert set(stories) == set(story_ids)
+
+    for username in usernames:
+        assert users[username].data.name == username.title()
+        assert {follower.username for follower in users[username].followers} == {
+            f"follower{index}" for index in range(30)
+        }
+    assert not users["missing"].followers
+    for id_ in story_ids:
+        assert stories[id_].data.title == f"Story {id_}"
+        assert [part.id for part in stories[id_].parts][:2] == [
+            str(int(id_) * 100),
+            str(int(id_) * 100 + 1),
+        ]
+    assert result.records["user"] >= len(usernames) + 30
+    assert result.records["story"] >= len(story_ids)
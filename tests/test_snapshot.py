@@ -0,0 +1,26 @@
+import gc
+
+from wattpad import Story, User
+from wattpad.snapshot import dump_snapshot, load_snapshot
+
+
+def test_loaded_objects_are_held(tmp_path):
+    path = str(tmp_path / "snapshot.jsonl.gz")
+
+    user = User("snapshot-author")
+    user._load_data({"name": "Author", "numFollowers": 3}, "eager")
+    story = Story("snapshot-story")
+    story._load_data({"title": "Title"}, "eager")
+    story.user = user
+    user.stories = [story]
+    assert dump_snapshot(path)["user"] >= 1
+
+    del user, story
+    gc.collect()
+    assert "snapshot-author" not in User.registry
+
+    loaded = load_snapshot(path, validation="lazy")
+    gc.collect()
+    assert loaded.counts["story"] >= 1
+    assert User("snapshot-author").data.name == "Author"
+    assert User("snapshot-author").stories[0].data.title == "Title"
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from wattpad import WattpadClient
+from wattpad.sync import BackgroundLoop
+
+
+async def _thread_name(value: int) -> tuple[int, str]:
+    await asyncio.sleep(0.01)
+    return value, threading.current_thread().name
+
+
+def test_run_from_other_threads():
+    with BackgroundLoop(name="test-run") as loop:
+        with ThreadPoolExecutor(8) as executor:
+            results = list(
+                executor.map(lambda value: loop.run(_thread_name(value)), range(32))
+            )
+
+    assert results == [(value, "test-run") for value in range(32)]
+    assert not loop.running
+
+
+def test_run_from_the_loops_own_thread_raises():
+    loop = BackgroundLoop()
+    inner = asyncio.sleep(0)
+
+    async def nested():
+        with pytest.raises(RuntimeError):
+            loop.run(inner)
+        return inner.cr_frame is None  # ! Closed, rather than never awaited.
+
+    with loop:
+        assert loop.run(nested())
+
+
+def test_iterate_closes_the_iterator_when_stopped_early():
+    closed = []
+
+    async def numbers():
+        try:
+            for number in range(100):
+                yield number
+        finally:
+            closed.append(threading.current_thread().name)
+
+    with BackgroundLoop(name="test-iterate") as loop:
+        assert list(loop.iterate(numbers())) == list(range(100))
+        assert closed == ["test-iterate"]
+
+        iterator = loop.iterate(numbers())
+        assert [next(iterator), next(iterator)] == [0, 1]
+        iterator.close()
+        assert closed == ["test-iterate", "test-iterate"]
+
+
+def test_stop_closes_the_loops_session():
+    client = WattpadClient()
+    loop = BackgroundLoop(client)
+
+    async def session():
+        return client.get_session()
+
+    first = loop.run(session())
+    assert loop.run(session()) is first and not first.closed
+
+    loop.stop()
+    assert first.closed
+    assert not loop.running
+
+    # ! Started anew, with a new session.
+    second = loop.run(session())
+    assert second is not first and not second.closed
+    loop.stop()
+    assert second.closed
@@ -0,0 +1,144 @@
+import os
+import threading
+
+import pytest
+
+from wattpad import User
+from wattpad import timeseries
+from wattpad.timeseries import MISSING, TimeSeriesStore
+
+
+def _fill(store: TimeSeriesStore, key: str = "1", samples: int = 10):
+    for index in range(samples):
+        store.append(
+            "story",
+            key,
+            {"read_count": index * 10, "vote_count": index},
+            timestamp=1000.0 + index,
+        )
+
+
+def test_append_range_and_delta():
+    store = TimeSeriesStore()
+    _fill(store)
+    store.append("story", "2", {"read_count": 5}, timestamp=1003.5)
+
+    series = store.range("story", "1", start=1002, end=1004)
+    assert series.times.tolist() == [1002.0, 1003.0, 1004.0]
+    assert series.values["read_count"].tolist() == [20, 30, 40]
+    assert series.values["comment_count"].tolist() == [MISSING] * 3
+    assert store.range("story", "unknown").times.tolist() == []
+
+    assert store.delta("story", "1", "read_count") == 90
+    assert store.delta("story", "1", "vote_count", start=1005) == 4
+    assert store.delta("story", "1", "comment_count") is None
+    assert store.delta("story", "2", "read_count") is None
+
+    assert store.latest("story", "1") == {
+        "time": 1009.0,
+        "read_count": 90,
+        "vote_count": 9,
+        "comment_count": MISSING,
+    }
+    assert store.keys("story") == ["1", "2"]
+    assert [sample[0] for sample in store.iter_samples("story")][-2:] == ["1", "2"]
+    assert store.stats()["story"] == 11 and store.stats()["story_keys"] == 2
+
+
+def test_append_rejects_out_of_order_samples_and_unknown_kinds():
+    store = TimeSeriesStore()
+    _fill(store, samples=2)
+
+    with pytest.raises(ValueError):
+        store.append("story", "1", {"read_count": 1}, timestamp=999.0)
+    with pytest.raises(ValueError):
+        store.append("list", "1", {}, timestamp=1.0)
+    with pytest.raises(ValueError):
+        store.delta("story", "1", "num_followers")
+
+
+def test_record_reads_counters_of_objects():
+    store = TimeSeriesStore()
+    user = User("timeseries-user")
+    user._load_data({"numFollowers": 12}, "lazy", replace=True)
+
+    assert store.record(user, timestamp=5.0) == 1
+    assert store.record(object()) == 0
+    assert store.latest("user", "timeseries-user") == {
+        "time": 5.0,
+        "num_followers": 12,
+        "votes_received": MISSING,
+    }
+
+
+def test_file_backed_store_reopens(tmp_path, monkeypatch):
+    monkeypatch.setattr(timeseries, "_FLUSH_ROWS", 4)
+    with TimeSeriesStore(str(tmp_path)) as store:
+        _fill(store, "a")
+        _fill(store, "b", samples=3)
+        expected = list(store.iter_samples("story"))
+
+    with TimeSeriesStore(str(tmp_path)) as store:
+        assert list(store.iter_samples("story")) == expected
+        assert store.keys("story") == ["a", "b"]
+        assert store.delta("story", "a", "read_count") == 90
+        store.append("story", "c", {"read_count": 1}, timestamp=2000.0)
+        store.append("story", "a", {"read_count": 100}, timestamp=2000.0)
+
+    with TimeSeriesStore(str(tmp_path)) as store:
+        assert store.stats()["story"] == 15
+        assert store.keys("story") == ["a", "b", "c"]
+        assert store.range("story", "a", start=1500).values["read_count"].tolist() == [
+            100
+        ]
+
+
+def test_reopening_discards_a_partially_written_row(tmp_path):
+    with TimeSeriesStore(str(tmp_path)) as store:
+        _fill(store, "a", samples=3)
+
+    # ! As if the process died while appending a row of a new key.
+    with open(tmp_path / "story.key", "ab") as file:
+        file.write(b"\x01\x00\x00\x00")
+    with open(tmp_path / "story.time", "ab") as file:
+        file.write(b"\x00" * 3)
+    with open(tmp_path / "story.keys", "a") as file:
+        file.write("half-writ")
+
+    with TimeSeriesStore(str(tmp_path)) as store:
+        assert store.stats()["story"] == 3
+        assert store.keys("story") == ["a"]
+        store.append("story", "b", {"read_count": 7}, timestamp=2000.0)
+
+    assert os.path.getsize(tmp_path / "story.time") == 4 * 8
+    with TimeSeriesStore(str(tmp_path)) as store:
+        assert store.keys("story") == ["a", "b"]
+        assert store.latest("story", "b")["read_count"] == 7
+        assert store.delta("story", "a", "read_count") == 20
+
+
+def test_iter_samples_while_another_thread_flushes(tmp_path, monkeypatch):
+    monkeypatch.setattr(timeseries, "_FLUSH_ROWS", 8)
+    monkeypatch.setattr(timeseries, "_READ_ROWS", 16)
+    with TimeSeriesStore(str(tmp_path)) as store:
+        _fill(store, "a", samples=2000)
+        stop = threading.Event()
+
+        def append():
+            timestamp = 5000.0
+            while not stop.is_set():
+                timestamp += 1
+                store.append("story", "b", {"read_count": 1}, timestamp=timestamp)
+
+        thread = threading.Thread(target=append)
+        thread.start()
+        try:
+            samples = [sample for sample in store.iter_samples("story")]
+        finally:
+            stop.set()
+            thread.join()
+
+    assert len(samples) >= 2000
+    assert [sample[2]["read_count"] for sample in samples[:2000]] == [
+        index * 10 for index in range(2000)
+    ]
@@ -0,0 +1,282 @@
+import asyncio
+import json
+
+import pytest
+
+from wattpad.utils import (
+    JSONItemParser,
+    construct_fields,
+    fields_cover,
+    map_ordered,
+    map_unordered,
+    parse_fields,
+    project_fields,
+)
+
+
+async def _double(item: int) -> int:
+    await asyncio.sleep(0)
+    return item * 2
+
+
+def test_map_unordered_yields_every_result():
+    async def main():
+        return [result async for result in map_unordered(_double, range(50), 4)]
+
+    assert sorted(asyncio.run(main())) == [item * 2 for item in range(50)]
+
+
+def test_map_unordered_stops_early_with_a_full_queue():
+    async def main():
+        iterator = map_unordered(_double, range(1000), 4)
+        async for _ in iterator:
+            await asyncio.sleep(0.01)  # ! Lets every worker fill the queue.
+            break
+        await asyncio.wait_for(iterator.aclose(), 1)
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert asyncio.run(main()) == set()
+
+
+def test_map_unordered_raises_the_first_error():
+    async def fail(item: int) -> int:
+        if item == 3:
+            raise KeyError(item)
+        return item
+
+    async def main():
+        return [result async for result in map_unordered(fail, range(10), 2)]
+
+    with pytest.raises(KeyError):
+        asyncio.run(main())
+
+
+def test_fetch_many_cancels_fetches_when_closed_early():
+    from wattpad.wattpad import fetch_many
+
+    started = []
+
+    class Item:
+        async def fetch(self, include=False, client=None):
+            started.append(self)
+            await asyncio.sleep(0 if len(started) == 1 else 3600)
+
+    async def main():
+        results = fetch_many([Item() for _ in range(20)], concurrency=4)
+        async for _ in results:
+            break
+        await asyncio.wait_for(results.aclose(), 1)
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert asyncio.run(main()) == set()
+    assert len(started) < 20
+
+
+def test_map_ordered_yields_in_input_order_with_bounded_calls():
+    running = 0
+    peak = 0
+
+    async def slow_first(item: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02 if item % 3 == 0 else 0)
+        running -= 1
+        return item
+
+    async def main():
+        return [result async for result in map_ordered(slow_first, range(20), 4)]
+
+    assert asyncio.run(main()) == list(range(20))
+    assert peak == 4
+
+
+def test_map_ordered_cancels_pending_calls_when_closed_early():
+    started = []
+
+    async def hang(item: int) -> int:
+        started.append(item)
+        await asyncio.sleep(0 if item == 0 else 3600)
+        return item
+
+    async def main():
+        results = map_ordered(hang, range(100), 4)
+        async for _ in results:
+            break
+        await asyncio.wait_for(results.aclose(), 1)
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert asyncio.run(main()) == set()
+    assert len(started) == 5  # ! Refilled once, after the first result.
+
+
+def _parse(key, document: bytes, chunk_size: int = 1):
+    parser = JSONItemParser(key)
+    items = []
+    for start in range(0, len(document), chunk_size):
+        items += parser.feed(document[start : start + chunk_size])
+    return items + parser.close(), parser.rest
+
+
+_ITEMS = [
+    {"username": 'ä"]}', "numFollowers": 1234567, "ratio": -1.5e-3},
+    {"stories": [{"id": "1", "parts": [{"id": 2}]}], "lists": [], "users": None},
+    12345,
+    "text with \\ and \u00e9",
+    [True, False, None, {}],
+]
+
+
+def test_json_item_parser_splits_at_every_byte():
+    document = json.dumps(
+        {"total": 5, "users": _ITEMS, "nextUrl": "https://x/?a=[1]"},
+        ensure_ascii=False,
+    ).encode()
+
+    for size in (1, 2, 3, 7, len(document)):
+        assert _parse("users", document, size) == (
+            _ITEMS,
+            {"total": 5, "nextUrl": "https://x/?a=[1]"},
+        )
+
+    for split in range(len(document) + 1):
+        parser = JSONItemParser("users")
+        items = parser.feed(document[:split]) + parser.feed(document[split:])
+        assert items + parser.close() == _ITEMS
+
+
+def test_json_item_parser_waits_for_numbers_cut_across_chunks():
+    parser = JSONItemParser()
+    assert parser.feed(b"[12") == []
+    assert parser.feed(b"34, -5") == [1234]
+    assert parser.feed(b".25e") == []
+    assert parser.feed(b"2]") == [-525.0]
+    assert parser.close() == []
+
+
+def test_json_item_parser_reads_nested_keys_as_items_only_at_the_top():
+    document = json.dumps(
+        {
+            "stories": [{"users": [1], "lists": [{"stories": [2]}]}],
+            "users": [{"stories": [3]}, {"lists": [4]}],
+            "lists": [5],
+        }
+    ).encode()
+
+    items, rest = _parse("users", document, 5)
+    assert items == [{"stories": [3]}, {"lists": [4]}]
+    assert rest == {
+        "stories": [{"users": [1], "lists": [{"stories": [2]}]}],
+        "lists": [5],
+    }
+
+    assert _parse(None, b'[{"users": [1]}]', 4) == ([{"users": [1]}], {})
+
+
+def test_json_item_parser_decodes_each_item_once():
+    parser = JSONItemParser()
+    calls = []
+    decode = parser._decode
+    parser._decode = lambda text, position: calls.append(position) or decode(
+        text, position
+    )
+
+    item = {"text": "x" * 10000, "nested": [[{"a": "]"}]]}
+    document = json.dumps([item, item]).encode()
+    for start in range(0, len(document), 64):
+        parser.feed(document[start : start + 64])
+    assert parser.close() == [] and len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        b'{"users": [{"a": 1}',
+        b'{"users": [{"a": "unterminated',
+        b'{"users": [1, 2]',
+        b'{"users": [tru',
+        b"",
+    ],
+)
+def test_json_item_parser_raises_truncated_documents(document):
+    with pytest.raises(ValueError):
+        _parse("users", document, 3)
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        b'{"users": [{"a": 1]',
+        b'{"users": [{"a": @',
+        b'{"users": [{"a": "line\nbreak',
+        b'{"users": [{"a" 1}',
+        b'{"users": [xyz',
+        b'{"users": [1 2',
+        b'["users"]',
+    ],
+)
+def test_json_item_parser_raises_invalid_json_before_the_end(document):
+    parser = JSONItemParser("users")
+    with pytest.raises(ValueError):
+        for start in range(0, len(document), 2):
+            parser.feed(document[start : start + 2])
+        parser.feed(
+            b" " * 10
+        )  # ! Not closed, the error is raised as the chunk arrives.
+
+
+def test_parse_fields_inverts_construct_fields():
+    fields = {
+        "id": True,
+        "user": {"name": True, "avatar": True},
+        "parts": {"id": True, "text_url": {"text": True}},
+        "tags": True,
+    }
+    assert parse_fields(construct_fields(fields)) == fields
+    assert parse_fields("") == {}
+    assert parse_fields("id,,tags,") == {"id": True, "tags": True}
+
+    for fields_str in ("parts(id", "id)", "parts(id))"):
+        with pytest.raises(ValueError):
+            parse_fields(fields_str)
+
+
+def test_fields_cover_nested_subsets():
+    available = parse_fields("id,title,user(name,avatar),parts(id,title)")
+
+    assert fields_cover(available, parse_fields("id,user(name)"))
+    assert fields_cover(available, parse_fields("parts(id,title),user(avatar,name)"))
+    assert fields_cover(available, available)
+    assert fields_cover(available, {"id": True, "tags": False})
+
+    # ! Supersets, and nested fields missing from the available ones.
+    assert not fields_cover(available, parse_fields("id,tags"))
+    assert not fields_cover(available, parse_fields("user(name,username)"))
+    assert not fields_cover(available, parse_fields("title,parts(id,createDate)"))
+    assert not fields_cover(available, parse_fields("id(value)"))
+    # ! Default sub-fields are unknown, in either direction.
+    assert not fields_cover(available, parse_fields("user"))
+    assert not fields_cover(parse_fields("user"), parse_fields("user(name)"))
+
+
+def test_project_fields_removes_extra_fields():
+    available = parse_fields("stories(id,title,user(name,avatar)),total")
+    data = {
+        "stories": [
+            {"id": "1", "title": "A", "user": {"name": "a", "avatar": "x"}},
+            {"id": "2", "title": "B", "user": {"name": "b", "avatar": "y"}},
+        ],
+        "total": 2,
+        "nextUrl": "https://www.wattpad.com/api/v3/stories?offset=2",
+    }
+
+    projected = project_fields(data, parse_fields("stories(id,user(name))"), available)
+    assert projected == {
+        "stories": [
+            {"id": "1", "user": {"name": "a"}},
+            {"id": "2", "user": {"name": "b"}},
+        ],
+        # ! Not a requested field, but not a field at all either.
+        "nextUrl": "https://www.wattpad.com/api/v3/stories?offset=2",
+    }
+    assert data["stories"][0]["title"] == "A"  # ! Not modified in place.
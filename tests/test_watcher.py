@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+
+from wattpad import Story, WattpadClient
+from wattpad import watcher as watcher_module
+from wattpad.watcher import Watcher
+
+
+def _data(parts: int, modified: str = "2024-01-01T00:00:00Z") -> dict:
+    return {
+        "modifyDate": modified,
+        "numParts": parts,
+        "lastPublishedPart": {"id": str(parts), "createDate": modified},
+    }
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    """Replace the API with a dict of Story ID to its data, or an exception to raise."""
+    responses: dict = {}
+
+    async def fetch_url(url, client=None, revalidate=False):
+        key = url.split("/stories/")[1].split("?")[0]
+        response = responses[key]
+        if isinstance(response, Exception):
+            raise response
+        return dict(response)
+
+    monkeypatch.setattr(watcher_module, "fetch_url", fetch_url)
+    return responses
+
+
+def _watcher(*stories, **options) -> Watcher:
+    options = {"jitter": 0, "client": WattpadClient(cache=None), **options}
+    return Watcher(stories, **options)
+
+
+def test_first_poll_compares_only_fields_the_story_had(responses):
+    story = Story("watch-partial")
+    story._load_data({"modifyDate": "2024-01-01T00:00:00Z", "numParts": 3}, "lazy")
+    responses[story.id] = _data(3)
+
+    watcher = _watcher(story, min_interval=10, interval=100, max_interval=1000)
+    assert asyncio.run(watcher.poll(story)) is None
+    assert watcher._states[story.id].interval == 150  # ! Backed off, not halved.
+
+    responses[story.id] = _data(5, "2024-02-01T00:00:00Z")
+    change = asyncio.run(watcher.poll(story))
+    assert change is not None and change.new_parts == 2
+    assert watcher._states[story.id].interval == 75
+
+
+def test_first_poll_without_data_only_records_a_version(responses):
+    responses["watch-new"] = _data(1)
+    watcher = _watcher("watch-new", min_interval=10, interval=100, max_interval=1000)
+
+    assert asyncio.run(watcher.poll("watch-new")) is None
+    assert asyncio.run(watcher.poll("watch-new")) is None
+    assert watcher.stats()["polls"] == 2 and watcher.stats()["changes"] == 0
+    assert watcher._states["watch-new"].interval == 225
+
+
+def test_intervals_adapt_to_the_time_between_changes(responses):
+    responses["watch-adapt"] = _data(1)
+    watcher = _watcher(
+        "watch-adapt",
+        min_interval=10,
+        interval=1000,
+        max_interval=10_000,
+        polls_per_change=4,
+    )
+    state = watcher._states["watch-adapt"]
+
+    async def change(parts: int):
+        responses["watch-adapt"] = _data(parts)
+        return await watcher.poll("watch-adapt")
+
+    asyncio.run(change(1))
+    assert asyncio.run(change(2)) is not None
+    assert state.interval == 750 and state.period is None
+
+    state.changed_at -= 400  # ! As if the next change came 400 seconds later.
+    assert asyncio.run(change(3)) is not None
+    assert state.period == pytest.approx(400, abs=1)
+    assert state.interval == pytest.approx(100, abs=1)
+
+    asyncio.run(change(3))
+    assert state.interval == pytest.approx(150, abs=1)
+
+
+def test_failed_polls_are_recorded_and_backed_off(responses):
+    responses["watch-fail"] = ConnectionError("down")
+    watcher = _watcher("watch-fail", min_interval=10, interval=100, max_interval=120)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(watcher.poll("watch-fail"))
+    assert "watch-fail" in watcher.failed
+    assert watcher._states["watch-fail"].interval == 120  # ! Clamped.
+
+    responses["watch-fail"] = _data(1)
+    asyncio.run(watcher.poll("watch-fail"))
+    assert watcher.failed == {}
+
+
+def test_watch_polls_due_stories_and_yields_changes(monkeypatch):
+    polls: dict[str, int] = {}
+
+    async def fetch_url(url, client=None, revalidate=False):
+        key = url.split("/stories/")[1].split("?")[0]
+        polls[key] = polls.get(key, 0) + 1
+        if key == "watch-broken":
+            raise ConnectionError("down")
+        return _data(polls[key])  # ! A new part every poll.
+
+    monkeypatch.setattr(watcher_module, "fetch_url", fetch_url)
+    watcher = _watcher(
+        "watch-a",
+        "watch-b",
+        "watch-broken",
+        min_interval=0.01,
+        interval=0.01,
+        max_interval=0.02,
+        concurrency=2,
+    )
+
+    async def main():
+        changes = []
+        iterator = watcher.watch()
+        async for change in iterator:
+            changes.append(change)
+            if len(changes) == 6:
+                break
+        await iterator.aclose()
+        return changes, asyncio.all_tasks() - {asyncio.current_task()}
+
+    changes, pending = asyncio.run(main())
+
+    assert pending == set()
+    assert {change.story.id for change in changes} == {"watch-a", "watch-b"}
+    assert all(change.new_parts == 1 for change in changes)
+    assert "watch-broken" in watcher.failed
+    assert watcher._wakeup is None
+
+
+def test_removed_stories_are_not_polled(responses):
+    responses["watch-kept"] = _data(1)
+    watcher = _watcher("watch-kept", "watch-removed", min_interval=0.01)
+    watcher.remove("watch-removed")
+
+    async def main():
+        iterator = watcher.watch()
+        task = asyncio.ensure_future(iterator.__anext__())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await iterator.aclose()
+
+    asyncio.run(main())  # ! `responses` raises KeyError for unknown Stories.
+    assert watcher.failed == {}
+    assert "watch-removed" not in watcher and len(watcher) == 1
@@ -0,0 +1,198 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from aiohttp import web
+from pydantic import ValidationError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from server import MockServer  # noqa: E402
+
+from wattpad import Part, Story, WattpadClient  # noqa: E402
+from wattpad.models import PartModel, UserModel  # noqa: E402
+
+
+def _text(id_: int) -> bytes:
+    return f"<p>Part {id_}: déjà vu</p>\n".encode() * 200
+
+
+class TextServer(MockServer):
+    """Serves a different text for each Part. Even Parts respond later than odd ones."""
+
+    async def _text(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        id_ = int(request.query["id"])
+        if id_ % 2 == 0:
+            await asyncio.sleep(0.05)
+        return web.Response(body=_text(id_), content_type="text/html")
+
+
+def _story(id_: str, parts: int) -> Story:
+    story = Story(id_)
+    story._load_data(
+        {"parts": [{"id": index, "title": f"Part {index}"} for index in range(parts)]},
+        "eager",
+        replace=True,
+    )
+    return story
+
+
+def test_part_iter_text_decodes_characters_split_between_chunks():
+    async def main():
+        async with TextServer() as server:
+            client = WattpadClient(base_url=server.url)
+            pieces = [piece async for piece in Part("7").iter_text(7, client=client)]
+            await client.close()
+            return pieces
+
+    pieces = asyncio.run(main())
+    assert len(pieces) > 1
+    assert "".join(pieces) == _text(7).decode()
+
+
+def test_iter_part_texts_streams_parts_in_reading_order():
+    story = _story("texts-ordered", 6)
+
+    async def main():
+        async with TextServer() as server:
+            client = WattpadClient(base_url=server.url)
+            results = []
+            async for part, texts in story.iter_part_texts(
+                concurrency=3, chunk_size=256, client=client
+            ):
+                pieces = [piece async for piece in texts]
+                results.append((part, len(pieces), "".join(pieces)))
+            await client.close()
+            return results
+
+    results = asyncio.run(main())
+    assert [part for part, _, _ in results] == story.parts
+    for part, pieces, text in results:
+        assert pieces > 1  # ! Streamed, not joined.
+        assert text == _text(int(part.id)).decode()
+
+
+def test_iter_part_texts_downloads_at_most_concurrency_parts_ahead():
+    story = _story("texts-bounded", 10)
+
+    async def main():
+        async with TextServer() as server:
+            client = WattpadClient(base_url=server.url)
+            parts = story.iter_part_texts(concurrency=3, chunk_size=256, client=client)
+
+            part, texts = await parts.__anext__()
+            await asyncio.sleep(0.2)  # ! Nothing is read meanwhile.
+            ahead = server.requests
+
+            await texts.__anext__()
+            # ! The rest of the first Part is discarded.
+            part, _ = await parts.__anext__()
+            await parts.aclose()
+            await client.close()
+            return (
+                ahead,
+                part,
+                [
+                    task
+                    for task in asyncio.all_tasks()
+                    if not task.done()
+                    and "Story.iter_part_texts"
+                    in getattr(task.get_coro(), "__qualname__", "")
+                ],
+            )
+
+    ahead, part, pending = asyncio.run(main())
+    assert ahead == 3
+    assert part is story.parts[1]
+    assert pending == []
+
+
+def test_iter_part_texts_raises_download_errors_in_order():
+    story = _story("texts-failed", 3)
+
+    class FailingServer(TextServer):
+        async def _text(self, request: web.Request) -> web.Response:
+            if request.query["id"] == "1":
+                return web.Response(status=404)
+            return await super()._text(request)
+
+    async def main():
+        async with FailingServer() as server:
+            client = WattpadClient(base_url=server.url, max_retries=0)
+            read = []
+            try:
+                async for part, texts in story.iter_part_texts(client=client):
+                    read.append(part)
+                    async for _ in texts:
+                        pass
+            except Exception as error:
+                return read, error
+            finally:
+                await client.close()
+
+    read, error = asyncio.run(main())
+    assert read == story.parts[:2]
+    assert getattr(error, "status", None) == 404
+
+
+def test_lazy_data_is_validated_on_first_access():
+    story = Story("materialized-lazy")
+    story._load_data({"title": "A", "numParts": "3"}, "lazy", replace=True)
+    assert story._data is None
+
+    assert story.data.num_parts == 3  # ! Coerced by validation.
+    assert story._raw is None
+
+    story._load_data({"numParts": "4"}, "lazy")
+    assert story.data.num_parts == 4 and story.data.title == "A"
+
+    invalid = Story("materialized-invalid")
+    invalid._load_data({"numParts": "many"}, "lazy", replace=True)
+    with pytest.raises(ValidationError):
+        invalid.data
+
+
+def test_trusted_data_builds_nested_models():
+    story = Story("materialized-trusted")
+    story._load_data(
+        {
+            "numParts": 2,
+            "user": {"username": "author", "numFollowers": 5},
+            "parts": [{"id": 1, "title": "One"}, {"id": 2}],
+            "notAField": True,
+        },
+        "trusted",
+        replace=True,
+    )
+
+    assert type(story.data.user) is UserModel
+    assert story.data.user.num_followers == 5
+    assert [type(part) for part in story.data.parts] == [PartModel, PartModel]
+    assert story.data.parts[0].title == "One"
+    assert story.data.model_fields_set == {"id", "num_parts", "user", "parts"}
+
+    # ! Pending data is validated if any of it isn't trusted.
+    story._load_data({"numParts": "3"}, "lazy")
+    assert story.data.num_parts == 3
+
+
+def test_dump_data_round_trips_raw_data_that_was_never_materialized():
+    raw = {
+        "title": "A",
+        "numParts": 2,
+        "lastPublishedPart": {"id": 2, "createDate": "2024-01-02"},
+    }
+    story = Story("materialized-dump")
+    story._load_data(raw, "lazy", replace=True)
+
+    dumped = story._dump_data()
+    assert dumped == raw and dumped is not raw
+    assert story._data is None  # ! Not materialized by dumping.
+
+    copy = Story("materialized-dump-copy")
+    copy._load_data(dumped, "lazy", replace=True)
+    assert copy.data.model_dump(exclude={"id"}) == story.data.model_dump(exclude={"id"})
+    assert story._dump_data() == raw
+    assert Story("materialized-empty")._dump_data() is None